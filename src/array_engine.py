@@ -0,0 +1,846 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# chance that a bounce off the wall also re-randomises the heading
+BOUNCE_TURN_PROBABILITY = 0.5
+# the 3x3 block of grid cells around a query cell
+NEIGHBOUR_OFFSETS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64)
+# below this much food, nearest-food queries compare against every food directly
+BRUTE_FORCE_FOOD_LIMIT = 256
+# cap on creature-food distance pairs materialised at once by the direct scan
+BRUTE_FORCE_CHUNK_PAIRS = 1 << 21
+
+
+# ring_offsets(ring)
+#
+# @param ring  Chebyshev distance from the centre cell
+# @return (dx, dy) offsets of every cell on that ring
+#
+@lru_cache(maxsize=None)
+def ring_offsets(ring: int) -> np.ndarray:
+    if ring == 0:
+        return np.zeros((1, 2), dtype=np.int64)
+    span = range(-ring, ring + 1)
+    cells = [(dx, -ring) for dx in span] + [(dx, ring) for dx in span]
+    cells += [(-ring, dy) for dy in span[1:-1]] + [(ring, dy) for dy in span[1:-1]]
+    return np.array(cells, dtype=np.int64)
+
+
+# ArrayEngine
+#
+# Struct-of-arrays day engine for BasicSimulation and GreedySimulation. The
+# simulation object only supplies configuration (world size, radii, food and
+# offspring rules); creatures live in NumPy arrays and every tick moves,
+# bounces, latches and feeds the whole population in batched operations.
+#
+# Same-tick food contests are resolved deterministically: each creature
+# reaches for the earliest-spawned food it overlaps, the lowest creature
+# index wins a contested food, and losers retry against whatever is still on
+# the ground until no contest is left.
+class ArrayEngine:
+    # per-creature arrays, all indexed the same way
+    CREATURE_FIELDS = ('position', 'direction', 'energy', 'has_eaten', 'is_survivor')
+    # independent worlds sharing the arrays; see WorldBatch
+    world_count = 1
+
+    # ArrayEngine.__init__(sim, seed)
+    #
+    # @param sim  the configured simulation whose creatures seed the arrays
+    # @param seed  seed for the engine's NumPy generator; defaults to the simulation's seed
+    # @return None
+    #
+    def __init__(self, sim, seed: Optional[int] = None):
+        self.sim = sim
+        self.params = sim.params
+        self.seed = int(getattr(sim, 'seed', 0)) if seed is None else int(seed)
+        self.rng = np.random.default_rng(self.seed)
+        self.width = float(sim.width)
+        self.height = float(sim.height)
+        self.base_radius = float(sim.get_creature_radius())
+        self.food_radius = float(sim.get_food_radius())
+        self.day = 0
+        self.food_spawned = 0
+        self._day_start_creatures = 0
+        # creatures the last step_tick moved
+        self.ticked_creatures = 0
+        self._load_creatures(sim.creatures)
+        self.food_position = np.empty((0, 2), dtype=np.float64)
+        self.food_alive = np.empty(0, dtype=bool)
+        self._grid: Optional[Tuple] = None
+
+    def _load_creatures(self, creatures) -> None:
+        n = len(creatures)
+        self.position = np.array([c.position for c in creatures], dtype=np.float64).reshape(n, 2)
+        self.direction = np.array([c.direction for c in creatures], dtype=np.float64).reshape(n, 2)
+        self.energy = np.array([c.energy for c in creatures], dtype=np.int64)
+        self.has_eaten = np.zeros(n, dtype=np.int64)
+        self.is_survivor = np.zeros(n, dtype=bool)
+
+    @property
+    def creature_count(self) -> int:
+        return int(self.position.shape[0])
+
+    # ArrayEngine.radius(idx)
+    #
+    # @param idx  creature indices
+    # @return the collision radius of each indexed creature
+    #
+    def radius(self, idx: np.ndarray) -> np.ndarray:
+        return np.full(idx.shape[0], self.base_radius)
+
+    # ArrayEngine._creature_layer(idx) / ArrayEngine._food_layer()
+    #
+    # Food grids hold one layer of cells per world so queries never reach
+    # into another world. A single-world engine has only layer 0.
+    #
+    # @param idx  creature indices
+    # @return grid layer of each indexed creature / of every spawned food
+    #
+    def _creature_layer(self, idx: np.ndarray):
+        return 0
+
+    def _food_layer(self):
+        return 0
+
+    # ArrayEngine.begin_day()
+    #
+    # @return number of creatures alive at day start
+    #
+    def begin_day(self) -> int:
+        n = self.creature_count
+        self.energy[:] = self.sim.get_creature_max_energy()
+        self.has_eaten[:] = 0
+        self.is_survivor[:] = False
+        self._day_start_creatures = n
+        if n > 0:
+            self._spawn_food(self.sim.food_count_for_day(n))
+        return n
+
+    def _spawn_food(self, count: int) -> None:
+        margin = max(self.food_radius + 2, self.base_radius + 2)
+        self.food_position = np.column_stack((
+            self._draw_food(count, 'uniform', margin, self.width - margin),
+            self._draw_food(count, 'uniform', margin, self.height - margin),
+        ))
+        self.food_alive = np.ones(count, dtype=bool)
+        self.food_spawned = count
+        self._build_food_grid()
+
+    # ArrayEngine._draw(rows, method, *args)
+    #
+    # Every random value of a creature comes from here, one per row in row
+    # order, so a batch can take each world's values from its own generator.
+    #
+    # @param rows  creature rows the values are for, ascending
+    # @param method  Generator method: 'random', 'uniform' or 'integers'
+    # @param args  the method's arguments before size
+    # @return one value per row
+    #
+    def _draw(self, rows: np.ndarray, method: str, *args) -> np.ndarray:
+        return getattr(self.rng, method)(*args, rows.shape[0])
+
+    # ArrayEngine._draw_food(count, method, *args)
+    #
+    # _draw() for the day's food, one value per spawned food.
+    #
+    def _draw_food(self, count: int, method: str, *args) -> np.ndarray:
+        return getattr(self.rng, method)(*args, count)
+
+    # ArrayEngine._build_food_grid()
+    #
+    # @return None
+    #
+    def _build_food_grid(self) -> None:
+        n = self.creature_count
+        max_radius = float(self.radius(np.arange(n)).max()) if n else self.base_radius
+        self._grid = self._bucket_food(max_radius + self.food_radius)
+
+    # ArrayEngine._bucket_food(cell)
+    #
+    # Buckets every spawned food by grid cell and records where each cell's
+    # run starts and ends in the sorted order. Eaten food stays in its bucket
+    # and is filtered out by food_alive at query time.
+    #
+    # @param cell  grid cell edge length
+    # @return (cell, cols, rows, order, starts, ends)
+    #
+    def _bucket_food(self, cell: float) -> Tuple:
+        cell = max(1.0, float(cell))
+        cols = int(self.width // cell) + 1
+        rows = int(self.height // cell) + 1
+        fx = np.clip((self.food_position[:, 0] // cell).astype(np.int64), 0, cols - 1)
+        fy = np.clip((self.food_position[:, 1] // cell).astype(np.int64), 0, rows - 1)
+        keys = self._food_layer() * (cols * rows) + fx * rows + fy
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        cell_ids = np.arange(self.world_count * cols * rows)
+        starts = np.searchsorted(sorted_keys, cell_ids, side='left')
+        ends = np.searchsorted(sorted_keys, cell_ids, side='right')
+        return cell, cols, rows, order, starts, ends
+
+    # ArrayEngine.step_tick()
+    #
+    # @return True once every living creature has reached an edge or died
+    #
+    def step_tick(self) -> bool:
+        active = np.flatnonzero(~self.is_survivor & (self.energy > 0))
+        self.ticked_creatures = int(active.size)
+        if active.size:
+            self._move(active)
+            self._handle_edges(active)
+            self._collide(active[self.energy[active] > 0])
+
+        # if no food remains, all uneaten creatures instantly die
+        if not self.food_alive.any():
+            starving = (self.has_eaten == 0) & ~self.is_survivor & (self.energy > 0)
+            self.energy[starving] = 0
+
+        return not np.any(~self.is_survivor & (self.energy > 0))
+
+    def _random_directions(self, rows: np.ndarray) -> np.ndarray:
+        angle = self._draw(rows, 'uniform', 0.0, 2.0 * np.pi)
+        return np.column_stack((np.cos(angle), np.sin(angle)))
+
+    def _move(self, idx: np.ndarray) -> None:
+        turning = idx[self._draw(idx, 'random') < self.params.turn_chance]
+        if turning.size:
+            self.direction[turning] = self._random_directions(turning)
+        self.position[idx] += self.direction[idx] * self.params.creature_step_size
+        self.energy[idx] -= 1
+
+    def _handle_edges(self, idx: np.ndarray) -> None:
+        r = self.radius(idx)
+        x = self.position[idx, 0]
+        y = self.position[idx, 1]
+        touched = (x <= r) | (x >= self.width - r) | (y <= r) | (y >= self.height - r)
+        fed = self.has_eaten[idx] > 0
+
+        # fed creatures that reach an edge are safe for the day
+        latch = fed & touched
+        if latch.any():
+            ids = idx[latch]
+            self.is_survivor[ids] = True
+            self.position[ids, 0] = np.clip(x[latch], r[latch], self.width - r[latch])
+            self.position[ids, 1] = np.clip(y[latch], r[latch], self.height - r[latch])
+
+        # unfed creatures bounce back into the world
+        hungry = ~fed
+        if not hungry.any():
+            return
+        ids = idx[hungry]
+        r = r[hungry]
+        x = x[hungry]
+        y = y[hungry]
+        low_x = x < r
+        high_x = x > self.width - r
+        low_y = y < r
+        high_y = y > self.height - r
+        flip_x = low_x | high_x
+        flip_y = low_y | high_y
+        self.position[ids, 0] = np.where(low_x, r, np.where(high_x, self.width - r, x))
+        self.position[ids, 1] = np.where(low_y, r, np.where(high_y, self.height - r, y))
+        self.direction[ids[flip_x], 0] *= -1.0
+        self.direction[ids[flip_y], 1] *= -1.0
+        bounced = ids[flip_x | flip_y]
+        if bounced.size:
+            turning = bounced[self._draw(bounced, 'random') < BOUNCE_TURN_PROBABILITY]
+            if turning.size:
+                self.direction[turning] = self._random_directions(turning)
+
+    # ArrayEngine._grid_pairs(pos, offsets, grid, layer)
+    #
+    # @param pos  query points, one per row
+    # @param offsets  (dx, dy) cell offsets to visit around each point's cell
+    # @param grid  bucketing from _bucket_food(); defaults to the collision grid
+    # @param layer  grid layer of each query point (see _creature_layer)
+    # @return (row, food) index arrays for every live food in the visited cells
+    #
+    def _grid_pairs(self, pos: np.ndarray, offsets: np.ndarray, grid: Optional[Tuple] = None, layer=0) -> Tuple[np.ndarray, np.ndarray]:
+        cell, cols, rows, order, starts, ends = self._grid if grid is None else grid
+        width = offsets.shape[0]
+        cx = np.clip((pos[:, 0] // cell).astype(np.int64), 0, cols - 1)
+        cy = np.clip((pos[:, 1] // cell).astype(np.int64), 0, rows - 1)
+        ncx = cx[:, None] + offsets[None, :, 0]
+        ncy = cy[:, None] + offsets[None, :, 1]
+        valid = (ncx >= 0) & (ncx < cols) & (ncy >= 0) & (ncy < rows)
+        first = np.asarray(layer) * (cols * rows)
+        if first.ndim:
+            first = first[:, None]
+        keys = np.where(valid, first + ncx * rows + ncy, 0)
+        counts = np.where(valid, ends[keys] - starts[keys], 0).ravel()
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        owner = np.repeat(np.arange(counts.shape[0]) // width, counts)
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        food = order[np.repeat(starts[keys].ravel(), counts) + within]
+        keep = self.food_alive[food]
+        return owner[keep], food[keep]
+
+    # ArrayEngine._collision_pairs(idx)
+    #
+    # @param idx  creature indices that may eat this tick
+    # @return (creature, food) index arrays of every overlapping pair
+    #
+    def _collision_pairs(self, idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        pos = self.position[idx]
+        owner, food = self._grid_pairs(pos, NEIGHBOUR_OFFSETS, layer=self._creature_layer(idx))
+        reach = self.radius(idx)[owner] + self.food_radius
+        delta = self.food_position[food] - pos[owner]
+        hit = np.hypot(delta[:, 0], delta[:, 1]) <= reach
+        return idx[owner[hit]], food[hit]
+
+    def _collide(self, idx: np.ndarray) -> None:
+        if idx.size == 0 or not self.food_alive.any():
+            return
+        creature, food = self._collision_pairs(idx)
+        if creature.size == 0:
+            return
+        # each creature's earliest-spawned food first
+        order = np.lexsort((food, creature))
+        creature = creature[order]
+        food = food[order]
+        while creature.size:
+            first = np.unique(creature, return_index=True)[1]
+            want_creature = creature[first]
+            want_food = food[first]
+            # lowest creature index wins a contested food
+            contest = np.lexsort((want_creature, want_food))
+            winners = contest[np.unique(want_food[contest], return_index=True)[1]]
+            self._feed(want_creature[winners], want_food[winners])
+            # losers retry with the food that is still available
+            fed = np.zeros(self.creature_count, dtype=bool)
+            fed[want_creature[winners]] = True
+            remaining = ~fed[creature] & self.food_alive[food]
+            creature = creature[remaining]
+            food = food[remaining]
+
+    def _feed(self, creature: np.ndarray, food: np.ndarray) -> None:
+        self.food_alive[food] = False
+        self.has_eaten[creature] += 1
+        self.energy[creature] = np.minimum(self.energy[creature] + self.params.food_energy, self.energy_cap(creature))
+
+    # ArrayEngine.energy_cap(creature)
+    #
+    # @param creature  indices of the creatures that just ate
+    # @return the most energy each of them can hold
+    #
+    def energy_cap(self, creature: np.ndarray):
+        # mirror handle_creature_collision: energy gain is clamped to the simulation's max
+        return self.sim.get_creature_max_energy()
+
+    # ArrayEngine.end_day()
+    #
+    # @return (start_creatures, food_spawned, survivors, died)
+    #
+    def end_day(self) -> Tuple[int, int, int, int]:
+        start_creatures = self._day_start_creatures
+        if start_creatures == 0:
+            return 0, 0, 0, 0
+        keep = self.is_survivor.copy()
+        survivors = int(keep.sum())
+        died = start_creatures - survivors
+        self._select(keep)
+        return start_creatures, self.food_spawned, survivors, died
+
+    def _select(self, keep: np.ndarray) -> None:
+        for field in self.CREATURE_FIELDS:
+            setattr(self, field, getattr(self, field)[keep])
+
+    # ArrayEngine.run_day()
+    #
+    # @return (start_creatures, food_spawned, survivors, died)
+    #
+    def run_day(self) -> Tuple[int, int, int, int]:
+        if self.begin_day() > 0:
+            while not self.step_tick():
+                pass
+        return self.end_day()
+
+    # ArrayEngine.offspring_counts()
+    #
+    # @return per-survivor number of creatures for the next day
+    #
+    def offspring_counts(self) -> np.ndarray:
+        counts = np.zeros(self.creature_count, dtype=np.int64)
+        for eaten in np.unique(self.has_eaten):
+            counts[self.has_eaten == eaten] = self.sim.get_offspring_count(int(eaten))
+        return counts
+
+    # ArrayEngine.reproduce_survivors()
+    #
+    # @return None
+    #
+    def reproduce_survivors(self) -> None:
+        counts = self.offspring_counts()
+        parents = np.repeat(np.arange(self.creature_count), counts)
+        self._spawn_generation(parents)
+
+    # ArrayEngine._spawn_generation(parents)
+    #
+    # @param parents  survivor index for each creature of the next day
+    # @return None
+    #
+    def _spawn_generation(self, parents: np.ndarray) -> None:
+        n = parents.shape[0]
+        rows = np.arange(n)
+        self.position = self._points_on_random_edge(rows, self.base_radius)
+        self.direction = self._random_directions(rows)
+        self.energy = np.full(n, self.sim.get_creature_max_energy(), dtype=self.energy.dtype)
+        self.has_eaten = np.zeros(n, dtype=np.int64)
+        self.is_survivor = np.zeros(n, dtype=bool)
+
+    def _points_on_random_edge(self, rows: np.ndarray, margin: float) -> np.ndarray:
+        edge = self._draw(rows, 'integers', 0, 4)
+        along_x = self._draw(rows, 'uniform', margin, self.width - margin)
+        along_y = self._draw(rows, 'uniform', margin, self.height - margin)
+        x = np.select([edge == 2, edge == 3], [margin, self.width - margin], along_x)
+        y = np.select([edge == 0, edge == 1], [margin, self.height - margin], along_y)
+        return np.column_stack((x, y))
+
+
+# MutationArrayEngine
+#
+# Batched MutationSimulation engine. Speed, size and intelligence are stored
+# as arrays; sensing, noisy heading, turn blending, movement and the
+# speed x size x intelligence energy drain run for the whole population at
+# once, and reproduction builds the next day's arrays with vectorised
+# mutation. Nearest-food sensing walks grid rings outward (or scans directly
+# when little food is left) and breaks ties toward the earliest-spawned food.
+class MutationArrayEngine(ArrayEngine):
+    CREATURE_FIELDS = ArrayEngine.CREATURE_FIELDS + ('speed', 'size', 'intelligence', 'body_radius', 'creature_id')
+
+    def _load_creatures(self, creatures) -> None:
+        super()._load_creatures(creatures)
+        self.energy = self.energy.astype(np.float64)
+        self.speed = np.array([c.traits.get('speed', 1.0) for c in creatures], dtype=np.float64)
+        self.size = np.array([c.traits.get('size', 1.0) for c in creatures], dtype=np.float64)
+        self.intelligence = np.array([c.traits.get('intelligence', 1.0) for c in creatures], dtype=np.float64)
+        self.creature_id = np.array([c.creature_id for c in creatures], dtype=np.int64)
+        self._update_body_radius()
+
+    def _update_body_radius(self) -> None:
+        self.body_radius = self.base_radius * np.sqrt(np.maximum(0.0001, self.size))
+
+    def radius(self, idx: np.ndarray) -> np.ndarray:
+        return self.body_radius[idx]
+
+    def energy_cap(self, creature: np.ndarray):
+        return float(self.sim.get_creature_max_energy())
+
+    # MutationArrayEngine._normalize(rows, vectors)
+    #
+    # @param rows  creature row of each vector
+    # @param vectors  one (x, y) vector per row
+    # @return the vectors scaled to unit length; a zero vector becomes a random direction
+    #
+    def _normalize(self, rows: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        magnitude = np.hypot(vectors[:, 0], vectors[:, 1])
+        degenerate = magnitude <= 0
+        out = vectors / np.where(degenerate, 1.0, magnitude)[:, None]
+        if degenerate.any():
+            out[degenerate] = self._random_directions(rows[degenerate])
+        return out
+
+    # MutationArrayEngine.nearest_food(idx, sensing_range)
+    #
+    # @param idx  creature indices
+    # @param sensing_range  per-creature sensing radius
+    # @return (food index or -1, distance) per creature
+    #
+    def nearest_food(self, idx: np.ndarray, sensing_range: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        n = idx.shape[0]
+        best_food = np.full(n, -1, dtype=np.int64)
+        best_dist = np.full(n, np.inf)
+        alive = np.flatnonzero(self.food_alive)
+        if n == 0 or alive.size == 0:
+            return best_food, best_dist
+        pos = self.position[idx]
+        if alive.size <= BRUTE_FORCE_FOOD_LIMIT:
+            food_x = self.food_position[alive, 0]
+            food_y = self.food_position[alive, 1]
+            range_sq = sensing_range * sensing_range
+            chunk = max(1, BRUTE_FORCE_CHUNK_PAIRS // alive.size)
+            if self.world_count > 1:
+                food_layer = self._food_layer()[alive]
+            for start in range(0, n, chunk):
+                stop = min(n, start + chunk)
+                dx = food_x[None, :] - pos[start:stop, 0, None]
+                dist_sq = dx * dx
+                dy = food_y[None, :] - pos[start:stop, 1, None]
+                dist_sq += dy * dy
+                dist_sq[dist_sq > range_sq[start:stop, None]] = np.inf
+                if self.world_count > 1:
+                    dist_sq[self._creature_layer(idx[start:stop])[:, None] != food_layer[None, :]] = np.inf
+                # argmin keeps the first (earliest-spawned) food on ties
+                nearest = np.argmin(dist_sq, axis=1)
+                found_sq = dist_sq[np.arange(stop - start), nearest]
+                found = np.isfinite(found_sq)
+                best_food[start:stop][found] = alive[nearest[found]]
+                best_dist[start:stop][found] = np.sqrt(found_sq[found])
+            return best_food, best_dist
+
+        grid = self._sensing_grid(alive.size)
+        cell, cols, rows = grid[:3]
+        cx = np.clip((pos[:, 0] // cell).astype(np.int64), 0, cols - 1)
+        cy = np.clip((pos[:, 1] // cell).astype(np.int64), 0, rows - 1)
+        pending = np.arange(n)
+        for ring in range(max(cols, rows) + 1):
+            if ring > 0:
+                # nothing outside the rings searched so far can be closer than this
+                p = pending
+                lower_bound = np.minimum.reduce([
+                    pos[p, 0] - (cx[p] - ring + 1) * cell,
+                    (cx[p] + ring) * cell - pos[p, 0],
+                    pos[p, 1] - (cy[p] - ring + 1) * cell,
+                    (cy[p] + ring) * cell - pos[p, 1],
+                ])
+                finished = (lower_bound > sensing_range[p]) | (best_dist[p] < lower_bound)
+                pending = p[~finished]
+            if pending.size == 0:
+                break
+            owner, food = self._grid_pairs(pos[pending], ring_offsets(ring), grid, self._creature_layer(idx[pending]))
+            if owner.size == 0:
+                continue
+            delta = self.food_position[food] - pos[pending[owner]]
+            dist = np.hypot(delta[:, 0], delta[:, 1])
+            in_range = dist <= sensing_range[pending[owner]]
+            owner, food, dist = owner[in_range], food[in_range], dist[in_range]
+            if owner.size == 0:
+                continue
+            # pairs arrive grouped by owner: take each group's closest, then earliest food
+            starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+            group = np.repeat(np.arange(starts.shape[0]), np.diff(np.r_[starts, owner.shape[0]]))
+            closest = np.minimum.reduceat(dist, starts)
+            tied_food = np.where(dist == closest[group], food, np.iinfo(np.int64).max)
+            food = np.minimum.reduceat(tied_food, starts)
+            dist = closest
+            who = pending[owner[starts]]
+            better = (dist < best_dist[who]) | ((dist == best_dist[who]) & (food < best_food[who]))
+            best_dist[who[better]] = dist[better]
+            best_food[who[better]] = food[better]
+        return best_food, best_dist
+
+    # MutationArrayEngine._sensing_grid(alive_count)
+    #
+    # Sensing ranges span much of the world, so nearest-food rings use their
+    # own grid sized for roughly two live foods per cell. It is rebuilt once
+    # the live food count halves so rings never walk long runs of empty cells.
+    #
+    # @param alive_count  number of foods still on the ground
+    # @return bucketing from _bucket_food()
+    #
+    def _sensing_grid(self, alive_count: int) -> Tuple:
+        cached = getattr(self, '_sensing', None)
+        if cached is None or cached[0] is not self.food_alive or alive_count * 2 < cached[1]:
+            cell = max(self._grid[0], np.sqrt(2.0 * self.width * self.height * self.world_count / max(1, alive_count)))
+            cached = (self.food_alive, alive_count, self._bucket_food(cell))
+            self._sensing = cached
+        return cached[2]
+
+    def _move(self, idx: np.ndarray) -> None:
+        self._steer(idx)
+        speed = self.speed[idx]
+        size_mult = np.maximum(0.0001, self.size[idx])
+        intelligence = np.maximum(0.1, self.intelligence[idx])
+        self.position[idx] += self.direction[idx] * (self.params.creature_step_size * speed)[:, None]
+        # energy drained per move scales with speed, size, and modestly with intelligence.
+        intelligence_factor = 1.0 + self.params.intelligence_energy_cost * np.maximum(0.0, intelligence - 1.0)
+        self.energy[idx] -= speed * size_mult * intelligence_factor
+
+    def _steer(self, idx: np.ndarray) -> None:
+        intelligence = np.maximum(0.1, self.intelligence[idx])
+        food, dist = self.nearest_food(idx, self.params.intelligence_base_range * intelligence)
+        sensed = food >= 0
+
+        # nothing in range: wander like the basic creatures
+        wandering = idx[~sensed]
+        turning = wandering[self._draw(wandering, 'random') < self.params.turn_chance]
+        if turning.size:
+            self.direction[turning] = self._random_directions(turning)
+        if not sensed.any():
+            return
+
+        ids = idx[sensed]
+        intelligence = intelligence[sensed]
+        food = food[sensed]
+        dist = dist[sensed]
+        desired = self._normalize(ids, self.food_position[food] - self.position[ids])
+        # Smarter creatures get less angular error, but still imperfect information.
+        max_error = np.radians(self.params.intelligence_base_error_degrees) / intelligence
+        angle = self._draw(ids, 'uniform', -1.0, 1.0) * max_error
+        cos_a = np.cos(angle)
+        sin_a = np.sin(angle)
+        noisy = self._normalize(ids, np.column_stack((
+            desired[:, 0] * cos_a - desired[:, 1] * sin_a,
+            desired[:, 0] * sin_a + desired[:, 1] * cos_a,
+        )))
+        turn_weight = np.clip(self.params.intelligence_turn_rate * intelligence, 0.05, 1.0)[:, None]
+        blended = self._normalize(ids, (1.0 - turn_weight) * self.direction[ids] + turn_weight * noisy)
+        touching = dist <= self.body_radius[ids] + self.food_radius
+        self.direction[ids] = np.where(touching[:, None], noisy, blended)
+
+    def end_day(self) -> Tuple[int, int, int, int]:
+        # archive before _select drops the creatures that died
+        if self._day_start_creatures > 0:
+            self._record_day()
+        return super().end_day()
+
+    # MutationArrayEngine._record_day()
+    #
+    # @return None; the day's creatures go to the simulation's lineage and trait archive
+    #
+    def _record_day(self) -> None:
+        self.sim.lineage.record_day(self.creature_id)
+        if getattr(self.sim, 'record_traits', False):
+            self.sim.archive_day(self.speed, self.size, self.intelligence, self.has_eaten, self.energy)
+
+    # MutationArrayEngine._mutates(trait, parents)
+    #
+    # @param trait  'speed', 'size' or 'intelligence'
+    # @param parents  parent index of each new child
+    # @return per child, whether that trait may mutate
+    #
+    def _mutates(self, trait: str, parents: np.ndarray) -> np.ndarray:
+        return np.full(parents.shape[0], bool(getattr(self.sim, f'mutation_{trait}_enabled', True)))
+
+    # MutationArrayEngine._add_births(parent_ids, parents)
+    #
+    # @param parent_ids  lineage id of each new child's parent
+    # @param parents  parent index of each new child
+    # @return lineage ids of the children
+    #
+    def _add_births(self, parent_ids: np.ndarray, parents: np.ndarray) -> np.ndarray:
+        return self.sim.lineage.add_births(parent_ids)
+
+    def reproduce_survivors(self) -> None:
+        counts = self.offspring_counts()
+        parents = np.repeat(np.arange(self.creature_count), counts)
+        # the first slot of each survivor is itself, any second slot is a mutated child
+        child_slots = (np.cumsum(counts) - counts)[counts > 1] + 1
+        traits = {
+            'speed': (self.speed[parents], self.params.mutation_speed_delta),
+            'size': (self.size[parents], self.params.mutation_size_delta),
+            'intelligence': (self.intelligence[parents], self.params.mutation_intelligence_delta),
+        }
+        for trait, (values, delta) in traits.items():
+            slots = child_slots[self._mutates(trait, parents[child_slots])]
+            if slots.size:
+                # drawn for the parents' rows: the next generation's rows do not exist yet
+                change = self._draw(parents[slots], 'uniform', -delta, delta)
+                # prevent collapsing to zero/negative size or speed
+                values[slots] = np.maximum(0.1, values[slots] * (1.0 + change))
+        creature_id = self.creature_id[parents]
+        if child_slots.size:
+            creature_id[child_slots] = self._add_births(creature_id[child_slots], parents[child_slots])
+        self._spawn_generation(parents)
+        self.creature_id = creature_id
+        self.speed = traits['speed'][0]
+        self.size = traits['size'][0]
+        self.intelligence = traits['intelligence'][0]
+        self._update_body_radius()
+
+
+# WorldBatch
+#
+# Runs K independent worlds of one simulation class in a single set of
+# engine arrays. Creatures of every world are stacked in the usual flat
+# arrays with a `world` index, food carries `food_world`, and the food grid
+# gets one layer of cells per world, so each tick moves, bounces, senses
+# and feeds all K populations in the same few array operations while no
+# query ever sees another world's food. Worlds keep their own food count,
+# max energy, offspring rule and day results; a world whose creatures are
+# all done for the day has nothing active and costs nothing, and an extinct
+# world simply holds no rows.
+#
+# The worlds must share their size and SimParams apart from
+# creature_max_energy, which energy sweeps vary. Each world draws from its
+# own generator, seeded like a single-world engine with its simulation's
+# seed. Rows stay grouped by world, so every world sees the draws in the
+# order a single-world engine would use, and a world's run depends only on
+# its own seed, whatever it was batched with.
+class WorldBatch:
+    # WorldBatch.__init__(sims)
+    #
+    # @param sims  the configured simulations, one per world
+    # @return None
+    #
+    def __init__(self, sims):
+        self.sims = list(sims)
+        if not self.sims:
+            raise ValueError('a world batch needs at least one simulation')
+        first = self.sims[0]
+        if len({type(sim) for sim in self.sims}) > 1:
+            raise ValueError('batched worlds must all be the same simulation class')
+        if len({(sim.width, sim.height) for sim in self.sims}) > 1:
+            raise ValueError('batched worlds must all be the same size')
+        if len({sim.params.replace(creature_max_energy=first.params.creature_max_energy) for sim in self.sims}) > 1:
+            raise ValueError('batched worlds may only differ in creature_max_energy')
+        self.world_count = len(self.sims)
+        self.world_max_energy = np.array([sim.get_creature_max_energy() for sim in self.sims])
+        self.world_rngs = [np.random.default_rng(int(sim.seed)) for sim in self.sims]
+        super().__init__(first)
+        self.food_world = np.empty(0, dtype=np.int64)
+        self.food_spawned = np.zeros(self.world_count, dtype=np.int64)
+        self.food_left = np.zeros(self.world_count, dtype=np.int64)
+        self._world_start = np.zeros(self.world_count, dtype=np.int64)
+
+    def _load_creatures(self, creatures) -> None:
+        # every world's creatures, world by world
+        super()._load_creatures([c for sim in self.sims for c in sim.creatures])
+        self.world = np.repeat(np.arange(self.world_count), [len(sim.creatures) for sim in self.sims])
+
+    # WorldBatch.world_populations()
+    #
+    # @return current creature count of each world
+    #
+    def world_populations(self) -> np.ndarray:
+        return np.bincount(self.world, minlength=self.world_count)
+
+    def _creature_layer(self, idx: np.ndarray):
+        return self.world[idx]
+
+    def _draw(self, rows: np.ndarray, method: str, *args) -> np.ndarray:
+        return self._draw_by_world(self.world[rows], method, args)
+
+    def _draw_food(self, count: int, method: str, *args) -> np.ndarray:
+        return self._draw_by_world(self.food_world, method, args)
+
+    # WorldBatch._draw_by_world(worlds, method, args)
+    #
+    # @param worlds  world of each value, non-decreasing
+    # @return the values, each world's run drawn from that world's generator
+    #
+    def _draw_by_world(self, worlds: np.ndarray, method: str, args: tuple) -> np.ndarray:
+        counts = np.bincount(worlds, minlength=self.world_count)
+        parts = [getattr(self.world_rngs[k], method)(*args, int(counts[k])) for k in np.flatnonzero(counts)]
+        if not parts:
+            return getattr(self.world_rngs[0], method)(*args, 0)
+        return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+    def _food_layer(self):
+        return self.food_world
+
+    def begin_day(self) -> int:
+        n = self.creature_count
+        self.energy[:] = self.world_max_energy[self.world]
+        self.has_eaten[:] = 0
+        self.is_survivor[:] = False
+        self._day_start_creatures = n
+        self._world_start = self.world_populations()
+        if n > 0:
+            counts = [sim.food_count_for_day(int(start)) if start > 0 else 0 for sim, start in zip(self.sims, self._world_start)]
+            self._spawn_food(np.asarray(counts, dtype=np.int64))
+        return n
+
+    # WorldBatch._spawn_food(counts)
+    #
+    # @param counts  food to spawn in each world
+    # @return None
+    #
+    def _spawn_food(self, counts: np.ndarray) -> None:
+        # food_world first: the base spawn buckets food by layer
+        self.food_world = np.repeat(np.arange(self.world_count), counts)
+        super()._spawn_food(int(counts.sum()))
+        self.food_spawned = counts
+        self.food_left = counts.copy()
+
+    def step_tick(self) -> bool:
+        active = np.flatnonzero(~self.is_survivor & (self.energy > 0))
+        self.ticked_creatures = int(active.size)
+        if active.size:
+            self._move(active)
+            self._handle_edges(active)
+            self._collide(active[self.energy[active] > 0])
+
+        # in a world with no food left, all uneaten creatures instantly die
+        if not self.food_left.all():
+            starving = (self.food_left[self.world] == 0) & (self.has_eaten == 0) & ~self.is_survivor & (self.energy > 0)
+            self.energy[starving] = 0
+
+        return not np.any(~self.is_survivor & (self.energy > 0))
+
+    def _feed(self, creature: np.ndarray, food: np.ndarray) -> None:
+        super()._feed(creature, food)
+        self.food_left -= np.bincount(self.food_world[food], minlength=self.world_count)
+
+    def energy_cap(self, creature: np.ndarray):
+        return self.world_max_energy[self.world[creature]]
+
+    # WorldBatch.end_day()
+    #
+    # @return (start_creatures, food_spawned, survivors, died) for each world
+    #
+    def end_day(self) -> List[Tuple[int, int, int, int]]:
+        keep = self.is_survivor.copy()
+        survived = np.bincount(self.world[keep], minlength=self.world_count)
+        results = []
+        for start, food, survivors in zip(self._world_start, self.food_spawned, survived):
+            if start == 0:
+                results.append((0, 0, 0, 0))
+            else:
+                results.append((int(start), int(food), int(survivors), int(start - survivors)))
+        self._select(keep)
+        self._world_start = np.zeros(self.world_count, dtype=np.int64)
+        self.food_spawned = np.zeros(self.world_count, dtype=np.int64)
+        return results
+
+    def offspring_counts(self) -> np.ndarray:
+        counts = np.zeros(self.creature_count, dtype=np.int64)
+        for eaten in np.unique(self.has_eaten):
+            per_world = np.array([sim.get_offspring_count(int(eaten)) for sim in self.sims], dtype=np.int64)
+            mask = self.has_eaten == eaten
+            counts[mask] = per_world[self.world[mask]]
+        return counts
+
+    def _spawn_generation(self, parents: np.ndarray) -> None:
+        # the new rows draw from their own world's generator
+        self.world = self.world[parents]
+        super()._spawn_generation(parents)
+        self.energy = self.world_max_energy[self.world].astype(self.energy.dtype)
+
+
+# BatchArrayEngine
+#
+# WorldBatch of BasicSimulation or GreedySimulation worlds.
+class BatchArrayEngine(WorldBatch, ArrayEngine):
+    CREATURE_FIELDS = ArrayEngine.CREATURE_FIELDS + ('world',)
+
+
+# BatchMutationArrayEngine
+#
+# WorldBatch of MutationSimulation worlds. Lineage, the trait archive and
+# the mutation switches stay per world.
+class BatchMutationArrayEngine(WorldBatch, MutationArrayEngine):
+    CREATURE_FIELDS = MutationArrayEngine.CREATURE_FIELDS + ('world',)
+
+    def end_day(self) -> List[Tuple[int, int, int, int]]:
+        # WorldBatch.end_day does not chain to MutationArrayEngine's
+        if self._day_start_creatures > 0:
+            self._record_day()
+        return super().end_day()
+
+    def _record_day(self) -> None:
+        for k, sim in enumerate(self.sims):
+            if self._world_start[k] == 0:
+                continue
+            rows = self.world == k
+            sim.lineage.record_day(self.creature_id[rows])
+            if getattr(sim, 'record_traits', False):
+                sim.archive_day(self.speed[rows], self.size[rows], self.intelligence[rows], self.has_eaten[rows], self.energy[rows])
+
+    def _mutates(self, trait: str, parents: np.ndarray) -> np.ndarray:
+        enabled = np.array([bool(getattr(sim, f'mutation_{trait}_enabled', True)) for sim in self.sims])
+        return enabled[self.world[parents]]
+
+    def _add_births(self, parent_ids: np.ndarray, parents: np.ndarray) -> np.ndarray:
+        child_ids = parent_ids.copy()
+        world = self.world[parents]
+        for k in np.unique(world):
+            rows = world == k
+            child_ids[rows] = self.sims[k].lineage.add_births(parent_ids[rows])
+        return child_ids
@@ -2,7 +2,7 @@ import math
 import os
 import random
 import csv
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 
 import pygame
@@ -15,15 +15,13 @@ from constants import (
     CREATURE_COLOR,
     FOOD_COLOR,
     DEAD_COLOR,
-    CREATURE_RADIUS,
     FOOD_RADIUS,
     TICKS_PER_SECOND,
     CREATURE_MAX_ENERGY,
-    FOOD_ENERGY,
-    CREATURE_STEP_SIZE,
-    START_CREATURES,
 )
 from simulation import Simulation
+from sprites import circle_blit
+from params import SimParams, DEFAULT_PARAMS
 
 
 # clamp(value, min_value, max_value)
@@ -37,12 +35,13 @@ def clamp(value: float, min_value: float, max_value: float) -> float:
     return max(min_value, min(value, max_value))
 
 
-# random_unit_vector()
+# random_unit_vector(rng)
 # 
+# @param rng  random source; a simulation passes its own seeded generator
 # @return a random 2D unit vector as (x, y)
 # 
-def random_unit_vector() -> Tuple[float, float]:
-    angle = random.uniform(0, 2 * math.pi)
+def random_unit_vector(rng: random.Random = random) -> Tuple[float, float]:
+    angle = rng.uniform(0, 2 * math.pi)
     return math.cos(angle), math.sin(angle)
 
 
@@ -56,44 +55,70 @@ def distance(a: Tuple[float, float], b: Tuple[float, float]) -> float:
     return math.hypot(a[0] - b[0], a[1] - b[1])
 
 
-# point_on_random_edge(width, height, margin)
+# point_on_random_edge(width, height, margin, rng)
 # 
 # @param width  the world width in pixels
 # @param height  the world height in pixels
 # @param margin  inset to keep circles visible fully on-screen
+# @param rng  random source; a simulation passes its own seeded generator
 # @return a random point on one of the four borders
 # 
-def point_on_random_edge(width: int, height: int, margin: int = 0) -> Tuple[float, float]:
-    edge = random.choice(['top', 'bottom', 'left', 'right'])
+def point_on_random_edge(width: int, height: int, margin: int = 0, rng: random.Random = random) -> Tuple[float, float]:
+    edge = rng.choice(['top', 'bottom', 'left', 'right'])
     if edge == 'top':
-        return random.uniform(margin, width - margin), margin
+        return rng.uniform(margin, width - margin), margin
     if edge == 'bottom':
-        return random.uniform(margin, width - margin), height - margin
+        return rng.uniform(margin, width - margin), height - margin
     if edge == 'left':
-        return margin, random.uniform(margin, height - margin)
-    return width - margin, random.uniform(margin, height - margin)
+        return margin, rng.uniform(margin, height - margin)
+    return width - margin, rng.uniform(margin, height - margin)
 
 
-# random_point_interior(width, height, margin)
+# random_point_interior(width, height, margin, rng)
 # 
 # @param width  the world width in pixels
 # @param height  the world height in pixels
 # @param margin  inset to keep inside the border by at least this many pixels
+# @param rng  random source; a simulation passes its own seeded generator
 # @return a random point strictly inside the rectangle
 # 
-def random_point_interior(width: int, height: int, margin: int) -> Tuple[float, float]:
+def random_point_interior(width: int, height: int, margin: int, rng: random.Random = random) -> Tuple[float, float]:
     return (
-        random.uniform(margin, width - margin),
-        random.uniform(margin, height - margin),
+        rng.uniform(margin, width - margin),
+        rng.uniform(margin, height - margin),
     )
 
 
+# _ticks_to_bound(coord, step, low, high)
+#
+# @param coord  current coordinate along one axis
+# @param step  movement per tick along that axis
+# @param low  coordinate at or below which the edge is touched
+# @param high  coordinate at or above which the edge is touched
+# @return ticks until the coordinate touches a bound, or infinity if it never does
+#
+def _ticks_to_bound(coord: float, step: float, low: float, high: float) -> float:
+    if step > 0:
+        return max(1, math.ceil((high - coord) / step))
+    if step < 0:
+        return max(1, math.ceil((coord - low) / -step))
+    return math.inf
+
+
 # Food
 # 
 # Represents a single food item placed in the world, drawn as a green circle.
 @dataclass
 class Food:
     position: Tuple[float, float]
+    radius: int = FOOD_RADIUS
+
+    # Food.sprite_blit()
+    #
+    # @return (sprite, top-left) for Surface.blits()
+    #
+    def sprite_blit(self) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        return circle_blit(self.position, self.radius, FOOD_COLOR)
 
     # Food.draw(surface)
     # 
@@ -101,7 +126,7 @@ class Food:
     # @return None
     # 
     def draw(self, surface: pygame.Surface) -> None:
-        pygame.draw.circle(surface, FOOD_COLOR, (int(self.position[0]), int(self.position[1])), FOOD_RADIUS)
+        surface.blit(*self.sprite_blit())
 
 
 # Creature
@@ -114,90 +139,173 @@ class Creature:
     energy: int = CREATURE_MAX_ENERGY
     has_eaten: int = 0  # Number of foods eaten (changed from bool to int)
     is_survivor: bool = False
+    # parameters of the simulation this creature lives in
+    params: SimParams = field(default=DEFAULT_PARAMS, repr=False, compare=False)
 
     def __str__(self) -> str:
         status = "alive" if self.energy > 0 else "dead"
         return f"Creature({status}, eaten {self.has_eaten}, energy: {self.energy})"
 
-    # Creature.move()
+    # Creature.move(rng)
     # 
+    # @param rng  random source for the occasional change of heading
     # @return None
     # 
-    def move(self) -> None:
-        if random.random() < 0.05:
-            self.direction = random_unit_vector()
-        dx = self.direction[0] * CREATURE_STEP_SIZE
-        dy = self.direction[1] * CREATURE_STEP_SIZE
+    def move(self, rng: random.Random = random) -> None:
+        if rng.random() < self.params.turn_chance:
+            self.direction = random_unit_vector(rng)
+        step = self.params.creature_step_size
+        dx = self.direction[0] * step
+        dy = self.direction[1] * step
         self.position = (self.position[0] + dx, self.position[1] + dy)
         self.energy -= 1
 
-    # Creature.handle_edges(width, height)
+    # Creature.handle_edges(width, height, rng)
     # 
     # @param width  the world width in pixels
     # @param height  the world height in pixels
+    # @param rng  random source for re-aiming after a bounce
     # @return None
     # 
-    def handle_edges(self, width: int, height: int) -> None:
+    def handle_edges(self, width: int, height: int, rng: random.Random = random) -> None:
         x, y = self.position
+        r = self.params.creature_radius
         touched_edge = (
-            x <= CREATURE_RADIUS or x >= width - CREATURE_RADIUS or
-            y <= CREATURE_RADIUS or y >= height - CREATURE_RADIUS
+            x <= r or x >= width - r or
+            y <= r or y >= height - r
         )
 
         if self.has_eaten > 0 and touched_edge:
             self.is_survivor = True
-            x = clamp(x, CREATURE_RADIUS, width - CREATURE_RADIUS)
-            y = clamp(y, CREATURE_RADIUS, height - CREATURE_RADIUS)
+            x = clamp(x, r, width - r)
+            y = clamp(y, r, height - r)
             self.position = (x, y)
             return
 
         if self.has_eaten == 0:
             bounced = False
-            if x < CREATURE_RADIUS:
-                x = CREATURE_RADIUS
+            if x < r:
+                x = r
                 self.direction = (-self.direction[0], self.direction[1])
                 bounced = True
-            elif x > width - CREATURE_RADIUS:
-                x = width - CREATURE_RADIUS
+            elif x > width - r:
+                x = width - r
                 self.direction = (-self.direction[0], self.direction[1])
                 bounced = True
-            if y < CREATURE_RADIUS:
-                y = CREATURE_RADIUS
+            if y < r:
+                y = r
                 self.direction = (self.direction[0], -self.direction[1])
                 bounced = True
-            elif y > height - CREATURE_RADIUS:
-                y = height - CREATURE_RADIUS
+            elif y > height - r:
+                y = height - r
                 self.direction = (self.direction[0], -self.direction[1])
                 bounced = True
             if bounced:
-                if random.random() < 0.5:
-                    self.direction = random_unit_vector()
+                if rng.random() < 0.5:
+                    self.direction = random_unit_vector(rng)
             self.position = (x, y)
 
+    # Creature.fast_forward(width, height, rng)
+    #
+    # Resolves the rest of a fed creature's day once no food is left. With
+    # nothing to eat its path is a straight walk broken by random turns, so
+    # instead of stepping tick by tick it jumps from turn to turn: the run
+    # length before the next turn is drawn from the same geometric
+    # distribution move() produces, and each run ends early if the creature
+    # reaches an edge (survives) or runs out of energy (dies).
+    #
+    # @param width  the world width in pixels
+    # @param height  the world height in pixels
+    # @param rng  random source for run lengths and new headings
+    # @return None
+    #
+    def fast_forward(self, width: int, height: int, rng: random.Random = random) -> None:
+        turn_chance = self.params.turn_chance
+        # the geometric draw is undefined at both ends: never turning makes
+        # every run endless, always turning ends every run after its first tick
+        log_keep = math.log(1.0 - turn_chance) if 0.0 < turn_chance < 1.0 else None
+        step = self.params.creature_step_size
+        r = self.params.creature_radius
+        # the first run continues the current heading, so it may be empty
+        certain_steps = 0
+        while self.energy > 0:
+            # ticks before the next turn; a turning tick still moves, in the new heading
+            if log_keep is not None:
+                run = certain_steps + int(math.log(1.0 - rng.random()) / log_keep)
+            elif turn_chance <= 0.0:
+                run = math.inf
+            else:
+                run = certain_steps
+            dx = self.direction[0] * step
+            dy = self.direction[1] * step
+            to_edge = min(
+                _ticks_to_bound(self.position[0], dx, r, width - r),
+                _ticks_to_bound(self.position[1], dy, r, height - r),
+            )
+            # the edge check runs on the tick that spends the last energy too
+            if to_edge <= run and to_edge <= self.energy:
+                x = clamp(self.position[0] + dx * to_edge, r, width - r)
+                y = clamp(self.position[1] + dy * to_edge, r, height - r)
+                self.position = (x, y)
+                self.energy -= to_edge
+                self.is_survivor = True
+                return
+            steps = min(run, self.energy)
+            self.position = (self.position[0] + dx * steps, self.position[1] + dy * steps)
+            self.energy -= steps
+            if self.energy > 0:
+                self.direction = random_unit_vector(rng)
+                certain_steps = 1
+
+    # Creature.sprite_blit()
+    #
+    # @return (sprite, top-left) for Surface.blits()
+    #
+    def sprite_blit(self) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        color = DEAD_COLOR if (not self.is_survivor and self.energy <= 0) else CREATURE_COLOR
+        return circle_blit(self.position, self.params.creature_radius, color)
+
     # Creature.draw(surface)
     # 
     # @param surface  the pygame surface to draw to
     # @return None
     # 
     def draw(self, surface: pygame.Surface) -> None:
-        color = DEAD_COLOR if (not self.is_survivor and self.energy <= 0) else CREATURE_COLOR
-        pygame.draw.circle(surface, color, (int(self.position[0]), int(self.position[1])), CREATURE_RADIUS)
+        surface.blit(*self.sprite_blit())
 
 
 class BasicSimulation(Simulation):
-    # BasicSimulation.__init__(width, height)
+    # food-less movement is a plain random walk, see fast_forward_creature()
+    supports_fast_forward = True
+
+    # BasicSimulation.__init__(width, height, seed, params)
     # 
     # @param width  the world width in pixels
     # @param height  the world height in pixels
+    # @param seed  seed for this simulation's random stream; None picks a fresh one
+    # @param params  behaviour parameters of this world; None uses the constants.py defaults
     # @return None
     # 
-    def __init__(self, width: int, height: int):
-        super().__init__(width, height)
+    def __init__(self, width: int, height: int, seed: Optional[int] = None, params: Optional[SimParams] = None):
+        super().__init__(width, height, seed=seed, params=params)
         # Start with creatures randomly along the edge
-        num_creatures = START_CREATURES['basic_simulation']
+        num_creatures = self.params.creature_count('basic_simulation')
         for _ in range(num_creatures):
-            start_pos = point_on_random_edge(self.width, self.height, margin=CREATURE_RADIUS)
-            self.creatures.append(Creature(position=start_pos, direction=random_unit_vector()))
+            start_pos = point_on_random_edge(self.width, self.height, margin=self.params.creature_radius, rng=self.rng)
+            self.creatures.append(self.new_creature(start_pos))
+
+    # BasicSimulation.new_creature(position)
+    #
+    # @param position  where the creature starts
+    # @return a full-energy creature with a random heading, carrying this world's params
+    #
+    def new_creature(self, position: Tuple[float, float]) -> Creature:
+        return Creature(
+            position=position,
+            direction=random_unit_vector(self.rng),
+            energy=self.params.creature_max_energy,
+            params=self.params,
+        )
 
     # Simulation.spawn_food_for_day(start_creature_count)
     # 
@@ -205,19 +313,26 @@ class BasicSimulation(Simulation):
     # @return None
     # 
     def spawn_food_for_day(self, start_creature_count: int) -> None:
-        # Determine food count based on sim settings
-        if getattr(self, 'food_scaling', True):
-            count = start_creature_count
-        else:
-            fixed = getattr(self, 'fixed_food_count', None)
-            count = fixed if (isinstance(fixed, int) and fixed >= 0) else start_creature_count
+        count = self.food_count_for_day(start_creature_count)
         self.foods = []
-        margin = max(FOOD_RADIUS + 2, CREATURE_RADIUS + 2)
+        margin = max(self.params.food_radius + 2, self.params.creature_radius + 2)
         for _ in range(count):
-            pos = random_point_interior(self.width, self.height, margin)
-            self.foods.append(Food(position=pos))
+            pos = random_point_interior(self.width, self.height, margin, rng=self.rng)
+            self.foods.append(Food(position=pos, radius=self.params.food_radius))
         self.food_spawned = count
 
+    # Simulation.food_count_for_day(start_creature_count)
+    # 
+    # @param start_creature_count  number of creatures alive at day start
+    # @return number of food items to spawn today
+    # 
+    def food_count_for_day(self, start_creature_count: int) -> int:
+        # Determine food count based on sim settings
+        if getattr(self, 'food_scaling', True):
+            return start_creature_count
+        fixed = getattr(self, 'fixed_food_count', None)
+        return fixed if (isinstance(fixed, int) and fixed >= 0) else start_creature_count
+
     # Simulation.reproduce_survivors()
     # 
     # @return None
@@ -225,29 +340,46 @@ class BasicSimulation(Simulation):
     def reproduce_survivors(self) -> None:
         survivors = [c for c in self.creatures if c.is_survivor]
         new_creatures: List[Creature] = []
-        for _ in survivors:
-            for _child in range(2):
-                pos = point_on_random_edge(self.width, self.height, margin=CREATURE_RADIUS)
-                new_creatures.append(Creature(position=pos, direction=random_unit_vector()))
+        for survivor in survivors:
+            for _child in range(self.get_offspring_count(survivor.has_eaten)):
+                pos = point_on_random_edge(self.width, self.height, margin=self.params.creature_radius, rng=self.rng)
+                new_creatures.append(self.new_creature(pos))
         self.creatures = new_creatures
 
+    # Simulation.get_offspring_count(has_eaten)
+    # 
+    # @param has_eaten  number of foods a survivor ate during the day
+    # @return number of creatures the survivor contributes to the next day
+    # 
+    def get_offspring_count(self, has_eaten: int) -> int:
+        # every survivor is replaced by two fresh creatures
+        return 2
+
     def handle_creature_collision(self, creature, food_index: int) -> None:
         # Basic simulation: eating one food resets energy and increments eaten count
         creature.has_eaten += 1
         # Add energy gained from food, clamped to max energy
-        creature.energy = int(min(creature.energy + FOOD_ENERGY, CREATURE_MAX_ENERGY))
+        creature.energy = int(min(creature.energy + self.params.food_energy, self.get_creature_max_energy()))
 
     def get_simulation_name(self) -> str:
         return "BasicSimulation"
 
     def get_creature_max_energy(self) -> int:
-        return CREATURE_MAX_ENERGY
+        return self.params.creature_max_energy
 
     def get_creature_radius(self) -> int:
-        return CREATURE_RADIUS
+        return self.params.creature_radius
 
     def get_food_radius(self) -> int:
-        return FOOD_RADIUS
+        return self.params.food_radius
+
+    # BasicSimulation.fast_forward_creature(creature)
+    #
+    # @param creature  a fed creature that has not yet reached an edge
+    # @return None
+    #
+    def fast_forward_creature(self, creature: Creature) -> None:
+        creature.fast_forward(self.width, self.height, self.rng)
 
     def distance(self, a: Tuple[float, float], b: Tuple[float, float]) -> float:
         return distance(a, b)
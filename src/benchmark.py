@@ -0,0 +1,250 @@
+import json
+import multiprocessing
+import os
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from constants import WORLD_WIDTH, WORLD_HEIGHT
+from params import SimParams
+from basic_simulation import BasicSimulation
+from greedy_simulation import GreedySimulation
+from mutation_simulation import MutationSimulation
+from array_engine import ArrayEngine, MutationArrayEngine, BatchArrayEngine, BatchMutationArrayEngine
+
+# simulation classes measured by the suite, keyed by short name
+BENCH_SIMULATIONS = {'basic': BasicSimulation, 'greedy': GreedySimulation, 'mutation': MutationSimulation}
+# creatures (and food) per world of each scaling case
+BENCH_SIZES = (10, 100, 1000, 10000)
+# sizes at which the batched engine is measured, and its world count
+BENCH_BATCH_SIZES = (10, 100)
+BENCH_BATCH_WORLDS = 64
+# intelligence of every creature in the sensing-heavy mutation case
+BENCH_SENSING_INTELLIGENCE = 4.0
+BENCH_SEED = 1
+# seconds of simulation measured per case
+BENCH_BUDGET = 3.0
+# a case is a regression once its ticks per second drop by more than this fraction
+BENCH_REGRESSION_THRESHOLD = 0.15
+BENCH_FORMAT = 1
+
+
+# BenchCase
+#
+# One measured configuration. Every timed day is day one of a freshly built
+# world with the same seed, so each case repeats an identical workload at
+# its nominal population.
+class BenchCase(NamedTuple):
+    name: str
+    simulation: str
+    engine: str  # 'objects', 'arrays' or 'batch'
+    creatures: int
+    worlds: int = 1
+    intelligence: float = 1.0
+
+
+# bench_cases(sizes)
+#
+# @param sizes  creature and food counts to measure
+# @return every case of the suite at those sizes
+#
+def bench_cases(sizes: Sequence[int] = BENCH_SIZES) -> List[BenchCase]:
+    cases = []
+    for size in sizes:
+        for sim_name in BENCH_SIMULATIONS:
+            for engine in ('objects', 'arrays'):
+                cases.append(BenchCase(f'{sim_name}-{engine}-{size}', sim_name, engine, size))
+            if size in BENCH_BATCH_SIZES:
+                cases.append(BenchCase(f'{sim_name}-batch{BENCH_BATCH_WORLDS}-{size}', sim_name, 'batch', size, BENCH_BATCH_WORLDS))
+        for engine in ('objects', 'arrays'):
+            cases.append(BenchCase(f'mutation-sensing-{engine}-{size}', 'mutation', engine, size, intelligence=BENCH_SENSING_INTELLIGENCE))
+    return cases
+
+
+def _build_world(case: BenchCase, seed: int):
+    params = SimParams(start_creatures=case.creatures)
+    sim = BENCH_SIMULATIONS[case.simulation](WORLD_WIDTH, WORLD_HEIGHT, seed=seed, params=params)
+    sim.food_scaling = False
+    sim.fixed_food_count = case.creatures
+    if isinstance(sim, MutationSimulation):
+        sim.record_traits = False
+        for c in sim.creatures:
+            c.traits['intelligence'] = case.intelligence
+    return sim
+
+
+def _build_engine(case: BenchCase):
+    if case.engine == 'objects':
+        return _build_world(case, BENCH_SEED)
+    mutation = case.simulation == 'mutation'
+    if case.engine == 'batch':
+        sims = [_build_world(case, BENCH_SEED + k) for k in range(case.worlds)]
+        return (BatchMutationArrayEngine if mutation else BatchArrayEngine)(sims)
+    return (MutationArrayEngine if mutation else ArrayEngine)(_build_world(case, BENCH_SEED))
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 * 1024.0) if platform.system() == 'Darwin' else peak / 1024.0
+
+
+# run_case(case, budget)
+#
+# Times begin_day / step_tick / end_day, the headless equivalent of
+# simulate_day, until the budget runs out; a day still running then counts
+# its ticks but not as a day. Building the world is not timed. Runs in its
+# own process (see run_suite), so peak RSS belongs to this case alone.
+#
+# @param case  the configuration to measure
+# @param budget  seconds of timed simulation
+# @return the case's result row
+#
+def run_case(case: BenchCase, budget: float = BENCH_BUDGET) -> Dict:
+    ticks = days = creature_ticks = 0
+    elapsed = 0.0
+    while elapsed < budget:
+        engine = _build_engine(case)
+        if case.engine == 'objects':
+            # the headless object path resolves food-less days analytically, as run_day does
+            step = lambda sim=engine: sim.step_tick(sim.fast_forward)
+        else:
+            step = engine.step_tick
+        start = time.perf_counter()
+        population = engine.begin_day()
+        finished = population == 0
+        while not finished:
+            finished = step()
+            ticks += 1
+            # creatures that were still moving, not the day's starting population
+            creature_ticks += engine.ticked_creatures
+            if elapsed + time.perf_counter() - start >= budget:
+                break
+        if finished:
+            engine.end_day()
+            # a batched day is a day of every world
+            days += case.worlds
+        elapsed += time.perf_counter() - start
+        if population == 0:
+            break
+    return {
+        'name': case.name,
+        'simulation': case.simulation,
+        'engine': case.engine,
+        'creatures': case.creatures,
+        'food': case.creatures,
+        'worlds': case.worlds,
+        'intelligence': case.intelligence,
+        'seed': BENCH_SEED,
+        'seconds': elapsed,
+        'ticks': ticks,
+        'days': days,
+        'ticks_per_second': ticks / elapsed if elapsed > 0 else 0.0,
+        'days_per_second': days / elapsed if elapsed > 0 else 0.0,
+        'ns_per_creature_tick': elapsed * 1e9 / creature_ticks if creature_ticks else None,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+# run_suite(cases, budget, on_result)
+#
+# Runs every case in a fresh worker process, one at a time so cases never
+# compete for the CPU.
+#
+# @param cases  the cases to measure
+# @param budget  seconds of timed simulation per case
+# @param on_result  called with each result row as it arrives
+# @return the benchmark document: environment plus one row per case
+#
+def run_suite(cases: Sequence[BenchCase], budget: float = BENCH_BUDGET, on_result=None) -> Dict:
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            row = pool.submit(run_case, case, budget).result()
+        results.append(row)
+        if on_result is not None:
+            on_result(row)
+    return {
+        'format': BENCH_FORMAT,
+        'created': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'budget': budget,
+        'cases': results,
+    }
+
+
+def write_results(document: Dict, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+
+def read_results(path: str) -> Dict:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+# Regression
+#
+# A case whose throughput fell further below the baseline than allowed.
+class Regression(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else 0.0
+
+
+# compare_results(current, baseline, threshold)
+#
+# Matches cases by name; cases missing from either side are ignored.
+#
+# @param current  document from run_suite
+# @param baseline  an earlier document
+# @param threshold  allowed fractional drop in ticks per second
+# @return (ratio per shared case, regressions)
+#
+def compare_results(current: Dict, baseline: Dict, threshold: float = BENCH_REGRESSION_THRESHOLD):
+    before = {row['name']: row for row in baseline.get('cases', [])}
+    ratios: Dict[str, float] = {}
+    regressions: List[Regression] = []
+    for row in current.get('cases', []):
+        old = before.get(row['name'])
+        if old is None or not old.get('ticks_per_second'):
+            continue
+        ratio = row['ticks_per_second'] / old['ticks_per_second']
+        ratios[row['name']] = ratio
+        if ratio < 1.0 - threshold:
+            regressions.append(Regression(row['name'], old['ticks_per_second'], row['ticks_per_second']))
+    return ratios, regressions
+
+
+# format_row(row, ratio)
+#
+# @return one aligned line of the suite's console table
+#
+def format_row(row: Dict, ratio: Optional[float] = None) -> str:
+    per_creature = row['ns_per_creature_tick']
+    rss = row['peak_rss_mb']
+    line = (
+        f"{row['name']:<32} {row['ticks_per_second']:>11.1f} ticks/s {row['days_per_second']:>9.3f} days/s "
+        f"{(f'{per_creature:.0f}' if per_creature is not None else '-'):>9} ns/creature-tick "
+        f"{(f'{rss:.0f}' if rss is not None else '-'):>6} MB"
+    )
+    if ratio is not None:
+        line += f'  x{ratio:.2f} vs baseline'
+    return line
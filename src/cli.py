@@ -0,0 +1,395 @@
+import argparse
+import csv
+import os
+import sys
+from typing import List, Optional, Sequence, Tuple
+
+# batch runs print their own summary; keep pygame's import banner out of it
+# (main.py does the same before its own import of pygame)
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+# pygame is imported for the simulation classes but only initialised for windowed runs
+
+import pygame
+
+from constants import WORLD_WIDTH, WORLD_HEIGHT, DATA_SIM_RUNS, DATA_SIM_ENERGY_START, DATA_SIM_ENERGY_INCREMENT
+from constants import DATA_SIM_REPLICATES, DATA_SIM_MIN_REPLICATES, DATA_SIM_CI_WIDTH
+from array_engine import ArrayEngine, MutationArrayEngine
+from basic_simulation import BasicSimulation
+from greedy_simulation import GreedySimulation
+from mutation_simulation import MutationSimulation
+from params import SimParams
+from run_catalog import CATALOG_PATH_ENV
+from sweep import SWEEP_BATCH_WORLDS, run_sweep
+from trait_archive import TraitArchive, write_trait_means_csv
+from benchmark import BENCH_SIZES, BENCH_BUDGET, BENCH_REGRESSION_THRESHOLD, bench_cases, run_suite
+from benchmark import compare_results, format_row, read_results, write_results
+
+# simulation classes available from the command line, keyed by short name
+CLI_SIMULATIONS = {'basic': BasicSimulation, 'greedy': GreedySimulation, 'mutation': MutationSimulation}
+MUTATION_TRAITS = ('speed', 'size', 'intelligence')
+DAY_COLUMNS = ['day', 'start_creatures', 'food_spawned', 'survivors', 'died', 'end_creatures']
+
+
+# parse_food(text)
+#
+# @param text  'scale' (food follows the population) or 'fixed:N'
+# @return (food_scaling, fixed_food_count)
+#
+def parse_food(text: str) -> Tuple[bool, Optional[int]]:
+    if text == 'scale':
+        return True, None
+    kind, _, amount = text.partition(':')
+    if kind == 'fixed' and amount.isdigit():
+        return False, int(amount)
+    raise argparse.ArgumentTypeError(f"expected 'scale' or 'fixed:N', got {text!r}")
+
+
+# parse_traits(text)
+#
+# @param text  comma-separated trait names, or 'none'
+# @return the traits that may mutate
+#
+def parse_traits(text: str) -> List[str]:
+    if text == 'none':
+        return []
+    traits = [t.strip() for t in text.split(',') if t.strip()]
+    unknown = [t for t in traits if t not in MUTATION_TRAITS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown trait(s) {', '.join(unknown)}; choose from {', '.join(MUTATION_TRAITS)}")
+    return traits
+
+
+# parse_param(text)
+#
+# @param text  'NAME=VALUE' for one SimParams field
+# @return (name, value text)
+#
+def parse_param(text: str) -> Tuple[str, str]:
+    name, sep, value = text.partition('=')
+    name = name.strip().replace('-', '_')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    if name not in SimParams().as_dict():
+        raise argparse.ArgumentTypeError(f"unknown parameter {name!r}; choose from {', '.join(SimParams().as_dict())}")
+    try:
+        SimParams.from_overrides({name: value.strip()})
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+    return name, value.strip()
+
+
+# parse_sizes(text)
+#
+# @param text  comma-separated positive counts
+# @return the counts
+#
+def parse_sizes(text: str) -> List[int]:
+    try:
+        sizes = [int(t) for t in text.split(',') if t.strip()]
+    except ValueError:
+        sizes = []
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError(f'expected comma-separated positive counts, got {text!r}')
+    return sizes
+
+
+# build_parser()
+#
+# @return the argument parser for the run and sweep commands
+#
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description='Run simulations and benchmarks without the menus. With no arguments main.py opens the interactive menus.',
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run one simulation until extinction or --days')
+    run.add_argument('simulation', choices=sorted(CLI_SIMULATIONS))
+    run.add_argument('--days', type=int, default=1000, help='stop after this many days (default 1000)')
+    run.add_argument('--food', type=parse_food, default=(True, None), metavar='scale|fixed:N',
+                     help="daily food: 'scale' with the population (default) or a fixed amount")
+    run.add_argument('--mutate', type=parse_traits, default=list(MUTATION_TRAITS), metavar='TRAITS',
+                     help="mutation simulation: comma-separated traits that mutate, or 'none' (default: all)")
+    run.add_argument('--seed', type=int, default=None, help='seed for the run (default: fresh)')
+    run.add_argument('--param', type=parse_param, action='append', default=[], metavar='NAME=VALUE',
+                     help='override a simulation parameter, e.g. food_energy=300 (repeatable)')
+    run.add_argument('--headless', action='store_true', help='do not open a window or initialise pygame')
+    run.add_argument('--engine', choices=('objects', 'arrays'), default='objects',
+                     help='headless day engine: per-creature objects or the NumPy array engine')
+    run.add_argument('--out', default=None, help='directory for result files (default: ./log)')
+    run.add_argument('--profile', action='store_true', help='time each phase of the day loop into run_<id>_phases.csv')
+    run.add_argument('--trace', action='store_true', help='also write a Chrome trace of every tick and frame to run_<id>_trace.json')
+    run.add_argument('--verbose', action='store_true', help='print a summary of every day')
+
+    sweep = commands.add_parser('sweep', help='run an Incremental Food or Incremental Energy research sweep')
+    sweep.add_argument('simulation', choices=('basic', 'greedy'))
+    sweep.add_argument('parameter', choices=('food', 'energy'))
+    sweep.add_argument('--start', type=int, default=None,
+                       help=f'first food amount or max energy (default: 5 food, {DATA_SIM_ENERGY_START} energy)')
+    sweep.add_argument('--step', type=int, default=None,
+                       help=f'increment between points (default: 1 food, {DATA_SIM_ENERGY_INCREMENT} energy)')
+    sweep.add_argument('--points', type=int, default=DATA_SIM_RUNS, help=f'number of sweep points (default {DATA_SIM_RUNS})')
+    sweep.add_argument('--fixed-food', type=int, default=0, help='daily food for energy sweeps (default 0)')
+    sweep.add_argument('--replicates', type=int, default=DATA_SIM_REPLICATES)
+    sweep.add_argument('--min-replicates', type=int, default=DATA_SIM_MIN_REPLICATES)
+    sweep.add_argument('--ci-width', type=float, default=DATA_SIM_CI_WIDTH)
+    sweep.add_argument('--workers', type=int, default=None, help='worker processes (default: every core)')
+    sweep.add_argument('--batch-worlds', type=int, nargs='?', const=SWEEP_BATCH_WORLDS, default=None, metavar='N',
+                       help=f'step replicates together as worlds of the batched array engine, N per task (default N {SWEEP_BATCH_WORLDS})')
+    sweep.add_argument('--seed', type=int, default=None, help='root seed of the sweep (default: fresh)')
+    sweep.add_argument('--param', type=parse_param, action='append', default=[], metavar='NAME=VALUE',
+                       help='override a simulation parameter for every run (repeatable)')
+    sweep.add_argument('--out', default=None, help='directory for the average-population CSV (default: ./log)')
+    sweep.add_argument('--verbose', action='store_true', help='print a summary of every day')
+
+    bench = commands.add_parser('bench', help='measure simulation throughput and compare it with a baseline')
+    bench.add_argument('--sizes', type=parse_sizes, default=list(BENCH_SIZES), metavar='N,N,...',
+                       help=f"creature and food counts to measure (default {','.join(map(str, BENCH_SIZES))})")
+    bench.add_argument('--only', default=None, metavar='TEXT', help='run only the cases whose name contains TEXT')
+    bench.add_argument('--budget', type=float, default=BENCH_BUDGET, help=f'seconds measured per case (default {BENCH_BUDGET})')
+    bench.add_argument('--out', default=None, help='results JSON (default: ./log/benchmark.json)')
+    bench.add_argument('--baseline', default=None, help='results JSON to compare against; regressions exit with status 1')
+    bench.add_argument('--threshold', type=float, default=BENCH_REGRESSION_THRESHOLD,
+                       help=f'allowed drop in ticks per second before a case counts as a regression (default {BENCH_REGRESSION_THRESHOLD})')
+    bench.add_argument('--save-baseline', default=None, metavar='PATH', help='also write the results to PATH for later comparisons')
+    return parser
+
+
+# use_output_dir(out)
+#
+# Creates the output directory and, when one was given, points the run
+# catalog (including that of sweep worker processes) at <out>/runs.sqlite.
+#
+# @param out  --out value, or None for ./log
+# @return the absolute output directory
+#
+def use_output_dir(out: Optional[str]) -> str:
+    if out is None:
+        path = os.path.join(os.getcwd(), 'log')
+    else:
+        path = os.path.abspath(out)
+        os.environ[CATALOG_PATH_ENV] = os.path.join(path, 'runs.sqlite')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# build_simulation(args)
+#
+# @param args  parsed 'run' arguments
+# @return the configured simulation, as the menus would have built it
+#
+def build_simulation(args: argparse.Namespace):
+    params = SimParams.from_overrides(dict(args.param))
+    if args.simulation == 'mutation':
+        sim = MutationSimulation(
+            WORLD_WIDTH,
+            WORLD_HEIGHT,
+            mutation_speed_enabled='speed' in args.mutate,
+            mutation_size_enabled='size' in args.mutate,
+            mutation_intelligence_enabled='intelligence' in args.mutate,
+            seed=args.seed,
+            params=params,
+        )
+        sim.record_traits = True
+    else:
+        sim = CLI_SIMULATIONS[args.simulation](WORLD_WIDTH, WORLD_HEIGHT, seed=args.seed, params=params)
+    sim.food_scaling, sim.fixed_food_count = args.food
+    sim.verbose = bool(args.verbose)
+    if args.profile or args.trace:
+        sim.enable_profiling(trace=args.trace)
+    return sim
+
+
+# run_days(sim, args)
+#
+# Runs the simulation day by day, logging each day, until extinction, a
+# manual stop or args.days.
+#
+# @param sim  the simulation built by build_simulation
+# @param args  parsed 'run' arguments
+# @return day rows (day, start, food, survivors, died, end)
+#
+def run_days(sim, args: argparse.Namespace) -> List[Tuple[int, int, int, int, int, int]]:
+    engine = None
+    screen = clock = None
+    if args.headless:
+        if args.engine == 'arrays':
+            engine = (MutationArrayEngine if isinstance(sim, MutationSimulation) else ArrayEngine)(sim)
+    else:
+        pygame.init()
+        screen = pygame.display.set_mode((WORLD_WIDTH, WORLD_HEIGHT), pygame.SCALED | pygame.RESIZABLE)
+        clock = pygame.time.Clock()
+        sim.update_caption()
+
+    day_rows = []
+    for day in range(1, args.days + 1):
+        population = engine.creature_count if engine is not None else len(sim.creatures)
+        if population == 0:
+            break
+        sim.day = day
+        if engine is not None:
+            engine.day = day
+            result = engine.run_day()
+        elif screen is not None:
+            result = sim.simulate_day(screen, clock)
+        else:
+            result = sim.run_day()
+        start_creatures, food_spawned, survivors, died = result
+        sim.log_day(1, day, start_creatures, food_spawned, survivors, died)
+        day_rows.append((day, start_creatures, food_spawned, survivors, died, survivors))
+        if survivors == 0 or sim.manual_stop:
+            break
+        if engine is not None:
+            engine.reproduce_survivors()
+        else:
+            sim.reproduce_survivors()
+    sim.finish_log()
+    if screen is not None:
+        pygame.quit()
+    return day_rows
+
+
+# command_run(args)
+#
+# Runs one simulation and writes run_<id>_days.csv (plus run_<id>_traits.csv
+# and the trait archive for mutation runs, and run_<id>_phases.csv /
+# run_<id>_trace.json when profiling) to the output directory.
+#
+# @param args  parsed 'run' arguments
+# @return process exit status
+#
+def command_run(args: argparse.Namespace) -> int:
+    out = use_output_dir(args.out)
+    sim = build_simulation(args)
+    if isinstance(sim, MutationSimulation):
+        sim.trait_log_dir = out
+    day_rows = run_days(sim, args)
+    run_id = sim.ensure_run()
+
+    days_path = os.path.join(out, f'run_{run_id}_days.csv')
+    with open(days_path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(DAY_COLUMNS)
+        w.writerows(day_rows)
+    written = [days_path]
+    if isinstance(sim, MutationSimulation) and sim.record_traits:
+        traits_path = os.path.join(out, f'run_{run_id}_traits.csv')
+        write_trait_means_csv(TraitArchive(sim.trait_archive_path()), traits_path, args.mutate or list(MUTATION_TRAITS))
+        written.append(traits_path)
+    if sim.profiler is not None:
+        phases_path = os.path.join(out, f'run_{run_id}_phases.csv')
+        sim.profiler.write_csv(phases_path)
+        written.append(phases_path)
+        if sim.profiler.trace:
+            trace_path = os.path.join(out, f'run_{run_id}_trace.json')
+            sim.profiler.write_trace(trace_path)
+            written.append(trace_path)
+
+    final = day_rows[-1][5] if day_rows else 0
+    print(f'run {run_id} {sim.get_simulation_name()} seed={sim.seed} days={len(day_rows)} final_population={final}')
+    for path in written:
+        print(f'  wrote {path}')
+    return 0
+
+
+# command_sweep(args)
+#
+# Runs an Incremental Food / Incremental Energy sweep and appends its points
+# to <out>/<sim>_average_population_vs_<parameter>.csv.
+#
+# @param args  parsed 'sweep' arguments
+# @return process exit status
+#
+def command_sweep(args: argparse.Namespace) -> int:
+    out = use_output_dir(args.out)
+    if args.parameter == 'food':
+        start = 5 if args.start is None else args.start
+        step = 1 if args.step is None else args.step
+    else:
+        start = DATA_SIM_ENERGY_START if args.start is None else args.start
+        step = DATA_SIM_ENERGY_INCREMENT if args.step is None else args.step
+    values = [start + i * step for i in range(max(1, args.points))]
+    csv_path = os.path.join(out, f'{args.simulation}_average_population_vs_{args.parameter}.csv')
+
+    def report(point) -> None:
+        print(f'{args.parameter}={int(point.value)} mean={point.mean:.2f} ci95=[{point.ci_low:.2f}, {point.ci_high:.2f}] n={point.replicates}', flush=True)
+
+    run_sweep(
+        args.simulation,
+        args.parameter,
+        values,
+        args.fixed_food,
+        csv_path,
+        replicates=args.replicates,
+        min_replicates=args.min_replicates,
+        ci_width=args.ci_width,
+        workers=args.workers,
+        verbose=bool(args.verbose),
+        on_point=report,
+        seed=args.seed,
+        params=SimParams.from_overrides(dict(args.param)),
+        batch_worlds=args.batch_worlds,
+    )
+    print(f'wrote {csv_path}')
+    return 0
+
+
+# command_bench(args)
+#
+# Runs the benchmark suite, writes its JSON and, given --baseline, reports
+# each case's throughput against it.
+#
+# @param args  parsed 'bench' arguments
+# @return process exit status; 1 when a case regressed past --threshold
+#
+def command_bench(args: argparse.Namespace) -> int:
+    cases = [case for case in bench_cases(args.sizes) if args.only is None or args.only in case.name]
+    if not cases:
+        print('no benchmark cases match')
+        return 2
+    baseline = read_results(args.baseline) if args.baseline else None
+    before = {row['name']: row for row in baseline['cases']} if baseline else {}
+
+    def report(row) -> None:
+        old = before.get(row['name'])
+        ratio = row['ticks_per_second'] / old['ticks_per_second'] if old and old.get('ticks_per_second') else None
+        print(format_row(row, ratio), flush=True)
+
+    document = run_suite(cases, args.budget, on_result=report)
+    out = args.out or os.path.join(use_output_dir(None), 'benchmark.json')
+    write_results(document, out)
+    print(f'wrote {out}')
+    if args.save_baseline:
+        write_results(document, args.save_baseline)
+        print(f'wrote {args.save_baseline}')
+    if baseline is None:
+        return 0
+    _ratios, regressions = compare_results(document, baseline, args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression.name}: {regression.current:.1f} ticks/s, baseline {regression.baseline:.1f} (x{regression.ratio:.2f})')
+    return 1 if regressions else 0
+
+
+# main(argv)
+#
+# @param argv  command-line arguments without the program name
+# @return process exit status
+#
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == 'run':
+        if args.days < 1:
+            build_parser().error('--days must be at least 1')
+        if args.engine == 'arrays' and not args.headless:
+            build_parser().error('--engine arrays runs without a window; add --headless')
+        if (args.profile or args.trace) and args.engine == 'arrays':
+            build_parser().error('--profile and --trace time the object engine; drop --engine arrays')
+        return command_run(args)
+    if args.command == 'bench':
+        return command_bench(args)
+    return command_sweep(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,11 +13,14 @@ CREATURE_RADIUS = 12
 FOOD_RADIUS = 5
 
 TICKS_PER_SECOND = 60
+# frame rate while the simulation runs uncapped; each frame's remaining time goes to ticks
+UNCAPPED_FRAMES_PER_SECOND = 30
 
 # Simulation parameters
 CREATURE_MAX_ENERGY = 500  # ticks
 CREATURE_STEP_SIZE = 2.5   # pixels per tick
 FOOD_ENERGY = 250
+CREATURE_TURN_CHANCE = 0.05  # chance per tick that a wandering creature picks a new heading
 
 # Greedy simulation parameters
 GREEDY_CONSTANT = 1.1      # multiplier for food spawning in greedy simulation
@@ -30,6 +33,11 @@ SIM_GRAPH_Y_MARGIN = 1.05  # 5% headroom above max for easier viewing
 DATA_SIM_RUNS = 40
 DATA_SIM_ENERGY_START = 200
 DATA_SIM_ENERGY_INCREMENT = 5
+# Replicate runs per sweep point: at least MIN, at most REPLICATES, stopping early
+# once the 95% confidence interval of the average population is narrower than CI_WIDTH
+DATA_SIM_REPLICATES = 20
+DATA_SIM_MIN_REPLICATES = 3
+DATA_SIM_CI_WIDTH = 1.0
 
 # Starting number of creatures per simulation type (default to 5 for all sims)
 START_CREATURES = {'basic_simulation': 5, 'greedy_simulation': 5, 'mutation_simulation': 5}
@@ -0,0 +1,78 @@
+from typing import Sequence
+
+import numpy as np
+
+
+# lttb_indices(xs, ys, threshold)
+#
+# Largest-Triangle-Three-Buckets downsampling. The first and last points are
+# kept; every bucket in between keeps the point that forms the largest
+# triangle with the point kept before it and the mean of the next bucket, so
+# peaks and dips survive while flat stretches thin out.
+#
+# @param xs  x values, ascending
+# @param ys  y values, same length
+# @param threshold  number of points wanted
+# @return ascending indices of the points to keep (all of them if there are no more than threshold)
+#
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> np.ndarray:
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    n = x.shape[0]
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    # bucket edges over the points strictly between the first and the last
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    previous = 0
+    for b in range(threshold - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < threshold - 1:
+            next_lo, next_hi = edges[b + 1], edges[b + 2]
+            mean_x = x[next_lo:next_hi].mean()
+            mean_y = y[next_lo:next_hi].mean()
+        else:
+            mean_x, mean_y = x[-1], y[-1]
+        px, py = x[previous], y[previous]
+        area = np.abs((px - mean_x) * (y[lo:hi] - py) - (px - x[lo:hi]) * (mean_y - py))
+        previous = lo + int(np.argmax(area))
+        keep[b + 1] = previous
+    return keep
+
+
+# minmax_indices(xs, ys, columns)
+#
+# Splits the x range into equal-width columns (one per pixel) and keeps the
+# lowest and highest point of each, in x order. Every spike stays visible
+# and at most 2 * columns points remain.
+#
+# @param xs  x values, ascending
+# @param ys  y values, same length
+# @param columns  number of columns, normally the graph's pixel width
+# @return ascending indices of the points to keep
+#
+def minmax_indices(xs: Sequence[float], ys: Sequence[float], columns: int) -> np.ndarray:
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    n = x.shape[0]
+    if n <= 2 * columns or columns < 1:
+        return np.arange(n)
+    span = x[-1] - x[0]
+    if span <= 0:
+        column = np.zeros(n, dtype=np.int64)
+    else:
+        column = np.minimum(((x - x[0]) / span * columns).astype(np.int64), columns - 1)
+    # columns are contiguous runs because x is ascending
+    starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+    lows = np.empty(starts.shape[0], dtype=np.int64)
+    highs = np.empty(starts.shape[0], dtype=np.int64)
+    ends = np.r_[starts[1:], n]
+    order_low = np.minimum.reduceat(y, starts)
+    order_high = np.maximum.reduceat(y, starts)
+    for i, (lo, hi) in enumerate(zip(starts, ends)):
+        segment = y[lo:hi]
+        lows[i] = lo + int(np.argmax(segment == order_low[i]))
+        highs[i] = lo + int(np.argmax(segment == order_high[i]))
+    return np.unique(np.concatenate((lows, highs)))
@@ -0,0 +1,128 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pygame
+
+# rendered graphs kept at once; the viewer cycles through a handful of files
+GRAPH_CACHE_SIZE = 16
+# marks a parsed-data lookup miss; None is a valid result for a missing file
+_MISSING = object()
+
+
+# graph_font(size)
+#
+# @param size  font size as passed to pygame.font.SysFont
+# @return the default system font at that size, created once
+#
+@lru_cache(maxsize=None)
+def graph_font(size: int) -> pygame.font.Font:
+    return pygame.font.SysFont(None, size)
+
+
+# file_key(path)
+#
+# @param path  file to identify
+# @return (path, mtime, size), with None for both when the file is missing
+#
+def file_key(path: str) -> Tuple[str, Optional[float], Optional[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path, None, None
+    return path, stat.st_mtime, stat.st_size
+
+
+# GraphCache
+#
+# Holds parsed CSV columns keyed by (path, mtime, size) and fully rendered
+# graph surfaces keyed by the same plus the window size, so a graph that is
+# shown every frame is read and drawn once until its file changes. Rendered
+# surfaces are transparent where the graph draws nothing, so blitting one
+# gives the same picture as drawing straight onto the screen.
+#
+# prefetch() prepares a graph on a background thread. SDL's font and
+# drawing calls are not safe to run concurrently, so every render holds
+# render_lock; the main thread takes it too when it draws text itself.
+class GraphCache:
+    def __init__(self, max_entries: int = GRAPH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.render_lock = threading.RLock()
+        self._parsed: Dict[Tuple, Any] = {}
+        self._surfaces: Dict[Tuple, pygame.Surface] = {}
+        self._pending: Dict[Tuple, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # GraphCache.surface(path, size, parse, draw)
+    #
+    # @param path  CSV file behind the graph
+    # @param size  (width, height) of the surface to render
+    # @param parse  parse(path) -> data, or None if the file is missing
+    # @param draw  draw(surface, data, path) renders the graph
+    # @return the rendered graph surface
+    #
+    def surface(self, path: str, size: Tuple[int, int], parse: Callable, draw: Callable) -> pygame.Surface:
+        key = file_key(path) + (tuple(size), draw)
+        cached = self._surfaces.get(key)
+        if cached is not None:
+            return cached
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending.result()
+            cached = self._surfaces.get(key)
+            if cached is not None:
+                return cached
+        return self._render(key, path, size, parse, draw)
+
+    # GraphCache.prefetch(path, size, parse, draw)
+    #
+    # Queues the graph for rendering on the background thread unless it is
+    # already cached or queued.
+    #
+    # @return None
+    #
+    def prefetch(self, path: str, size: Tuple[int, int], parse: Callable, draw: Callable) -> None:
+        key = file_key(path) + (tuple(size), draw)
+        if key in self._surfaces or key in self._pending:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='graph-cache')
+        future = self._executor.submit(self._render, key, path, size, parse, draw)
+        self._pending[key] = future
+        future.add_done_callback(lambda _f, k=key: self._pending.pop(k, None))
+
+    # GraphCache.parsed(path, parse)
+    #
+    # @return parse(path), re-read only when the file's mtime or size changed
+    #
+    def parsed(self, path: str, parse: Callable) -> Any:
+        key = file_key(path) + (parse,)
+        data = self._parsed.get(key, _MISSING)
+        if data is not _MISSING:
+            return data
+        data = parse(path)
+        self._store(self._parsed, key, data)
+        return data
+
+    def _render(self, key: Tuple, path: str, size: Tuple[int, int], parse: Callable, draw: Callable) -> pygame.Surface:
+        data = self.parsed(path, parse)
+        with self.render_lock:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            draw(surface, data, path)
+        self._store(self._surfaces, key, surface)
+        return surface
+
+    def _store(self, table: Dict, key: Tuple, value: Any) -> None:
+        with self.render_lock:
+            # drop entries for stale versions of the same file before evicting by age
+            for old in [k for k in table if k[0] == key[0] and k[1:3] != key[1:3]]:
+                table.pop(old, None)
+            while len(table) >= self.max_entries:
+                table.pop(next(iter(table)))
+            table[key] = value
+
+
+# shared cache for the graph viewer and results screens
+GRAPH_CACHE = GraphCache()
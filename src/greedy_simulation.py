@@ -1,17 +1,8 @@
 import math
-import random
-from typing import List, Tuple
-
-from constants import (
-    CREATURE_RADIUS,
-    FOOD_RADIUS,
-    CREATURE_MAX_ENERGY,
-    FOOD_ENERGY,
-    GREEDY_CONSTANT,
-    GREEDY_UNCERTAINTY,
-    START_CREATURES,
-)
+from typing import List, Optional, Tuple
+
 from simulation import Simulation
+from params import SimParams
 from basic_simulation import (
     Creature,
     Food,
@@ -23,19 +14,37 @@ from basic_simulation import (
 
 
 class GreedySimulation(Simulation):
-    # GreedySimulation.__init__(width, height)
+    # food-less movement is a plain random walk, see fast_forward_creature()
+    supports_fast_forward = True
+
+    # GreedySimulation.__init__(width, height, seed, params)
     # 
     # @param width  the world width in pixels
     # @param height  the world height in pixels
+    # @param seed  seed for this simulation's random stream; None picks a fresh one
+    # @param params  behaviour parameters of this world; None uses the constants.py defaults
     # @return None
     # 
-    def __init__(self, width: int, height: int):
-        super().__init__(width, height)
+    def __init__(self, width: int, height: int, seed: Optional[int] = None, params: Optional[SimParams] = None):
+        super().__init__(width, height, seed=seed, params=params)
         # Start with creatures randomly along the edge
-        num_creatures = START_CREATURES['greedy_simulation']
+        num_creatures = self.params.creature_count('greedy_simulation')
         for _ in range(num_creatures):
-            start_pos = point_on_random_edge(self.width, self.height, margin=CREATURE_RADIUS)
-            self.creatures.append(Creature(position=start_pos, direction=random_unit_vector()))
+            start_pos = point_on_random_edge(self.width, self.height, margin=self.params.creature_radius, rng=self.rng)
+            self.creatures.append(self.new_creature(start_pos))
+
+    # GreedySimulation.new_creature(position)
+    #
+    # @param position  where the creature starts
+    # @return a full-energy creature with a random heading, carrying this world's params
+    #
+    def new_creature(self, position: Tuple[float, float]) -> Creature:
+        return Creature(
+            position=position,
+            direction=random_unit_vector(self.rng),
+            energy=self.params.creature_max_energy,
+            params=self.params,
+        )
 
     # Simulation.spawn_food_for_day(start_creature_count)
     # 
@@ -43,25 +52,31 @@ class GreedySimulation(Simulation):
     # @return None
     # 
     def spawn_food_for_day(self, start_creature_count: int) -> None:
+        count = self.food_count_for_day(start_creature_count)
+        self.foods = []
+        margin = max(self.params.food_radius + 2, self.params.creature_radius + 2)
+        for _ in range(count):
+            pos = random_point_interior(self.width, self.height, margin, rng=self.rng)
+            self.foods.append(Food(position=pos, radius=self.params.food_radius))
+        self.food_spawned = count
+
+    # Simulation.food_count_for_day(start_creature_count)
+    # 
+    # @param start_creature_count  number of creatures alive at day start
+    # @return number of food items to spawn today
+    # 
+    def food_count_for_day(self, start_creature_count: int) -> int:
         # Check if the sim wants fixed food or scaling
         if getattr(self, 'food_scaling', True):
-            base_count = math.ceil(GREEDY_CONSTANT * start_creature_count)
-            # Add randomness using GREEDY_UNCERTAINTY: ±3 food items
+            base_count = math.ceil(self.params.greedy_constant * start_creature_count)
+            # Add randomness using greedy_uncertainty: ±3 food items
             uncertainty_range = 3
-            random_offset = random.randint(-uncertainty_range, uncertainty_range)
+            random_offset = self.rng.randint(-uncertainty_range, uncertainty_range)
             # Apply uncertainty factor to the random offset
-            adjusted_offset = int(random_offset * GREEDY_UNCERTAINTY)
-            count = max(0, base_count + adjusted_offset)  # Ensure non-negative
-        else:
-            fixed = getattr(self, 'fixed_food_count', None)
-            count = fixed if (isinstance(fixed, int) and fixed >= 0) else 0
-
-        self.foods = []
-        margin = max(FOOD_RADIUS + 2, CREATURE_RADIUS + 2)
-        for _ in range(count):
-            pos = random_point_interior(self.width, self.height, margin)
-            self.foods.append(Food(position=pos))
-        self.food_spawned = count
+            adjusted_offset = int(random_offset * self.params.greedy_uncertainty)
+            return max(0, base_count + adjusted_offset)  # Ensure non-negative
+        fixed = getattr(self, 'fixed_food_count', None)
+        return fixed if (isinstance(fixed, int) and fixed >= 0) else 0
 
     # Simulation.reproduce_survivors()
     # 
@@ -74,16 +89,25 @@ class GreedySimulation(Simulation):
         
         for survivor in survivors:
             # Each survivor gets recreated on the edge for the next day
-            pos = point_on_random_edge(self.width, self.height, margin=CREATURE_RADIUS)
-            new_creatures.append(Creature(position=pos, direction=random_unit_vector()))
+            pos = point_on_random_edge(self.width, self.height, margin=self.params.creature_radius, rng=self.rng)
+            new_creatures.append(self.new_creature(pos))
             
             # If they ate 2+ foods, they also create a duplicate
-            if survivor.has_eaten >= 2:
-                pos = point_on_random_edge(self.width, self.height, margin=CREATURE_RADIUS)
-                new_creatures.append(Creature(position=pos, direction=random_unit_vector()))
+            if self.get_offspring_count(survivor.has_eaten) > 1:
+                pos = point_on_random_edge(self.width, self.height, margin=self.params.creature_radius, rng=self.rng)
+                new_creatures.append(self.new_creature(pos))
         
         self.creatures = new_creatures
 
+    # Simulation.get_offspring_count(has_eaten)
+    # 
+    # @param has_eaten  number of foods a survivor ate during the day
+    # @return number of creatures the survivor contributes to the next day
+    # 
+    def get_offspring_count(self, has_eaten: int) -> int:
+        # survivors carry over; eating 2+ foods also earns a duplicate
+        return 2 if has_eaten >= 2 else 1
+
     # Simulation.handle_creature_collision(creature, food_index)
     # 
     # @param creature  the creature that collided
@@ -94,19 +118,22 @@ class GreedySimulation(Simulation):
         # Greedy simulation: track how many foods eaten using has_eaten counter
         creature.has_eaten += 1
         # Add food energy, clamped to max
-        creature.energy = int(min(creature.energy + FOOD_ENERGY, CREATURE_MAX_ENERGY))
+        creature.energy = int(min(creature.energy + self.params.food_energy, self.get_creature_max_energy()))
 
     def get_simulation_name(self) -> str:
         return "GreedySimulation"
 
     def get_creature_max_energy(self) -> int:
-        return CREATURE_MAX_ENERGY
+        return self.params.creature_max_energy
 
     def get_creature_radius(self) -> int:
-        return CREATURE_RADIUS
+        return self.params.creature_radius
 
     def get_food_radius(self) -> int:
-        return FOOD_RADIUS
+        return self.params.food_radius
+
+    def fast_forward_creature(self, creature: Creature) -> None:
+        creature.fast_forward(self.width, self.height, self.rng)
 
     def distance(self, a: Tuple[float, float], b: Tuple[float, float]) -> float:
         return distance(a, b)
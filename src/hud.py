@@ -0,0 +1,139 @@
+from typing import Optional, Sequence, Tuple
+
+import pygame
+
+from graph_cache import graph_font
+
+# key that shows and hides the performance overlay
+HUD_KEY = pygame.K_h
+HUD_FONT_SIZE = 20
+HUD_TEXT_COLOR = (220, 220, 230)
+HUD_PANEL_COLOR = (32, 32, 40)
+HUD_BORDER_COLOR = (90, 90, 100)
+# offset of the panel from the world's top-left corner, and padding inside it
+HUD_MARGIN = 8
+HUD_PADDING = 6
+
+
+# PerfHud
+#
+# Performance overlay for the interactive renderer. Numbers are sampled once
+# per throughput window (see Simulation._update_throughput), so the text
+# changes at most a couple of times a second: each line is rendered once per
+# distinct text and the panel is composed only when a line changed. Every
+# other frame costs one blit.
+#
+# The panel is opaque. SpriteLayer clears sprite rectangles to the background
+# colour, which would cut holes into a translucent panel drawn over them, so
+# the panel is simply blitted over the world each frame and its rectangle
+# added to the frame's dirty list. It only grows while shown, so a shorter
+# line never leaves the edge of a wider old panel behind.
+class PerfHud:
+    # PerfHud.__init__(visible)
+    #
+    # @param visible  whether the overlay starts shown
+    # @return None
+    #
+    def __init__(self, visible: bool = False):
+        self.visible = visible
+        # ns spent simulating and rendering since the last sample, and frames counted
+        self.sim_ns = 0
+        self.render_ns = 0
+        self.frames = 0
+        self._lines: Tuple[str, ...] = ()
+        self._line_surfaces: dict = {}
+        self._panel: Optional[pygame.Surface] = None
+        self._panel_size = (0, 0)
+
+    # PerfHud.toggle()
+    #
+    # @return whether the overlay is now shown
+    #
+    def toggle(self) -> bool:
+        self.visible = not self.visible
+        # numbers from an earlier showing are stale; wait for the next sample
+        self._lines = ()
+        self._panel_size = (0, 0)
+        self._panel = None
+        self.sim_ns = self.render_ns = self.frames = 0
+        return self.visible
+
+    # PerfHud.sample(elapsed, ticks_per_second, speed, live, active, food)
+    #
+    # Turns the frame times gathered since the last sample into the panel's
+    # lines and starts a new window.
+    #
+    # @param elapsed  seconds since the last sample
+    # @param ticks_per_second  achieved simulation ticks per second
+    # @param speed  speed setting as shown to the user, e.g. 'x16' or 'uncapped'
+    # @param live  creatures alive
+    # @param active  creatures still moving today
+    # @param food  food left in the world
+    # @return None
+    #
+    def sample(self, elapsed: float, ticks_per_second: float, speed: str, live: int, active: int, food: int) -> None:
+        frames = self.frames
+        frame_ms = elapsed * 1000.0 / frames if frames else 0.0
+        wall_ns = elapsed * 1e9
+        sim_share = 100.0 * self.sim_ns / wall_ns if wall_ns > 0 else 0.0
+        render_share = 100.0 * self.render_ns / wall_ns if wall_ns > 0 else 0.0
+        self.set_lines((
+            f'{ticks_per_second:,.0f} ticks/s  ({speed})',
+            f'frame {frame_ms:.1f} ms  ({frames / elapsed if elapsed > 0 else 0.0:.0f} fps)',
+            f'sim {sim_share:.1f}%  render {render_share:.1f}%  idle {max(0.0, 100.0 - sim_share - render_share):.1f}%',
+            f'creatures {live} live, {active} active',
+            f'food {food}',
+        ))
+        self.sim_ns = self.render_ns = self.frames = 0
+
+    # PerfHud.set_lines(lines)
+    #
+    # @param lines  the panel's text, one entry per line
+    # @return None
+    #
+    def set_lines(self, lines: Sequence[str]) -> None:
+        lines = tuple(lines)
+        if lines == self._lines:
+            return
+        self._lines = lines
+        self._panel = None
+
+    def _line_surface(self, text: str) -> pygame.Surface:
+        surface = self._line_surfaces.get(text)
+        if surface is None:
+            # only the current panel's lines are kept
+            if len(self._line_surfaces) > 4 * max(1, len(self._lines)):
+                self._line_surfaces.clear()
+            surface = graph_font(HUD_FONT_SIZE).render(text, True, HUD_TEXT_COLOR)
+            self._line_surfaces[text] = surface
+        return surface
+
+    def _compose(self) -> pygame.Surface:
+        rendered = [self._line_surface(text) for text in self._lines]
+        width = max((s.get_width() for s in rendered), default=0) + 2 * HUD_PADDING
+        height = sum(s.get_height() for s in rendered) + 2 * HUD_PADDING
+        width, height = max(width, self._panel_size[0]), max(height, self._panel_size[1])
+        self._panel_size = (width, height)
+        panel = pygame.Surface((width, height))
+        panel.fill(HUD_PANEL_COLOR)
+        pygame.draw.rect(panel, HUD_BORDER_COLOR, panel.get_rect(), width=1)
+        y = HUD_PADDING
+        for surface in rendered:
+            panel.blit(surface, (HUD_PADDING, y))
+            y += surface.get_height()
+        if pygame.display.get_surface() is not None:
+            panel = panel.convert()
+        return panel
+
+    # PerfHud.draw(screen)
+    #
+    # @param screen  the surface the world was drawn on
+    # @return the rectangle the panel covers, or None when there is nothing to draw
+    #
+    def draw(self, screen: pygame.Surface) -> Optional[pygame.Rect]:
+        if not self._lines:
+            return None
+        if self._panel is None:
+            self._panel = self._compose()
+        return screen.blit(self._panel, (HUD_MARGIN, HUD_MARGIN))
+
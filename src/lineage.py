@@ -0,0 +1,169 @@
+import heapq
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# parent id of a founder creature
+NO_PARENT = -1
+
+
+# LineageTracker
+#
+# Append-only parentage record for one run. Creature ids are handed out in
+# birth order, so id i is row i of three array('q') buffers: parent id,
+# founder id and birth day. A parent is always born before its children,
+# which lets ancestry walks move strictly downward through the ids. Nothing
+# here holds a Python object per creature, so millions of births cost
+# 24 bytes each.
+class LineageTracker:
+    def __init__(self):
+        self.parent = array('q')
+        self.founder = array('q')
+        self.birth_day = array('q')
+        # per recorded day: founder id -> living creatures of that lineage
+        self.day_sizes: List[Dict[int, int]] = []
+
+    @property
+    def births(self) -> int:
+        return len(self.parent)
+
+    # LineageTracker.day
+    #
+    # @return number of days recorded so far; children born now belong to day + 1
+    #
+    @property
+    def day(self) -> int:
+        return len(self.day_sizes)
+
+    # LineageTracker.add_founders(count, day)
+    #
+    # @param count  number of founders to register
+    # @param day  day they appear on
+    # @return the new ids, in order
+    #
+    def add_founders(self, count: int, day: int = 0) -> range:
+        first = len(self.parent)
+        ids = range(first, first + count)
+        self.parent.extend([NO_PARENT] * count)
+        self.founder.extend(ids)
+        self.birth_day.extend([day] * count)
+        return ids
+
+    # LineageTracker.add_birth(parent_id, day)
+    #
+    # @param parent_id  id of the parent creature
+    # @param day  day the child is born for, defaults to the next unrecorded day
+    # @return the child's id
+    #
+    def add_birth(self, parent_id: int, day: Optional[int] = None) -> int:
+        day = self.day + 1 if day is None else day
+        child = len(self.parent)
+        self.parent.append(parent_id)
+        self.founder.append(self.founder[parent_id])
+        self.birth_day.append(day)
+        return child
+
+    # LineageTracker.add_births(parent_ids, day)
+    #
+    # @param parent_ids  parent id of each child
+    # @param day  day the children are born for, defaults to the next unrecorded day
+    # @return the children's ids, in the same order
+    #
+    def add_births(self, parent_ids: np.ndarray, day: Optional[int] = None) -> np.ndarray:
+        day = self.day + 1 if day is None else day
+        parent_ids = np.asarray(parent_ids, dtype=np.int64)
+        first = len(self.parent)
+        children = np.arange(first, first + parent_ids.shape[0], dtype=np.int64)
+        if parent_ids.size:
+            self.parent.frombytes(parent_ids.tobytes())
+            self.founder.frombytes(self.founders_of(parent_ids).tobytes())
+            self.birth_day.frombytes(np.full(parent_ids.shape[0], day, dtype=np.int64).tobytes())
+        return children
+
+    # LineageTracker.founders_of(ids)
+    #
+    # @param ids  creature ids
+    # @return the founder id of each creature
+    #
+    def founders_of(self, ids: np.ndarray) -> np.ndarray:
+        founders = np.frombuffer(self.founder, dtype=np.int64) if self.founder else np.empty(0, dtype=np.int64)
+        return founders[np.asarray(ids, dtype=np.int64)]
+
+    # LineageTracker.record_day(ids)
+    #
+    # @param ids  ids of every creature alive at the start of the day
+    # @return None
+    #
+    def record_day(self, ids: Iterable[int]) -> None:
+        ids = np.fromiter(ids, dtype=np.int64) if not isinstance(ids, np.ndarray) else ids
+        founders, counts = np.unique(self.founders_of(ids), return_counts=True)
+        self.day_sizes.append({int(f): int(n) for f, n in zip(founders, counts)})
+
+    # LineageTracker.lineage_sizes()
+    #
+    # @return [(day, {founder id: living creatures})] for every recorded day
+    #
+    def lineage_sizes(self) -> List[Tuple[int, Dict[int, int]]]:
+        return [(day, sizes) for day, sizes in enumerate(self.day_sizes, start=1)]
+
+    # LineageTracker.ancestors(creature_id)
+    #
+    # @param creature_id  id to start from
+    # @return the creature's parent, grandparent, ... up to its founder
+    #
+    def ancestors(self, creature_id: int) -> List[int]:
+        chain = []
+        current = self.parent[creature_id]
+        while current != NO_PARENT:
+            chain.append(current)
+            current = self.parent[current]
+        return chain
+
+    # LineageTracker.common_ancestor(ids)
+    #
+    # Repeatedly replaces the youngest id in the set by its parent until a
+    # single id is left. Ids only move toward lower numbers, so this visits
+    # each ancestor at most once.
+    #
+    # @param ids  creature ids, e.g. the survivors of a day
+    # @return id of the most recent common ancestor (a creature is its own
+    #         ancestor), or None when the ids descend from different founders
+    #
+    def common_ancestor(self, ids: Iterable[int]) -> Optional[int]:
+        pending = {int(i) for i in ids}
+        if not pending:
+            return None
+        founders = {self.founder[i] for i in pending}
+        if len(founders) > 1:
+            return None
+        heap = [-i for i in pending]
+        heapq.heapify(heap)
+        while len(pending) > 1:
+            youngest = -heapq.heappop(heap)
+            pending.discard(youngest)
+            parent = self.parent[youngest]
+            if parent not in pending:
+                pending.add(parent)
+                heapq.heappush(heap, -parent)
+        return next(iter(pending))
+
+    # LineageTracker.fixation_day()
+    #
+    # @return first recorded day on which every living creature descends
+    #         from one founder, or None if that never happened
+    #
+    def fixation_day(self) -> Optional[int]:
+        for day, sizes in self.lineage_sizes():
+            if len(sizes) == 1:
+                return day
+        return None
+
+    # LineageTracker.time_to_fixation()
+    #
+    # @return days from the first recorded day until one founder lineage
+    #         fixed, or None if none did
+    #
+    def time_to_fixation(self) -> Optional[int]:
+        day = self.fixation_day()
+        return None if day is None else day - 1
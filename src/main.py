@@ -1,5 +1,9 @@
 import sys
 import os
+# scripted runs (see cli.py) print their own summary; keep pygame's import
+# banner out of it. This has to happen before pygame is first imported.
+if len(sys.argv) > 1:
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
 import csv
 import pygame
 
@@ -7,6 +11,11 @@ from constants import WORLD_WIDTH, WORLD_HEIGHT, BACKGROUND_COLOR, EDGE_COLOR, S
 from basic_simulation import BasicSimulation
 from greedy_simulation import GreedySimulation
 from mutation_simulation import MutationSimulation
+from sweep import run_sweep
+from trait_archive import TraitArchive, write_trait_means_csv
+from graph_cache import GRAPH_CACHE, graph_font
+from downsample import lttb_indices, minmax_indices
+from timeseries import centered_mean, chunk_means, prefix_sums, range_mean
 
 
 # run_simulation()
@@ -20,11 +29,15 @@ def run_simulation() -> None:
     clock = pygame.time.Clock()
 
     def wait_for_results_dismiss(draw_results) -> None:
+        # the results do not change while waiting: draw them once per window size
+        drawn_size = None
         while True:
-            draw_results()
-            font = pygame.font.SysFont(None, 18)
-            info = font.render("Press \\ to continue", True, (200, 200, 210))
-            screen.blit(info, (10, screen.get_height() - 24))
+            if screen.get_size() != drawn_size:
+                drawn_size = screen.get_size()
+                draw_results()
+                font = graph_font(18)
+                info = font.render("Press \\ to continue", True, (200, 200, 210))
+                screen.blit(info, (10, screen.get_height() - 24))
             pygame.display.flip()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -120,20 +133,30 @@ def run_simulation() -> None:
             ('Greedy avg population vs energy', os.path.join(os.getcwd(), 'log', 'greedy_average_population_vs_energy.csv')),
             ('Mutation traits vs day', os.path.join(os.getcwd(), 'log', 'mutation_simulation_traits.csv')),
         ]
+        def graph_renderers(path: str):
+            base_name = os.path.basename(path).lower()
+            # If this is a mutation traits CSV, parse and render multiple graphs
+            if 'mutation' in base_name and 'traits' in base_name:
+                return parse_mutation_traits_csv, draw_mutation_traits_graphs
+            return parse_csv_graph, draw_csv_graph
+
         idx = 0
+        prefetched_idx = None
         while True:
             screen.fill(BACKGROUND_COLOR)
             # draw selected CSV graph
             title, path = files[idx]
-            base_name = os.path.basename(path).lower()
-            # If this is a mutation traits CSV, parse and render multiple graphs
-            if 'mutation' in base_name and 'traits' in base_name:
-                render_mutation_traits_graphs(screen, path)
-            else:
-                render_csv_graph(screen, path)
+            screen.blit(GRAPH_CACHE.surface(path, screen.get_size(), *graph_renderers(path)), (0, 0))
+            if prefetched_idx != idx:
+                # prepare the Left/Right neighbours in the background so switching is instant
+                prefetched_idx = idx
+                for neighbour in ((idx + 1) % len(files), (idx - 1) % len(files)):
+                    neighbour_path = files[neighbour][1]
+                    GRAPH_CACHE.prefetch(neighbour_path, screen.get_size(), *graph_renderers(neighbour_path))
             # draw footer text
-            font = pygame.font.SysFont(None, 18)
-            info = font.render(f'{title} | Left/Right to switch | Esc to return', True, (200, 200, 210))
+            with GRAPH_CACHE.render_lock:
+                font = graph_font(18)
+                info = font.render(f'{title} | Left/Right to switch | Esc to return', True, (200, 200, 210))
             screen.blit(info, (10, screen.get_height() - 24))
             pygame.display.flip()
             for event in pygame.event.get():
@@ -408,173 +431,63 @@ def run_simulation() -> None:
     pygame.display.set_caption(f'Ecosystem Simulator – {selected}')
     simulation_id = 1
     current_speed_steps = 1
+    current_uncapped = False
+    current_render_interval = 1
+    # sweeps already run in this session; each next one continues where the last stopped
+    sweep_block = 0
     while True:
-        # for incremental-food sims we will run a sequence of simulations (50 runs)
-        if selected in ('Incremental Food (Basic)', 'Incremental Food (Greedy)'):
-            # starting food is fixed_food_amount
-            start_food = fixed_food_amount if isinstance(fixed_food_amount, int) else 5
+        # incremental research sims: run a sweep of DATA_SIM_RUNS points headless across
+        # every core, show the average-population graph, then carry on with the next
+        # DATA_SIM_RUNS values until the window is closed
+        if selected in ('Incremental Food (Basic)', 'Incremental Food (Greedy)', 'Incremental Energy (Basic)', 'Incremental Energy (Greedy)'):
             runs = DATA_SIM_RUNS
-            # determine CSV path base name
-            if selected == 'Incremental Food (Basic)':
-                avg_csv_name = 'basic_average_population_vs_food.csv'
-                sim_factory = BasicSimulation
+            sim_type = 'basic' if selected.endswith('(Basic)') else 'greedy'
+            if selected.startswith('Incremental Food'):
+                parameter = 'food'
+                # starting food is fixed_food_amount
+                start_food = fixed_food_amount if isinstance(fixed_food_amount, int) else 5
+                values = [start_food + sweep_block * runs + i for i in range(runs)]
             else:
-                avg_csv_name = 'greedy_average_population_vs_food.csv'
-                sim_factory = GreedySimulation
-            # ensure log dir exists
-            log_dir = os.path.join(os.getcwd(), 'log')
-            os.makedirs(log_dir, exist_ok=True)
-            avg_csv_path = os.path.join(log_dir, avg_csv_name)
-            # write header if missing
-            if not os.path.exists(avg_csv_path):
-                with open(avg_csv_path, 'w', newline='') as f:
-                    w = csv.writer(f)
-                    w.writerow(['food', 'average_population'])
-
-            current_food = start_food
-            run_idx = 1
-            # infinite sequence of runs; each run lasts exactly 50 days. User may terminate the program when done.
-            while True:
-                sim = sim_factory(WORLD_WIDTH, WORLD_HEIGHT)
-                # force non-scaling and fixed food
-                setattr(sim, 'food_scaling', False)
-                setattr(sim, 'fixed_food_count', int(current_food))
-                setattr(sim, 'verbose', bool(verbose_choice))
-                sim.speed_steps = max(1, current_speed_steps)
-                pygame.display.set_caption(f'Ecosystem Simulator – {selected} (run {run_idx}/{runs} food={current_food})')
-
-                # each run lasts exactly 50 days. We still allow early extinction but continue counting days.
-                day_rows = []
-                for day in range(1, 50 + 1):
-                    sim.day = day
-
-                    start_creatures, food_spawned, survivors, died = sim.simulate_day(screen, clock)
-                    current_speed_steps = sim.speed_steps
-                    sim.log_day(simulation_id, day, start_creatures, food_spawned, survivors, died)
-                    end_creatures = survivors
-                    day_rows.append((day, start_creatures, food_spawned, survivors, died, end_creatures))
-
-                    # reproduce survivors to set up next day
-                    sim.reproduce_survivors()
-
-                    # allow user to manually stop an individual day/run via sim.manual_stop (handled by simulate_day)
-                    if getattr(sim, 'manual_stop', False):
-                        break
+                parameter = 'energy'
+                values = [DATA_SIM_ENERGY_START + (sweep_block * runs + i) * DATA_SIM_ENERGY_INCREMENT for i in range(runs)]
+            sweep_fixed_food = int(fixed_food_amount) if isinstance(fixed_food_amount, int) else 0
+            avg_csv_path = os.path.join(os.getcwd(), 'log', f'{sim_type}_average_population_vs_{parameter}.csv')
+
+            def draw_sweep_progress(finished: int, total: int) -> None:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit(0)
+                pygame.display.set_caption(f'Ecosystem Simulator – {selected} ({finished}/{total} points)')
+                screen.fill(BACKGROUND_COLOR)
+                width, height = screen.get_size()
+                pygame.draw.rect(screen, EDGE_COLOR, pygame.Rect(0, 0, width, height), width=2)
+                font = pygame.font.Font(pygame.font.get_default_font(), max(12, int(height * 0.04)))
+                title = font.render(f'{selected}: {finished}/{total} points settled', True, (220, 220, 230))
+                hint = font.render(f'{parameter} {values[0]}..{values[-1]} on {os.cpu_count() or 1} cores', True, (160, 160, 170))
+                screen.blit(title, (width // 2 - title.get_width() // 2, int(height * 0.4)))
+                screen.blit(hint, (width // 2 - hint.get_width() // 2, int(height * 0.47)))
+                pygame.display.flip()
+
+            points = run_sweep(
+                sim_type,
+                parameter,
+                values,
+                sweep_fixed_food,
+                avg_csv_path,
+                first_sim_id=simulation_id,
+                verbose=bool(verbose_choice),
+                poll=draw_sweep_progress,
+            )
 
-                # at end of 50-day run (or earlier if manual_stop), show final frame until dismissed
-                def draw_incremental_food_results() -> None:
-                    screen.fill(BACKGROUND_COLOR)
-                    pygame.draw.rect(screen, EDGE_COLOR, pygame.Rect(0, 0, sim.width, sim.height), width=2)
-                    for creature in sim.creatures:
-                        creature.draw(screen)
-                    for food in sim.foods:
-                        food.draw(screen)
-                    render_population_graph(screen, day_rows)
-
-                write_recent_csv(simulation_id, day_rows)
-                wait_for_results_dismiss(draw_incremental_food_results)
-
-                # after the run, compute average population (average start_creatures per day)
-                if day_rows:
-                    avg_pop = sum(r[1] for r in day_rows) / len(day_rows)
-                else:
-                    avg_pop = 0
-                # append to avg CSV
-                with open(avg_csv_path, 'a', newline='') as f:
-                    w = csv.writer(f)
-                    w.writerow([int(current_food), float(avg_pop)])
-
-                # increment food for next run and loop (user will terminate when they've seen enough)
-                current_food += 1
-                simulation_id += 1
-                run_idx += 1
-
-            # (never reached) continue
-        # energy-based incremental sims: vary creature max energy per run and record average population
-        if selected in ('Incremental Energy (Basic)', 'Incremental Energy (Greedy)'):
-            start_energy = DATA_SIM_ENERGY_START
-            energy_increment = DATA_SIM_ENERGY_INCREMENT
-            runs = DATA_SIM_RUNS
-            if selected == 'Incremental Energy (Basic)':
-                avg_csv_name = 'basic_average_population_vs_energy.csv'
-                sim_factory = BasicSimulation
-            else:
-                avg_csv_name = 'greedy_average_population_vs_energy.csv'
-                sim_factory = GreedySimulation
-
-            log_dir = os.path.join(os.getcwd(), 'log')
-            os.makedirs(log_dir, exist_ok=True)
-            avg_csv_path = os.path.join(log_dir, avg_csv_name)
-            if not os.path.exists(avg_csv_path):
-                with open(avg_csv_path, 'w', newline='') as f:
-                    w = csv.writer(f)
-                    w.writerow(['energy', 'average_population'])
-
-            current_energy = start_energy
-            run_idx = 1
-            while True:
-                sim = sim_factory(WORLD_WIDTH, WORLD_HEIGHT)
-                # force fixed food behavior (user provided fixed_food_amount)
-                setattr(sim, 'food_scaling', False)
-                setattr(sim, 'fixed_food_count', int(fixed_food_amount) if isinstance(fixed_food_amount, int) else 0)
-                setattr(sim, 'verbose', bool(verbose_choice))
-                sim.speed_steps = max(1, current_speed_steps)
-
-                # Override creature max energy provider for this instance
-                sim.get_creature_max_energy = (lambda e=current_energy: int(e))
-                # Also set each starting creature's current energy
-                for c in sim.creatures:
-                    c.energy = int(current_energy)
-
-                pygame.display.set_caption(f'Ecosystem Simulator – {selected} (run {run_idx}/{runs} energy={current_energy})')
-
-                # Run exactly 50 days per run
-                day_rows = []
-                for day in range(1, 50 + 1):
-                    sim.day = day
-
-                    start_creatures, food_spawned, survivors, died = sim.simulate_day(screen, clock)
-                    current_speed_steps = sim.speed_steps
-                    sim.log_day(simulation_id, day, start_creatures, food_spawned, survivors, died)
-                    end_creatures = survivors
-                    day_rows.append((day, start_creatures, food_spawned, survivors, died, end_creatures))
-
-                    sim.reproduce_survivors()
-
-                    if getattr(sim, 'manual_stop', False):
-                        break
-
-                def draw_incremental_energy_results() -> None:
-                    screen.fill(BACKGROUND_COLOR)
-                    pygame.draw.rect(screen, EDGE_COLOR, pygame.Rect(0, 0, sim.width, sim.height), width=2)
-                    for creature in sim.creatures:
-                        creature.draw(screen)
-                    for food in sim.foods:
-                        food.draw(screen)
-                    render_population_graph(screen, day_rows)
-
-                write_recent_csv(simulation_id, day_rows)
-                wait_for_results_dismiss(draw_incremental_energy_results)
-
-                # compute average population for the run
-                if day_rows:
-                    avg_pop = sum(r[1] for r in day_rows) / len(day_rows)
-                else:
-                    avg_pop = 0
-                with open(avg_csv_path, 'a', newline='') as f:
-                    w = csv.writer(f)
-                    w.writerow([int(current_energy), float(avg_pop)])
-
-                current_energy += energy_increment
-                simulation_id += 1
-                run_idx += 1
-
-            # (never reached)
-        # prepare per-simulation auxiliary storage
-        speed_rows = []
-        size_rows = []
-        intelligence_rows = []
+            def draw_sweep_results() -> None:
+                screen.fill(BACKGROUND_COLOR)
+                render_csv_graph(screen, avg_csv_path)
 
+            wait_for_results_dismiss(draw_sweep_results)
+            simulation_id += sum(point.replicates for point in points)
+            sweep_block += 1
+            continue
         if selected == 'BasicSimulation':
             sim = BasicSimulation(WORLD_WIDTH, WORLD_HEIGHT)
         elif selected == 'GreedySimulation':
@@ -587,10 +500,8 @@ def run_simulation() -> None:
                 mutation_size_enabled=mutation_settings.get('size', True),
                 mutation_intelligence_enabled=mutation_settings.get('intelligence', True),
             )
-            # prepare storage for average-trait-per-day measurements
-            speed_rows = []
-            size_rows = []
-            intelligence_rows = []
+            # the end-of-run trait graphs are read back from the archive
+            sim.record_traits = True
         else:
             sim = BasicSimulation(WORLD_WIDTH, WORLD_HEIGHT)
 
@@ -602,7 +513,9 @@ def run_simulation() -> None:
         setattr(sim, 'verbose', bool(verbose_choice))
 
         sim.speed_steps = max(1, current_speed_steps)
-        pygame.display.set_caption(f'Ecosystem Simulator – {selected} (x{sim.speed_steps})')
+        sim.uncapped = current_uncapped
+        sim.render_day_interval = current_render_interval
+        sim.update_caption()
 
         day = 0
         # collect per-day stats for graphing and recent CSV. Keep all days; graph will show full dataset.
@@ -612,30 +525,10 @@ def run_simulation() -> None:
                 break
             day += 1
             sim.day = day
-            # For mutation simulation, measure average traits at start of day
-            if selected == 'MutationSimulation':
-                try:
-                    avg_speed = 0.0
-                    avg_size = 0.0
-                    avg_intelligence = 0.0
-                    if sim.creatures:
-                        avg_speed = sum(float(getattr(c, 'traits', {}).get('speed', 1.0)) for c in sim.creatures) / len(sim.creatures)
-                        avg_size = sum(float(getattr(c, 'traits', {}).get('size', 1.0)) for c in sim.creatures) / len(sim.creatures)
-                        avg_intelligence = sum(float(getattr(c, 'traits', {}).get('intelligence', 1.0)) for c in sim.creatures) / len(sim.creatures)
-                    else:
-                        avg_speed = 0.0
-                        avg_size = 0.0
-                        avg_intelligence = 0.0
-                except Exception:
-                    avg_speed = 0.0
-                    avg_size = 0.0
-                    avg_intelligence = 0.0
-                speed_rows.append((day, avg_speed))
-                size_rows.append((day, avg_size))
-                intelligence_rows.append((day, avg_intelligence))
-
             start_creatures, food_spawned, survivors, died = sim.simulate_day(screen, clock)
             current_speed_steps = sim.speed_steps
+            current_uncapped = sim.uncapped
+            current_render_interval = sim.render_day_interval
             sim.log_day(simulation_id, day, start_creatures, food_spawned, survivors, died)
             end_creatures = survivors
             # Always record day rows (we'll show the most recent N in the graph)
@@ -648,39 +541,11 @@ def run_simulation() -> None:
                     # write combined CSV for mutation simulation
                     log_dir = os.path.join(os.getcwd(), 'log')
                     os.makedirs(log_dir, exist_ok=True)
-                    speed_rows_to_write = speed_rows
-                    size_rows_to_write = size_rows
-                    intelligence_rows_to_write = intelligence_rows
-
-                    # determine which columns to include based on enabled mutations
-                    speed_enabled = mutation_settings.get('speed', True)
-                    size_enabled = mutation_settings.get('size', True)
-                    intelligence_enabled = mutation_settings.get('intelligence', True)
-
+                    # daily trait averages come from the run's per-creature archive;
+                    # only the enabled mutations get a column
                     mpath = os.path.join(log_dir, 'mutation_simulation_traits.csv')
-                    with open(mpath, 'w', newline='') as f:
-                        w = csv.writer(f)
-                        # build header dynamically
-                        header = ['day']
-                        if speed_enabled:
-                            header.append('average_speed')
-                        if size_enabled:
-                            header.append('average_size')
-                        if intelligence_enabled:
-                            header.append('average_intelligence')
-                        w.writerow(header)
-
-                        # write data rows
-                        max_days = max(len(speed_rows_to_write), len(size_rows_to_write), len(intelligence_rows_to_write), 0)
-                        for idx in range(max_days):
-                            row: list = [idx + 1]  # day starts at 1
-                            if speed_enabled and idx < len(speed_rows_to_write):
-                                row.append(speed_rows_to_write[idx][1])
-                            if size_enabled and idx < len(size_rows_to_write):
-                                row.append(size_rows_to_write[idx][1])
-                            if intelligence_enabled and idx < len(intelligence_rows_to_write):
-                                row.append(intelligence_rows_to_write[idx][1])
-                            w.writerow(row)
+                    enabled_traits = [t for t in ('speed', 'size', 'intelligence') if mutation_settings.get(t, True)]
+                    write_trait_means_csv(TraitArchive(sim.trait_archive_path()), mpath, enabled_traits)
 
                 def draw_final_results() -> None:
                     screen.fill(BACKGROUND_COLOR)
@@ -695,57 +560,16 @@ def run_simulation() -> None:
                         # Render only the most recent 20 days for clarity
                         render_population_graph(screen, day_rows[-20:])
 
-                # Write/update recent CSV (last 10 simulations x up to 20 days)
-                write_recent_csv(simulation_id, day_rows)
                 wait_for_results_dismiss(draw_final_results)
                 break
 
             sim.reproduce_survivors()
 
+        # run boundary: make sure this run's day log is on disk
+        sim.finish_log()
         simulation_id += 1
 
 
-# write_recent_csv(simulation_id, day_rows)
-# 
-# @param simulation_id  id of the finished simulation
-# @param day_rows  list of tuples (day, start, food, survivors, died, end)
-# @return None
-# 
-def write_recent_csv(simulation_id: int, day_rows: list) -> None:
-    log_dir = os.path.join(os.getcwd(), 'log')
-    os.makedirs(log_dir, exist_ok=True)
-    recent_path = os.path.join(log_dir, 'recent_stats.csv')
-
-    # load existing rows
-    existing = []
-    if os.path.exists(recent_path):
-        with open(recent_path, 'r', newline='') as f:
-            reader = csv.reader(f)
-            header = next(reader, None)
-            for r in reader:
-                try:
-                    existing.append((int(r[0]), int(r[1]), int(r[2]), int(r[3]), int(r[4]), int(r[5]), int(r[6])))
-                except Exception:
-                    continue
-    # append this simulation's rows (cap to 20 already ensured by caller)
-    for (day, start_c, food, surv, died, end_c) in day_rows:
-        existing.append((simulation_id, day, start_c, food, surv, died, end_c))
-
-    # keep only last 10 simulation ids
-    sim_ids = sorted({sid for (sid, *_rest) in existing}, reverse=True)
-    keep_ids = set(sim_ids[:10])
-    filtered = [r for r in existing if r[0] in keep_ids]
-    # sort by sim_id then day
-    filtered.sort(key=lambda r: (r[0], r[1]))
-
-    # write back
-    with open(recent_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['sim_id', 'day', 'start_creatures', 'food_spawned', 'survivors', 'died', 'end_creatures'])
-        for r in filtered:
-            writer.writerow(r)
-
-
 # render_population_graph(screen, day_rows)
 # 
 # @param screen  pygame surface to draw graph on
@@ -777,6 +601,11 @@ def render_population_graph(screen: pygame.Surface, day_rows: list) -> None:
     max_pop = max(max(pops), 1)
     # add 5% headroom above max for easier viewing
     display_max_pop = max_pop * SIM_GRAPH_Y_MARGIN
+    # long runs: keep about one point per pixel column, preserving peaks and dips
+    if len(days) > graph_rect.width:
+        keep = lttb_indices(days, pops, graph_rect.width)
+        days = [days[i] for i in keep]
+        pops = [pops[i] for i in keep]
     # scale and draw line
     points = []
     for (d, p) in zip(days, pops):
@@ -793,7 +622,7 @@ def render_population_graph(screen: pygame.Surface, day_rows: list) -> None:
     elif len(points) == 1:
         pygame.draw.circle(screen, (80, 200, 120), points[0], 2)
     # draw axes ticks/labels (minimal)
-    font = pygame.font.SysFont(None, 18)
+    font = graph_font(18)
     label = font.render('Population vs Day (start of day)', True, (200, 200, 210))
     screen.blit(label, (graph_rect.left, graph_rect.top - 22))
     # day labels min and max
@@ -852,10 +681,12 @@ def render_speed_graph(screen: pygame.Surface, day_rows: list, label_text: str =
     max_speed = max(max(speeds), 1.0)
     display_max_speed = max_speed * SIM_GRAPH_Y_MARGIN
 
-    # Build pixel positions for raw data points
+    # Build pixel positions for raw data points; long series keep only the
+    # lowest and highest point per pixel column so spikes stay visible
     points = []
     n = len(speeds)
-    for (d, s) in zip(days, speeds):
+    raw_keep = minmax_indices(days, speeds, graph_rect.width)
+    for (d, s) in ((days[i], speeds[i]) for i in raw_keep):
         if max_day == min_day:
             x = graph_rect.left + graph_rect.width / 2
         else:
@@ -868,15 +699,9 @@ def render_speed_graph(screen: pygame.Surface, day_rows: list, label_text: str =
     window = max(3, min(51, max(3, n // 10)))
     if n < window:
         window = max(1, n)
-    half = window // 2
 
-    # Centered moving average smoothing
-    smoothed = []
-    for i in range(n):
-        start = max(0, i - half)
-        end = min(n, i + half + 1)
-        avg = sum(speeds[start:end]) / float(end - start)
-        smoothed.append(avg)
+    # Centered moving average smoothing (prefix sums, O(n))
+    smoothed = centered_mean(speeds, window).tolist()
 
     # To create a clean (but now sparser) trend curve, aggregate the smoothed series
     # into a modest number of segments and draw lines between segment means.
@@ -884,17 +709,8 @@ def render_speed_graph(screen: pygame.Surface, day_rows: list, label_text: str =
     max_segments = 20  # was 60, reduce to draw fewer piecewise segments
     segments = min(max_segments, max(1, n))
     seg_size = max(1, n // segments)
-    agg_days = []
-    agg_vals = []
-    i = 0
-    while i < n:
-        chunk = range(i, min(n, i + seg_size))
-        chunk_days = [days[j] for j in chunk]
-        chunk_vals = [smoothed[j] for j in chunk]
-        if chunk_days:
-            agg_days.append(sum(chunk_days) / len(chunk_days))
-            agg_vals.append(sum(chunk_vals) / len(chunk_vals))
-        i += seg_size
+    agg_days = chunk_means(days, seg_size).tolist()
+    agg_vals = chunk_means(smoothed, seg_size).tolist()
 
     # Build pixel positions for aggregated trend points
     agg_points = []
@@ -945,7 +761,7 @@ def render_speed_graph(screen: pygame.Surface, day_rows: list, label_text: str =
     elif len(smooth_points) == 1:
         pygame.draw.circle(screen, smooth_color, smooth_points[0], 4)
 
-    font = pygame.font.SysFont(None, 18)
+    font = graph_font(18)
     label = font.render(label_text, True, (200, 200, 210))
     screen.blit(label, (graph_rect.left, graph_rect.top - 22))
 
@@ -986,17 +802,8 @@ def render_speed_graph(screen: pygame.Surface, day_rows: list, label_text: str =
 
     # compute overall average speed across the whole series and display it outside the graph
     # Compute overall average using only the last 90% of recorded values to allow stabilization
-    overall_avg = 0.0
-    try:
-        if speeds:
-            n = len(speeds)
-            start_idx = int(n * 0.1)
-            tail = speeds[start_idx:]
-            if not tail:
-                tail = speeds
-            overall_avg = sum(tail) / float(len(tail))
-    except Exception:
-        overall_avg = 0.0
+    start_idx = int(n * 0.1)
+    overall_avg = range_mean(prefix_sums(speeds), start_idx, n)
     avg_text = font.render(f'Overall avg {metric_name}: {overall_avg:.2f}', True, (220, 220, 210))
     # place at top-right corner but keep within window bounds
     tx = min(graph_rect.right + 8, screen.get_width() - avg_text.get_width() - 8)
@@ -1009,14 +816,34 @@ def render_mutation_traits_graphs(screen: pygame.Surface, csv_path: str) -> None
 
     CSV format: day, [average_speed], [average_size], [average_intelligence]
     where each trait column is optional depending on the enabled mutations.
+    The parsed file and the rendered graph are cached until the file changes.
     """
+    graph = GRAPH_CACHE.surface(csv_path, screen.get_size(), parse_mutation_traits_csv, draw_mutation_traits_graphs)
+    screen.blit(graph, (0, 0))
+
+
+# draw_csv_not_found(screen, csv_path)
+#
+# @param screen  pygame surface to draw on
+# @param csv_path  the missing file
+# @return None
+#
+def draw_csv_not_found(screen: pygame.Surface, csv_path: str) -> None:
+    width, height = screen.get_size()
+    screen.fill(BACKGROUND_COLOR)
+    font = graph_font(20)
+    msg = font.render('CSV not found: ' + os.path.basename(csv_path), True, (200, 200, 210))
+    screen.blit(msg, (width // 2 - msg.get_width() // 2, height // 2 - 10))
+
+
+# parse_mutation_traits_csv(csv_path)
+#
+# @param csv_path  mutation traits CSV
+# @return (days, speed, size, intelligence, has_speed, has_size, has_intelligence), or None if the file is missing
+#
+def parse_mutation_traits_csv(csv_path: str):
     if not os.path.exists(csv_path):
-        width, height = screen.get_size()
-        screen.fill(BACKGROUND_COLOR)
-        font = pygame.font.SysFont(None, 20)
-        msg = font.render('CSV not found: ' + os.path.basename(csv_path), True, (200, 200, 210))
-        screen.blit(msg, (width // 2 - msg.get_width() // 2, height // 2 - 10))
-        return
+        return None
 
     # Read CSV and detect columns
     days = []
@@ -1050,7 +877,21 @@ def render_mutation_traits_graphs(screen: pygame.Surface, csv_path: str) -> None
                         intelligence_data.append(float(r[intelligence_col]))
                 except Exception:
                     continue
-    
+    return days, speed_data, size_data, intelligence_data, has_speed, has_size, has_intelligence
+
+
+# draw_mutation_traits_graphs(screen, data, csv_path)
+#
+# @param screen  pygame surface to draw on
+# @param data  result of parse_mutation_traits_csv
+# @param csv_path  the file the data came from
+# @return None
+#
+def draw_mutation_traits_graphs(screen: pygame.Surface, data, csv_path: str) -> None:
+    if data is None:
+        draw_csv_not_found(screen, csv_path)
+        return
+    days, speed_data, size_data, intelligence_data, has_speed, has_size, has_intelligence = data
     if not days:
         return
     
@@ -1091,22 +932,38 @@ def render_mutation_traits_graphs(screen: pygame.Surface, csv_path: str) -> None
         screen.blit(section_surface, (0, top))
 
 
+# render_csv_graph(screen, csv_path)
+#
+# Average-population graph of a sweep CSV. The parsed file and the rendered
+# graph are cached until the file changes.
+#
+# @param screen  pygame surface to draw on
+# @param csv_path  sweep CSV
+# @return None
+#
 def render_csv_graph(screen: pygame.Surface, csv_path: str) -> None:
+    screen.blit(GRAPH_CACHE.surface(csv_path, screen.get_size(), parse_csv_graph, draw_csv_graph), (0, 0))
+
+
+# parse_csv_graph(csv_path)
+#
+# @param csv_path  sweep CSV
+# @return (xs, ys, bands), or None if the file is missing
+#
+def parse_csv_graph(csv_path: str):
     # read csv of two columns
     if not os.path.exists(csv_path):
-        width, height = screen.get_size()
-        screen.fill(BACKGROUND_COLOR)
-        font = pygame.font.SysFont(None, 20)
-        msg = font.render('CSV not found: ' + os.path.basename(csv_path), True, (200, 200, 210))
-        screen.blit(msg, (width // 2 - msg.get_width() // 2, height // 2 - 10))
-        pygame.display.flip()
-        return
+        return None
 
     xs = []
     ys = []
+    # replicate sweeps add 95% CI columns; older two-column files have none
+    bands = []
     with open(csv_path, 'r', newline='') as f:
         reader = csv.reader(f)
-        header = next(reader, None)
+        header = next(reader, None) or []
+        low_col = header.index('ci95_low') if 'ci95_low' in header else None
+        high_col = header.index('ci95_high') if 'ci95_high' in header else None
         for r in reader:
             try:
                 x = float(r[0])
@@ -1115,7 +972,25 @@ def render_csv_graph(screen: pygame.Surface, csv_path: str) -> None:
                 continue
             xs.append(x)
             ys.append(y)
+            try:
+                bands.append((float(r[low_col]), float(r[high_col])))
+            except (TypeError, IndexError, ValueError):
+                bands.append(None)
+    return xs, ys, bands
 
+
+# draw_csv_graph(screen, data, csv_path)
+#
+# @param screen  pygame surface to draw on
+# @param data  result of parse_csv_graph
+# @param csv_path  the file the data came from; its name picks the title
+# @return None
+#
+def draw_csv_graph(screen: pygame.Surface, data, csv_path: str) -> None:
+    if data is None:
+        draw_csv_not_found(screen, csv_path)
+        return
+    xs, ys, bands = data
     if not xs:
         return
 
@@ -1137,7 +1012,7 @@ def render_csv_graph(screen: pygame.Surface, csv_path: str) -> None:
 
     # Draw axes
     pygame.draw.rect(screen, EDGE_COLOR, graph_rect, width=1)
-    font = pygame.font.SysFont(None, 18)
+    font = graph_font(18)
     # choose title based on file name (energy CSVs should be labeled 'Energy')
     base_name = os.path.basename(csv_path).lower()
     if 'energy' in base_name:
@@ -1148,8 +1023,10 @@ def render_csv_graph(screen: pygame.Surface, csv_path: str) -> None:
     screen.blit(label, (graph_rect.left, graph_rect.top - 22))
 
     max_y = max(ys)
+    # keep the top of every confidence band on screen
+    band_max_y = max((b[1] for b in bands if b is not None), default=max_y)
     # avoid division by zero if max_y is 0
-    display_max_y = max(max_y, 1.0) * 1.05
+    display_max_y = max(max_y, band_max_y, 1.0) * 1.05
 
     # build pixel positions for each data point
     points_info = []
@@ -1166,6 +1043,33 @@ def render_csv_graph(screen: pygame.Surface, csv_path: str) -> None:
         # threshold: 10% of max_y or at least 1
         outlier_threshold = max(1.0, max_y * 0.10)
 
+    # shade the 95% confidence band behind the trend line, one polygon per run of points that have one
+    band_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    band_runs = []
+    current_run = []
+    for p, band in zip(points_info, bands):
+        if band is None:
+            if current_run:
+                band_runs.append(current_run)
+                current_run = []
+            continue
+        low_py = int(graph_rect.bottom - (max(0.0, band[0]) / display_max_y) * graph_rect.height)
+        high_py = int(graph_rect.bottom - (band[1] / display_max_y) * graph_rect.height)
+        current_run.append((p['px'], low_py, high_py))
+    if current_run:
+        band_runs.append(current_run)
+    band_color = (120, 180, 220, 70)
+    for run in band_runs:
+        if len(run) >= 2:
+            upper = [(px, high) for px, _, high in run]
+            lower = [(px, low) for px, low, _ in reversed(run)]
+            pygame.draw.polygon(band_surface, band_color, upper + lower)
+        else:
+            px, low, high = run[0]
+            pygame.draw.line(band_surface, band_color, (px, low), (px, high), 3)
+    if band_runs:
+        screen.blit(band_surface, (0, 0))
+
     # Create connected segments of non-outlier points for the trend line
     segments = []
     current_seg = []
@@ -1183,9 +1087,12 @@ def render_csv_graph(screen: pygame.Surface, csv_path: str) -> None:
     if current_seg:
         segments.append(current_seg)
 
-    # draw trend line segments
+    # draw trend line segments, thinned to about one point per pixel column
     line_color = (120, 180, 220)
     for seg in segments:
+        if len(seg) > graph_rect.width:
+            keep = lttb_indices([p[0] for p in seg], [p[1] for p in seg], graph_rect.width)
+            seg = [seg[i] for i in keep]
         if len(seg) >= 2:
             pygame.draw.lines(screen, line_color, False, seg, 2)
         elif len(seg) == 1:
@@ -1234,4 +1141,8 @@ def view_graphs_flow() -> None:
     raise NotImplementedError("view_graphs_flow must be called with screen and clock")
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        # scripted batch runs: python src/main.py run|sweep ... (see cli.py)
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
     run_simulation()
\ No newline at end of file
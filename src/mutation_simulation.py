@@ -1,23 +1,21 @@
 import math
+import os
 import random
-from typing import List, Tuple
+import time
+from typing import List, Optional, Tuple
 
 import pygame
 
 from constants import (
     CREATURE_RADIUS,
-    FOOD_RADIUS,
-    CREATURE_MAX_ENERGY,
-    FOOD_ENERGY,
-    CREATURE_STEP_SIZE,
-    START_CREATURES,
-    INTELLIGENCE_BASE_RANGE,
-    INTELLIGENCE_BASE_ERROR_DEGREES,
-    INTELLIGENCE_TURN_RATE,
-    INTELLIGENCE_ENERGY_COST,
+    CREATURE_COLOR,
+    DEAD_COLOR,
 )
-from constants import MUTATION_SPEED_DELTA, MUTATION_SIZE_DELTA, MUTATION_INTELLIGENCE_DELTA
 from simulation import Simulation
+from params import SimParams, DEFAULT_PARAMS
+from trait_archive import TraitArchiveWriter, trait_archive_dir
+from lineage import LineageTracker, NO_PARENT
+from sprites import circle_blit
 from basic_simulation import (
     Food,
     point_on_random_edge,
@@ -36,6 +34,8 @@ class Creature:
     - intelligence: improves food tracking through longer range and less steering error
 
     energy is a float so we can model fractional energy drain for speed/size multipliers.
+    creature_id indexes the simulation's LineageTracker; a carried-over survivor keeps its id.
+    params are the SimParams of the simulation the creature lives in.
     """
 
     def __init__(
@@ -46,7 +46,11 @@ class Creature:
         size_mult: float = 1.0,
         intelligence_mult: float = 1.0,
         base_radius: int = CREATURE_RADIUS,
+        creature_id: int = NO_PARENT,
+        params: SimParams = DEFAULT_PARAMS,
     ):
+        self.params = params
+        self.creature_id = creature_id
         self.position = position
         self.direction = direction
         self.traits = {
@@ -55,7 +59,9 @@ class Creature:
             'intelligence': float(intelligence_mult),
         }
         self.base_radius = base_radius
-        self.energy = float(CREATURE_MAX_ENERGY)
+        # traits are fixed for life, so the drawn size is too
+        self.draw_radius = int(self.radius)
+        self.energy = float(params.creature_max_energy)
         self.has_eaten = 0
         self.is_survivor = False
 
@@ -64,10 +70,10 @@ class Creature:
         size_mult = max(0.0001, self.traits.get('size', 1.0))
         return float(self.base_radius) * math.sqrt(size_mult)
 
-    def _normalize_direction(self, direction: Tuple[float, float]) -> Tuple[float, float]:
+    def _normalize_direction(self, direction: Tuple[float, float], rng: random.Random = random) -> Tuple[float, float]:
         mag = math.hypot(direction[0], direction[1])
         if mag <= 0:
-            return random_unit_vector()
+            return random_unit_vector(rng)
         return direction[0] / mag, direction[1] / mag
 
     def _rotate_vector(self, vector: Tuple[float, float], angle: float) -> Tuple[float, float]:
@@ -78,60 +84,67 @@ class Creature:
             vector[0] * sin_a + vector[1] * cos_a,
         )
 
-    def steer(self, foods: List, food_radius: int) -> None:
+    def steer(self, foods: List, food_radius: int, rng: random.Random = random) -> None:
         intelligence = max(0.1, self.traits.get('intelligence', 1.0))
-        sensing_range = INTELLIGENCE_BASE_RANGE * intelligence
+        sensing_range = self.params.intelligence_base_range * intelligence
         nearest_food = None
         nearest_distance = None
 
-        for food in foods:
-            dist = distance(self.position, food.position)
-            if dist <= sensing_range and (nearest_distance is None or dist < nearest_distance):
-                nearest_food = food
-                nearest_distance = dist
+        if hasattr(foods, 'nearest_within'):
+            # shared spatial index over the day's food (see Simulation.begin_day)
+            found = foods.nearest_within(self.position, sensing_range, distance)
+            if found is not None:
+                nearest_distance, nearest_food = found
+        else:
+            for food in foods:
+                dist = distance(self.position, food.position)
+                if dist <= sensing_range and (nearest_distance is None or dist < nearest_distance):
+                    nearest_food = food
+                    nearest_distance = dist
 
         if nearest_food is None:
-            if random.random() < 0.05:
-                self.direction = random_unit_vector()
+            if rng.random() < self.params.turn_chance:
+                self.direction = random_unit_vector(rng)
             return
 
         target_vector = (
             nearest_food.position[0] - self.position[0],
             nearest_food.position[1] - self.position[1],
         )
-        desired_direction = self._normalize_direction(target_vector)
+        desired_direction = self._normalize_direction(target_vector, rng)
 
         # Smarter creatures get less angular error, but still imperfect information.
-        max_error_radians = math.radians(INTELLIGENCE_BASE_ERROR_DEGREES) / intelligence
+        max_error_radians = math.radians(self.params.intelligence_base_error_degrees) / intelligence
         noisy_direction = self._rotate_vector(
             desired_direction,
-            random.uniform(-max_error_radians, max_error_radians),
+            rng.uniform(-max_error_radians, max_error_radians),
         )
-        noisy_direction = self._normalize_direction(noisy_direction)
+        noisy_direction = self._normalize_direction(noisy_direction, rng)
 
         if nearest_distance is not None and nearest_distance <= (self.radius + food_radius):
             self.direction = noisy_direction
             return
 
-        turn_weight = max(0.05, min(1.0, INTELLIGENCE_TURN_RATE * intelligence))
+        turn_weight = max(0.05, min(1.0, self.params.intelligence_turn_rate * intelligence))
         blended_direction = (
             (1.0 - turn_weight) * self.direction[0] + turn_weight * noisy_direction[0],
             (1.0 - turn_weight) * self.direction[1] + turn_weight * noisy_direction[1],
         )
-        self.direction = self._normalize_direction(blended_direction)
+        self.direction = self._normalize_direction(blended_direction, rng)
 
     def move(self) -> None:
         speed = self.traits.get('speed', 1.0)
         size_mult = max(0.0001, self.traits.get('size', 1.0))
         intelligence = max(0.1, self.traits.get('intelligence', 1.0))
-        dx = self.direction[0] * CREATURE_STEP_SIZE * speed
-        dy = self.direction[1] * CREATURE_STEP_SIZE * speed
+        step = self.params.creature_step_size
+        dx = self.direction[0] * step * speed
+        dy = self.direction[1] * step * speed
         self.position = (self.position[0] + dx, self.position[1] + dy)
         # energy drained per move scales with speed, size, and modestly with intelligence.
-        intelligence_factor = 1.0 + INTELLIGENCE_ENERGY_COST * max(0.0, intelligence - 1.0)
+        intelligence_factor = 1.0 + self.params.intelligence_energy_cost * max(0.0, intelligence - 1.0)
         self.energy -= (1.0 * speed * size_mult * intelligence_factor)
 
-    def handle_edges(self, width: int, height: int) -> None:
+    def handle_edges(self, width: int, height: int, rng: random.Random = random) -> None:
         x, y = self.position
         r = self.radius
         touched_edge = (
@@ -166,13 +179,16 @@ class Creature:
                 self.direction = (self.direction[0], -self.direction[1])
                 bounced = True
             if bounced:
-                if random.random() < 0.5:
-                    self.direction = random_unit_vector()
+                if rng.random() < 0.5:
+                    self.direction = random_unit_vector(rng)
             self.position = (x, y)
 
+    def sprite_blit(self) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        color = DEAD_COLOR if (not self.is_survivor and self.energy <= 0) else CREATURE_COLOR
+        return circle_blit(self.position, self.draw_radius, color)
+
     def draw(self, surface: pygame.Surface) -> None:
-        color = (220, 60, 60) if (not self.is_survivor and self.energy <= 0) else (61, 178, 255)
-        pygame.draw.circle(surface, color, (int(self.position[0]), int(self.position[1])), int(self.radius))
+        surface.blit(*self.sprite_blit())
 
 
 class MutationSimulation(Simulation):
@@ -183,30 +199,51 @@ class MutationSimulation(Simulation):
         mutation_speed_enabled: bool = True,
         mutation_size_enabled: bool = True,
         mutation_intelligence_enabled: bool = True,
+        seed: Optional[int] = None,
+        params: Optional[SimParams] = None,
     ):
-        super().__init__(width, height)
+        super().__init__(width, height, seed=seed, params=params)
         self.mutation_speed_enabled = mutation_speed_enabled
         self.mutation_size_enabled = mutation_size_enabled
         self.mutation_intelligence_enabled = mutation_intelligence_enabled
-        self.base_radius = CREATURE_RADIUS
-        num_creatures = START_CREATURES.get('mutation_simulation', START_CREATURES.get('basic_simulation', 5))
-        for _ in range(num_creatures):
-            start_pos = point_on_random_edge(self.width, self.height, margin=self.base_radius)
-            self.creatures.append(Creature(position=start_pos, direction=random_unit_vector(), base_radius=self.base_radius))
+        self.base_radius = self.params.creature_radius
+        # per-creature trait archive (traits/run_<id> next to the run catalog), opt-in;
+        # opened on the first finished day
+        self.record_traits = False
+        self.trait_log_dir: Optional[str] = None
+        self.trait_archive: Optional[TraitArchiveWriter] = None
+        # parentage of every creature born in this run
+        self.lineage = LineageTracker()
+        num_creatures = self.params.creature_count('mutation_simulation')
+        for founder_id in self.lineage.add_founders(num_creatures, day=1):
+            start_pos = point_on_random_edge(self.width, self.height, margin=self.base_radius, rng=self.rng)
+            self.creatures.append(Creature(
+                position=start_pos,
+                direction=random_unit_vector(self.rng),
+                base_radius=self.base_radius,
+                creature_id=founder_id,
+                params=self.params,
+            ))
 
     def spawn_food_for_day(self, start_creature_count: int) -> None:
-        if getattr(self, 'food_scaling', True):
-            count = start_creature_count
-        else:
-            fixed = getattr(self, 'fixed_food_count', None)
-            count = fixed if (isinstance(fixed, int) and fixed >= 0) else start_creature_count
+        count = self.food_count_for_day(start_creature_count)
         self.foods = []
-        margin = max(FOOD_RADIUS + 2, self.base_radius + 2)
+        margin = max(self.params.food_radius + 2, self.base_radius + 2)
         for _ in range(count):
-            pos = random_point_interior(self.width, self.height, margin)
-            self.foods.append(Food(position=pos))
+            pos = random_point_interior(self.width, self.height, margin, rng=self.rng)
+            self.foods.append(Food(position=pos, radius=self.params.food_radius))
         self.food_spawned = count
 
+    def food_count_for_day(self, start_creature_count: int) -> int:
+        if getattr(self, 'food_scaling', True):
+            return start_creature_count
+        fixed = getattr(self, 'fixed_food_count', None)
+        return fixed if (isinstance(fixed, int) and fixed >= 0) else start_creature_count
+
+    def get_offspring_count(self, has_eaten: int) -> int:
+        # survivors carry over; eating 2+ foods also earns one mutated child
+        return 2 if has_eaten >= 2 else 1
+
     def reproduce_survivors(self) -> None:
         survivors = [c for c in self.creatures if c.is_survivor]
         new_creatures: List[Creature] = []
@@ -215,55 +252,118 @@ class MutationSimulation(Simulation):
         intelligence_mut_on = getattr(self, 'mutation_intelligence_enabled', True)
         for survivor in survivors:
             # recreate the survivor on the edge
-            pos = point_on_random_edge(self.width, self.height, margin=self.base_radius)
+            pos = point_on_random_edge(self.width, self.height, margin=self.base_radius, rng=self.rng)
             new_creatures.append(Creature(
                 position=pos,
-                direction=random_unit_vector(),
+                direction=random_unit_vector(self.rng),
                 speed_mult=survivor.traits.get('speed', 1.0),
                 size_mult=survivor.traits.get('size', 1.0),
                 intelligence_mult=survivor.traits.get('intelligence', 1.0),
                 base_radius=self.base_radius,
+                creature_id=survivor.creature_id,
+                params=self.params,
             ))
             # if they ate 2 or more foods, they replicate once with possible mutation
-            if survivor.has_eaten >= 2:
-                # child inherits speed with a percent change in [-MUTATION_SPEED_DELTA, +MUTATION_SPEED_DELTA]
+            if self.get_offspring_count(survivor.has_eaten) > 1:
+                # child inherits speed with a percent change in [-mutation_speed_delta, +mutation_speed_delta]
                 parent_speed = survivor.traits.get('speed', 1.0)
                 parent_size = survivor.traits.get('size', 1.0)
                 parent_intelligence = survivor.traits.get('intelligence', 1.0)
 
-                speed_val = self._mutate_trait(parent_speed, MUTATION_SPEED_DELTA, enabled=speed_mut_on)
-                size_val = self._mutate_trait(parent_size, MUTATION_SIZE_DELTA, enabled=size_mut_on)
+                speed_val = self._mutate_trait(parent_speed, self.params.mutation_speed_delta, enabled=speed_mut_on, rng=self.rng)
+                size_val = self._mutate_trait(parent_size, self.params.mutation_size_delta, enabled=size_mut_on, rng=self.rng)
                 intelligence_val = self._mutate_trait(
                     parent_intelligence,
-                    MUTATION_INTELLIGENCE_DELTA,
+                    self.params.mutation_intelligence_delta,
                     enabled=intelligence_mut_on,
+                    rng=self.rng,
                 )
 
-                pos2 = point_on_random_edge(self.width, self.height, margin=self.base_radius)
+                pos2 = point_on_random_edge(self.width, self.height, margin=self.base_radius, rng=self.rng)
                 new_creatures.append(Creature(
                     position=pos2,
-                    direction=random_unit_vector(),
+                    direction=random_unit_vector(self.rng),
                     speed_mult=speed_val,
                     size_mult=size_val,
                     intelligence_mult=intelligence_val,
                     base_radius=self.base_radius,
+                    creature_id=self.lineage.add_birth(survivor.creature_id),
+                    params=self.params,
                 ))
         self.creatures = new_creatures
 
+    def end_day(self) -> Tuple[int, int, int, int]:
+        # the list still holds every creature of the day, dead ones included
+        if self._day_start_creatures > 0:
+            self.lineage.record_day(c.creature_id for c in self.creatures)
+            if self.record_traits:
+                self.archive_traits()
+        return super().end_day()
+
+    def survivor_common_ancestor(self) -> Optional[int]:
+        # after end_day only survivors remain in the list
+        return self.lineage.common_ancestor(c.creature_id for c in self.creatures if c.is_survivor)
+
+    def archive_traits(self) -> None:
+        # traits never change during a day, so these are also the start-of-day values
+        speed, size, intelligence, has_eaten, energy = [], [], [], [], []
+        for c in self.creatures:
+            traits = c.traits
+            speed.append(traits['speed'])
+            size.append(traits['size'])
+            intelligence.append(traits['intelligence'])
+            has_eaten.append(c.has_eaten)
+            energy.append(c.energy)
+        self.archive_day(speed, size, intelligence, has_eaten, energy)
+
+    def archive_day(self, speed, size, intelligence, has_eaten, energy) -> None:
+        # shared with MutationArrayEngine, which passes its per-creature arrays directly
+        if self.trait_archive is None:
+            self.trait_archive = TraitArchiveWriter(self.trait_archive_path())
+        self.trait_archive.append_day(speed, size, intelligence, has_eaten, energy)
+
+    def trait_archive_path(self) -> str:
+        # under trait_log_dir when set, else in the run catalog's directory
+        run_id = self.ensure_run()
+        return trait_archive_dir(run_id, self.trait_log_dir or os.path.dirname(self.catalog.path))
+
+    def finish_log(self) -> None:
+        if self.trait_archive is not None:
+            self.trait_archive.close()
+            self.trait_archive = None
+        super().finish_log()
+
     def handle_creature_collision(self, creature, food_index: int) -> None:
         creature.has_eaten += 1
         # add energy from food, clamped
-        creature.energy = min(creature.energy + FOOD_ENERGY, float(self.get_creature_max_energy()))
+        creature.energy = min(creature.energy + self.params.food_energy, float(self.get_creature_max_energy()))
 
     def move_creature(self, creature: Creature) -> None:
-        creature.steer(self.foods, self.get_food_radius())
+        creature.steer(self.foods, self.get_food_radius(), self.rng)
         creature.move()
 
+    def move_creature_profiled(self, creature: Creature, profiler) -> None:
+        start = time.perf_counter_ns()
+        creature.steer(self.foods, self.get_food_radius(), self.rng)
+        steered = time.perf_counter_ns()
+        creature.move()
+        profiler.add('steer', steered - start)
+        profiler.add('move', time.perf_counter_ns() - steered)
+
+    def get_run_parameters(self) -> dict:
+        params = super().get_run_parameters()
+        params['mutations'] = {
+            'speed': bool(self.mutation_speed_enabled),
+            'size': bool(self.mutation_size_enabled),
+            'intelligence': bool(self.mutation_intelligence_enabled),
+        }
+        return params
+
     def get_simulation_name(self) -> str:
         return 'MutationSimulation'
 
     def get_creature_max_energy(self) -> int:
-        return CREATURE_MAX_ENERGY
+        return self.params.creature_max_energy
 
     def get_creature_radius(self) -> int:
         # base radius; actual radius may vary per creature via size trait
@@ -276,16 +376,16 @@ class MutationSimulation(Simulation):
             return float(self.base_radius)
 
     def get_food_radius(self) -> int:
-        return FOOD_RADIUS
+        return self.params.food_radius
 
     def distance(self, a: Tuple[float, float], b: Tuple[float, float]) -> float:
         return distance(a, b)
 
     @staticmethod
-    def _mutate_trait(value: float, delta: float, enabled: bool = True) -> float:
+    def _mutate_trait(value: float, delta: float, enabled: bool = True, rng: random.Random = random) -> float:
         if not enabled:
             return float(value)
-        change = random.uniform(-delta, delta)
+        change = rng.uniform(-delta, delta)
         mutated = float(value) * (1.0 + change)
         # prevent collapsing to zero/negative size or speed
         return max(0.1, mutated)
@@ -0,0 +1,148 @@
+import dataclasses
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from constants import (
+    CREATURE_RADIUS,
+    FOOD_RADIUS,
+    CREATURE_MAX_ENERGY,
+    CREATURE_STEP_SIZE,
+    CREATURE_TURN_CHANCE,
+    FOOD_ENERGY,
+    GREEDY_CONSTANT,
+    GREEDY_UNCERTAINTY,
+    START_CREATURES,
+    MUTATION_SPEED_DELTA,
+    MUTATION_SIZE_DELTA,
+    MUTATION_INTELLIGENCE_DELTA,
+    INTELLIGENCE_BASE_RANGE,
+    INTELLIGENCE_BASE_ERROR_DEGREES,
+    INTELLIGENCE_TURN_RATE,
+    INTELLIGENCE_ENERGY_COST,
+)
+
+# allowed values of each field: (minimum, maximum, whether the minimum itself is
+# allowed); None leaves that side open. Mutated traits are floored at 0.1, so
+# any non-negative mutation delta is safe.
+PARAM_RANGES = {
+    'creature_radius': (1, None, True),
+    'food_radius': (0, None, True),
+    'creature_max_energy': (0, None, False),
+    'creature_step_size': (0.0, None, False),
+    'food_energy': (0, None, True),
+    'turn_chance': (0.0, 1.0, True),
+    'start_creatures': (0, None, True),
+    'greedy_constant': (0.0, None, True),
+    'greedy_uncertainty': (0.0, None, True),
+    'mutation_speed_delta': (0.0, None, True),
+    'mutation_size_delta': (0.0, None, True),
+    'mutation_intelligence_delta': (0.0, None, True),
+    'intelligence_base_range': (0.0, None, True),
+    'intelligence_base_error_degrees': (0.0, 180.0, True),
+    'intelligence_turn_rate': (0.0, None, True),
+    'intelligence_energy_cost': (0.0, None, True),
+}
+
+
+# SimParams
+#
+# Every behaviour knob of one world. A Simulation owns one and hands it to
+# its creatures, so worlds with different settings can share a process or a
+# worker pool without touching module globals. Defaults come from
+# constants.py. Instances are frozen and hashable; digest() gives a stable
+# key for caching results across processes and runs. Out-of-range values
+# (see PARAM_RANGES) raise ValueError when the instance is built.
+@dataclass(frozen=True)
+class SimParams:
+    creature_radius: int = CREATURE_RADIUS
+    food_radius: int = FOOD_RADIUS
+    creature_max_energy: int = CREATURE_MAX_ENERGY
+    creature_step_size: float = CREATURE_STEP_SIZE
+    food_energy: int = FOOD_ENERGY
+    turn_chance: float = CREATURE_TURN_CHANCE
+    # creatures on day one; None uses the simulation's START_CREATURES entry
+    start_creatures: Optional[int] = None
+    greedy_constant: float = GREEDY_CONSTANT
+    greedy_uncertainty: float = GREEDY_UNCERTAINTY
+    mutation_speed_delta: float = MUTATION_SPEED_DELTA
+    mutation_size_delta: float = MUTATION_SIZE_DELTA
+    mutation_intelligence_delta: float = MUTATION_INTELLIGENCE_DELTA
+    intelligence_base_range: float = INTELLIGENCE_BASE_RANGE
+    intelligence_base_error_degrees: float = INTELLIGENCE_BASE_ERROR_DEGREES
+    intelligence_turn_rate: float = INTELLIGENCE_TURN_RATE
+    intelligence_energy_cost: float = INTELLIGENCE_ENERGY_COST
+
+    def __post_init__(self) -> None:
+        for name, (low, high, low_allowed) in PARAM_RANGES.items():
+            value = getattr(self, name)
+            if value is None:
+                continue
+            # written as what is allowed, so NaN fails both sides
+            above = low is None or value > low or (low_allowed and value == low)
+            if not (above and (high is None or value <= high)):
+                raise ValueError(f'{name} must be {describe_range(name)}, got {value!r}')
+
+    # SimParams.replace(**changes)
+    #
+    # @return a copy with the given fields changed
+    #
+    def replace(self, **changes) -> 'SimParams':
+        return dataclasses.replace(self, **changes)
+
+    # SimParams.creature_count(sim_key)
+    #
+    # @param sim_key  START_CREATURES key of the simulation, e.g. 'greedy_simulation'
+    # @return number of creatures to start with
+    #
+    def creature_count(self, sim_key: str) -> int:
+        if self.start_creatures is not None:
+            return int(self.start_creatures)
+        return START_CREATURES.get(sim_key, START_CREATURES.get('basic_simulation', 5))
+
+    def as_dict(self) -> Dict:
+        return dataclasses.asdict(self)
+
+    # SimParams.digest()
+    #
+    # @return hex SHA-1 of the field values, identical in every process
+    #
+    def digest(self) -> str:
+        return hashlib.sha1(json.dumps(self.as_dict(), sort_keys=True).encode('utf-8')).hexdigest()
+
+    # SimParams.from_overrides(overrides)
+    #
+    # @param overrides  field name -> value as text, e.g. {'food_energy': '300'}
+    # @return default parameters with those fields converted to their declared type
+    #
+    @classmethod
+    def from_overrides(cls, overrides: Dict[str, str]) -> 'SimParams':
+        defaults = cls()
+        changes = {}
+        for name, text in overrides.items():
+            if name not in defaults.as_dict():
+                raise ValueError(f'unknown parameter {name!r}')
+            current = getattr(defaults, name)
+            try:
+                changes[name] = int(text) if current is None or isinstance(current, int) else float(text)
+            except ValueError:
+                kind = 'a whole number' if current is None or isinstance(current, int) else 'a number'
+                raise ValueError(f'{name} must be {kind}, got {text!r}') from None
+        return defaults.replace(**changes)
+
+
+# describe_range(name)
+#
+# @param name  a SimParams field listed in PARAM_RANGES
+# @return the allowed values in words, e.g. 'between 0.0 and 1.0'
+#
+def describe_range(name: str) -> str:
+    low, high, low_allowed = PARAM_RANGES[name]
+    if high is not None:
+        return f'between {low} and {high}'
+    return f'at least {low}' if low_allowed else f'greater than {low}'
+
+
+# parameters of every simulation that is not given its own
+DEFAULT_PARAMS = SimParams()
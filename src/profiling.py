@@ -0,0 +1,172 @@
+import csv
+import json
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+# trace events kept per run; later events are dropped (and counted) so long runs stay bounded
+TRACE_EVENT_LIMIT = 500_000
+# phases in the order tables list them
+PHASE_ORDER = (
+    'begin_day', 'events', 'move', 'steer', 'edges', 'collide', 'sweep', 'fast_forward',
+    'end_day', 'draw', 'display', 'clock',
+)
+PHASE_COLUMNS = ['day', 'phase', 'calls', 'total_ms', 'mean_us']
+
+
+# PhaseTotal
+#
+# Accumulated time and call count of one phase.
+class PhaseTotal(NamedTuple):
+    ns: int
+    calls: int
+
+    @property
+    def mean_ns(self) -> float:
+        return self.ns / self.calls if self.calls else 0.0
+
+
+# PhaseProfiler
+#
+# Accumulates perf_counter_ns totals and call counts per phase of the day
+# loop, one table per day. Simulation only times anything while a profiler
+# is attached (Simulation.enable_profiling), and checks for one once per
+# tick, so an unprofiled run executes exactly the loop it always did.
+#
+# Per-creature phases (move, steer, edges, collide) are summed over the
+# creatures of a tick; with trace=True every tick and every frame-level
+# phase (events, draw, display, clock) also becomes a Chrome trace event,
+# and each tick event carries its per-phase split in its args.
+class PhaseProfiler:
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.day: Optional[int] = None
+        self._current: Dict[str, List[int]] = {}
+        self._days: Dict[int, Dict[str, List[int]]] = {}
+        self._events: List[Dict] = []
+        self.dropped_events = 0
+        self._origin = time.perf_counter_ns()
+
+    # PhaseProfiler.start_day(day)
+    #
+    # @param day  the day now running; its table starts empty
+    # @return None
+    #
+    def start_day(self, day: int) -> None:
+        self.day = int(day)
+        self._current = self._days.setdefault(self.day, {})
+
+    # PhaseProfiler.add(phase, ns, calls)
+    #
+    # @param phase  phase name, see PHASE_ORDER
+    # @param ns  nanoseconds spent
+    # @param calls  how many calls the time covers
+    # @return None
+    #
+    def add(self, phase: str, ns: int, calls: int = 1) -> None:
+        entry = self._current.get(phase)
+        if entry is None:
+            self._current[phase] = [ns, calls]
+        else:
+            entry[0] += ns
+            entry[1] += calls
+
+    # PhaseProfiler.span(phase, start)
+    #
+    # Adds the time since start to a phase and, when tracing, records it as
+    # one trace event.
+    #
+    # @param start  perf_counter_ns() when the phase began
+    # @return perf_counter_ns() now, the start of whatever follows
+    #
+    def span(self, phase: str, start: int) -> int:
+        now = time.perf_counter_ns()
+        self.add(phase, now - start)
+        if self.trace:
+            self.event(phase, start, now)
+        return now
+
+    # PhaseProfiler.event(name, start, stop, args)
+    #
+    # @param start  perf_counter_ns() at the start of the event
+    # @param stop  perf_counter_ns() at its end
+    # @param args  extra values shown with the event
+    # @return None
+    #
+    def event(self, name: str, start: int, stop: int, args: Optional[Dict] = None) -> None:
+        if len(self._events) >= TRACE_EVENT_LIMIT:
+            self.dropped_events += 1
+            return
+        event = {
+            'name': name,
+            'ph': 'X',
+            'ts': (start - self._origin) / 1000.0,
+            'dur': (stop - start) / 1000.0,
+            'pid': 1,
+            'tid': 1,
+        }
+        if self.day is not None:
+            event['args'] = {'day': self.day}
+        if args:
+            event.setdefault('args', {}).update(args)
+        self._events.append(event)
+
+    @property
+    def days(self) -> List[int]:
+        return sorted(self._days)
+
+    # PhaseProfiler.day_totals(day)
+    #
+    # @param day  a profiled day; None for the whole run
+    # @return phase -> PhaseTotal
+    #
+    def day_totals(self, day: Optional[int] = None) -> Dict[str, PhaseTotal]:
+        if day is not None:
+            return {phase: PhaseTotal(*entry) for phase, entry in self._days.get(day, {}).items()}
+        totals: Dict[str, List[int]] = {}
+        for table in self._days.values():
+            for phase, (ns, calls) in table.items():
+                entry = totals.setdefault(phase, [0, 0])
+                entry[0] += ns
+                entry[1] += calls
+        return {phase: PhaseTotal(*entry) for phase, entry in totals.items()}
+
+    # PhaseProfiler.write_csv(path)
+    #
+    # Writes one row per (day, phase), phases in PHASE_ORDER.
+    #
+    # @return None
+    #
+    def write_csv(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(PHASE_COLUMNS)
+            for day in self.days:
+                for phase, total in sorted_phases(self.day_totals(day)):
+                    w.writerow([day, phase, total.calls, round(total.ns / 1e6, 3), round(total.mean_ns / 1e3, 3)])
+
+    # PhaseProfiler.write_trace(path)
+    #
+    # Writes the recorded events in Chrome's trace-event JSON format, for
+    # chrome://tracing or Perfetto.
+    #
+    # @return None
+    #
+    def write_trace(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        document = {'traceEvents': self._events, 'displayTimeUnit': 'ms'}
+        if self.dropped_events:
+            document['otherData'] = {'dropped_events': self.dropped_events}
+        with open(path, 'w') as f:
+            json.dump(document, f)
+
+
+# sorted_phases(totals)
+#
+# @param totals  phase -> PhaseTotal
+# @return (phase, total) pairs in PHASE_ORDER, unknown phases last
+#
+def sorted_phases(totals: Dict[str, PhaseTotal]) -> List:
+    rank = {phase: i for i, phase in enumerate(PHASE_ORDER)}
+    return sorted(totals.items(), key=lambda item: (rank.get(item[0], len(rank)), item[0]))
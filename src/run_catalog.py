@@ -0,0 +1,301 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# most day rows the writer thread puts into one transaction
+CATALOG_BATCH_DAYS = 256
+# environment variable that moves the default catalog, e.g. into a batch run's output directory
+CATALOG_PATH_ENV = 'ECOSIM_RUN_CATALOG'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sim_type TEXT NOT NULL,
+    seed TEXT NOT NULL,
+    food_scaling INTEGER NOT NULL,
+    fixed_food INTEGER,
+    max_energy REAL,
+    params TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    days INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS runs_by_food ON runs (fixed_food, run_id);
+CREATE INDEX IF NOT EXISTS runs_by_type ON runs (sim_type, run_id);
+CREATE TABLE IF NOT EXISTS days (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    day INTEGER NOT NULL,
+    start_creatures INTEGER NOT NULL,
+    food_spawned INTEGER NOT NULL,
+    survivors INTEGER NOT NULL,
+    died INTEGER NOT NULL,
+    end_creatures INTEGER NOT NULL,
+    PRIMARY KEY (run_id, day)
+) WITHOUT ROWID;
+'''
+
+RUN_COLUMNS = 'run_id, sim_type, seed, food_scaling, fixed_food, max_energy, params, started_at, finished_at, days'
+
+
+# RunRecord
+#
+# One row of the runs table.
+class RunRecord(NamedTuple):
+    run_id: int
+    sim_type: str
+    seed: int
+    food_scaling: bool
+    fixed_food: Optional[int]
+    max_energy: Optional[float]
+    params: dict
+    started_at: float
+    finished_at: Optional[float]
+    days: int
+
+
+# RunCatalog
+#
+# Append-only SQLite catalog of simulation runs. Each run gets one row with
+# its simulation type, seed and parameters; its days live in a table keyed
+# by (run_id, day). record_day() only queues the row: a background writer
+# thread, started with the first day, writes everything queued since its
+# last pass in one transaction, so a simulation never waits on SQLite.
+# flush() marks a run boundary and waits for the queue to drain. Nothing
+# already written is ever rewritten: recording a (run_id, day) twice makes
+# the next flush() raise. WAL mode lets sweep workers in other
+# processes append to the same file concurrently.
+class RunCatalog:
+    # RunCatalog.__init__(path)
+    #
+    # @param path  SQLite database file; created with the schema when missing
+    # @return None
+    #
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        # serialises use of the connection between callers and the writer thread
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+
+    # RunCatalog.start_run(sim_type, seed, params)
+    #
+    # @param sim_type  simulation name, e.g. 'BasicSimulation'
+    # @param seed  the run's random seed
+    # @param params  run parameters; food_scaling, fixed_food and max_energy also get their own columns
+    # @return the new run's id
+    #
+    def start_run(self, sim_type: str, seed: int, params: Dict) -> int:
+        food_scaling = bool(params.get('food_scaling', True))
+        fixed_food = None if food_scaling else params.get('fixed_food')
+        max_energy = params.get('max_energy')
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO runs (sim_type, seed, food_scaling, fixed_food, max_energy, params, started_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (sim_type, str(seed), int(food_scaling), fixed_food, max_energy, json.dumps(params, sort_keys=True), time.time()),
+            )
+            return int(cursor.lastrowid)
+
+    # RunCatalog.record_day(run_id, day, start_creatures, food_spawned, survivors, died, end_creatures)
+    #
+    # @return None
+    #
+    def record_day(self, run_id: int, day: int, start_creatures: int, food_spawned: int, survivors: int, died: int, end_creatures: int) -> None:
+        self._start_writer()
+        self._queue.put((run_id, day, start_creatures, food_spawned, survivors, died, end_creatures))
+
+    # RunCatalog.flush()
+    #
+    # Waits until every day row queued so far is written.
+    #
+    # @return None
+    #
+    def flush(self) -> None:
+        if self._writer is not None:
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f'writing day rows to {self.path} failed') from error
+
+    # RunCatalog.finish_run(run_id)
+    #
+    # @param run_id  the run that ended
+    # @return None
+    #
+    def finish_run(self, run_id: int) -> None:
+        self.flush()
+        with self._lock, self._conn:
+            self._conn.execute('UPDATE runs SET finished_at = ? WHERE run_id = ?', (time.time(), run_id))
+
+    # RunCatalog.last_runs(count, sim_type)
+    #
+    # @param count  number of runs to return
+    # @param sim_type  only runs of this simulation type, or every type
+    # @return the most recent runs, newest first
+    #
+    def last_runs(self, count: int, sim_type: Optional[str] = None) -> List[RunRecord]:
+        if sim_type is None:
+            query = f'SELECT {RUN_COLUMNS} FROM runs ORDER BY run_id DESC LIMIT ?'
+            args: tuple = (count,)
+        else:
+            query = f'SELECT {RUN_COLUMNS} FROM runs WHERE sim_type = ? ORDER BY run_id DESC LIMIT ?'
+            args = (sim_type, count)
+        return [self._record(r) for r in self._query(query, args)]
+
+    # RunCatalog.runs_with_food(food, sim_type)
+    #
+    # @param food  fixed food per day
+    # @param sim_type  only runs of this simulation type, or every type
+    # @return every run with that fixed food count, oldest first
+    #
+    def runs_with_food(self, food: int, sim_type: Optional[str] = None) -> List[RunRecord]:
+        query = f'SELECT {RUN_COLUMNS} FROM runs WHERE fixed_food = ?'
+        args: tuple = (int(food),)
+        if sim_type is not None:
+            query += ' AND sim_type = ?'
+            args += (sim_type,)
+        return [self._record(r) for r in self._query(query + ' ORDER BY run_id', args)]
+
+    # RunCatalog.day_rows(run_id)
+    #
+    # @param run_id  the run to read
+    # @return (day, start_creatures, food_spawned, survivors, died, end_creatures) rows in day order
+    #
+    def day_rows(self, run_id: int) -> List[Tuple[int, int, int, int, int, int]]:
+        self.flush()
+        return [tuple(r) for r in self._query(
+            'SELECT day, start_creatures, food_spawned, survivors, died, end_creatures FROM days WHERE run_id = ? ORDER BY day',
+            (run_id,),
+        )]
+
+    # RunCatalog.close()
+    #
+    # @return None
+    #
+    def close(self) -> None:
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+        self._conn.close()
+
+    def _start_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name=f'run-catalog:{os.path.basename(self.path)}', daemon=True)
+                self._writer.start()
+
+    def _run_writer(self) -> None:
+        while True:
+            item = self._queue.get()
+            rows: List[Tuple[int, int, int, int, int, int, int]] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            # drain whatever else is already queued so it lands in the same transaction
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+                if len(rows) >= CATALOG_BATCH_DAYS:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if rows:
+                try:
+                    self._write_days(rows)
+                except Exception as error:  # reported by the next flush()
+                    self._error = error
+            for event in waiters:
+                event.set()
+            if stop:
+                return
+
+    def _write_days(self, rows) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany('INSERT INTO days VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            self._conn.executemany(
+                'UPDATE runs SET days = MAX(days, ?) WHERE run_id = ?',
+                [(day, run_id) for run_id, day in self._last_days(rows).items()],
+            )
+
+    def _query(self, query: str, args: tuple) -> list:
+        with self._lock:
+            return self._conn.execute(query, args).fetchall()
+
+    @staticmethod
+    def _last_days(rows) -> Dict[int, int]:
+        last: Dict[int, int] = {}
+        for run_id, day, *_rest in rows:
+            last[run_id] = max(day, last.get(run_id, 0))
+        return last
+
+    @staticmethod
+    def _record(row) -> RunRecord:
+        run_id, sim_type, seed, food_scaling, fixed_food, max_energy, params, started_at, finished_at, days = row
+        return RunRecord(run_id, sim_type, int(seed), bool(food_scaling), fixed_food, max_energy, json.loads(params), started_at, finished_at, days)
+
+
+_catalogs: Dict[str, RunCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+# default_catalog_path()
+#
+# @return the CATALOG_PATH_ENV file if set (inherited by sweep workers), else log/runs.sqlite under the working directory
+#
+def default_catalog_path() -> str:
+    return os.environ.get(CATALOG_PATH_ENV) or os.path.join(os.getcwd(), 'log', 'runs.sqlite')
+
+
+# get_run_catalog(path)
+#
+# @param path  database file, defaults to default_catalog_path()
+# @return the process-wide catalog for path, opened on first use
+#
+def get_run_catalog(path: Optional[str] = None) -> RunCatalog:
+    key = os.path.abspath(path or default_catalog_path())
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = RunCatalog(key)
+            _catalogs[key] = catalog
+        return catalog
+
+
+# close_run_catalogs()
+#
+# Flushes and closes every open catalog; registered to run at interpreter exit.
+#
+# @return None
+#
+def close_run_catalogs() -> None:
+    with _catalogs_lock:
+        catalogs = list(_catalogs.values())
+        _catalogs.clear()
+    for catalog in catalogs:
+        catalog.close()
+
+
+atexit.register(close_run_catalogs)
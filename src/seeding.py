@@ -0,0 +1,38 @@
+import secrets
+from typing import List
+
+import numpy as np
+
+
+# make_seed()
+#
+# @return a fresh random 64-bit seed for a run that was not given one
+#
+def make_seed() -> int:
+    return secrets.randbits(64)
+
+
+# derive_seed(root_seed, *key)
+#
+# Derives an independent child seed from a root seed and an integer key
+# (for example a sweep value and replicate number). The same root and key
+# always give the same seed, whatever order runs are scheduled in, and
+# distinct keys give statistically independent streams.
+#
+# @param root_seed  seed of the whole experiment
+# @param key  non-negative integers identifying the child run
+# @return the child's 64-bit seed
+#
+def derive_seed(root_seed: int, *key: int) -> int:
+    sequence = np.random.SeedSequence(int(root_seed), spawn_key=tuple(int(k) for k in key))
+    return int(sequence.generate_state(1, dtype=np.uint64)[0])
+
+
+# spawn_seeds(root_seed, count)
+#
+# @param root_seed  seed of the whole experiment
+# @param count  number of child seeds
+# @return count independent child seeds, one per parallel replicate
+#
+def spawn_seeds(root_seed: int, count: int) -> List[int]:
+    return [derive_seed(root_seed, i) for i in range(count)]
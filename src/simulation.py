@@ -1,24 +1,76 @@
-from typing import Tuple, List, Optional
-import os
-import csv
+from typing import Dict, Tuple, List, Optional
+import random
+import time
 import pygame
 
-from constants import WORLD_WIDTH, WORLD_HEIGHT, BACKGROUND_COLOR, EDGE_COLOR, TICKS_PER_SECOND
+from spatial import FoodGrid
+from seeding import make_seed
+from run_catalog import RunCatalog, get_run_catalog
+from sprites import SpriteLayer
+from params import SimParams, DEFAULT_PARAMS
+from profiling import PhaseProfiler
+from hud import PerfHud, HUD_KEY
+from constants import WORLD_WIDTH, WORLD_HEIGHT, BACKGROUND_COLOR, EDGE_COLOR, TICKS_PER_SECOND, UNCAPPED_FRAMES_PER_SECOND
 
+# creatures listed in a verbose day summary
+VERBOSE_CREATURE_LIMIT = 10
+# seconds between ticks-per-second updates in the window title
+THROUGHPUT_WINDOW = 0.5
+# key that switches to uncapped speed: as many ticks as fit into each frame
+UNCAPPED_KEY = pygame.K_9
+# key that cycles render_day_interval through RENDER_DAY_INTERVALS
+RENDER_INTERVAL_KEY = pygame.K_0
+RENDER_DAY_INTERVALS = (1, 10, 100)
+
+# number keys mapped to simulation steps per rendered frame
+SPEED_KEYS = {
+    pygame.K_1: 1,
+    pygame.K_2: 2,
+    pygame.K_3: 4,
+    pygame.K_4: 8,
+    pygame.K_5: 16,
+    pygame.K_6: 32,
+    pygame.K_7: 64,
+    pygame.K_8: 128,
+}
 
 class Simulation:
-    # Simulation.__init__(width, height)
+    # whether fast_forward_creature() can finish a fed creature's day; set by
+    # simulations whose food-less movement is a plain random walk
+    supports_fast_forward = False
+
+    # Simulation.__init__(width, height, seed, params)
     # 
     # @param width  the world width in pixels
     # @param height  the world height in pixels
+    # @param seed  seed for this simulation's random stream; None picks a fresh one
+    # @param params  behaviour parameters of this world; None uses the constants.py defaults
     # @return None
     # 
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, seed: Optional[int] = None, params: Optional[SimParams] = None):
         self.width = width
         self.height = height
+        # every tunable of this world; creatures hold the same object
+        self.params: SimParams = DEFAULT_PARAMS if params is None else params
+        # every random draw of this run comes from its own generator, so a
+        # recorded seed replays the run exactly and parallel runs never share state
+        self.seed: int = make_seed() if seed is None else int(seed)
+        self.rng = random.Random(self.seed)
         self.day: int = 0
-        # speed controller (steps per frame)
+        # speed controller (steps per frame), or uncapped: ticks until the frame's time runs out
         self.speed_steps: int = 1
+        self.uncapped = False
+        # draw every Nth day only (RENDER_INTERVAL_KEY); the days in between run
+        # on the same loop without drawing
+        self.render_day_interval = 1
+        # batched sprite drawing with changed-area tracking
+        self.sprite_layer = SpriteLayer(width, height)
+        # measured simulation throughput, shown in the window title
+        self.ticks_per_second = 0.0
+        self._meter_start = 0.0
+        self._meter_ticks = 0
+        # performance overlay, toggled with HUD_KEY
+        self.hud = PerfHud()
         # common simulation state
         self.creatures: List = []
         self.foods: List = []
@@ -27,17 +79,37 @@ class Simulation:
         self.food_scaling = True
         self.fixed_food_count = None
         self.manual_stop = False
+        self._day_start_creatures = 0
+        self._active: List = []
+        self._active_uneaten = 0
+        # creatures the last step_tick moved
+        self.ticked_creatures = 0
         # verbose logging flag (menu-controlled)
         self.verbose = False
+        # headless runs resolve the food-less end of a day analytically (see supports_fast_forward)
+        self.fast_forward = True
+        # per-phase timing, off unless enable_profiling() attached a profiler
+        self.profiler: Optional[PhaseProfiler] = None
+
+        # run catalog, opened when the run is registered (its first logged day) so
+        # that building a simulation touches no files; assign catalog to use another
+        self._catalog: Optional[RunCatalog] = None
+        self.run_id: Optional[int] = None
 
-        # prepare logging
-        self.log_dir = os.path.join(os.getcwd(), 'log')
-        os.makedirs(self.log_dir, exist_ok=True)
-        self.csv_path = os.path.join(self.log_dir, 'day_stats.csv')
-        if not os.path.exists(self.csv_path):
-            with open(self.csv_path, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['day', 'start_creatures', 'food_spawned', 'survivors', 'died', 'end_creatures'])
+    # Simulation.catalog
+    #
+    # @return the run catalog this simulation records to, by default
+    #         get_run_catalog() (log/runs.sqlite or CATALOG_PATH_ENV)
+    #
+    @property
+    def catalog(self) -> RunCatalog:
+        if self._catalog is None:
+            self._catalog = get_run_catalog()
+        return self._catalog
+
+    @catalog.setter
+    def catalog(self, catalog: RunCatalog) -> None:
+        self._catalog = catalog
 
     # Simulation.spawn_food_for_day(start_creature_count)
     # 
@@ -47,6 +119,14 @@ class Simulation:
     def spawn_food_for_day(self, start_creature_count: int) -> None:
         raise NotImplementedError
 
+    # Simulation.food_count_for_day(start_creature_count)
+    # 
+    # @param start_creature_count  number of creatures alive at day start
+    # @return number of food items to spawn today
+    # 
+    def food_count_for_day(self, start_creature_count: int) -> int:
+        raise NotImplementedError
+
     # Simulation.reproduce_survivors()
     # 
     # @return None
@@ -57,7 +137,7 @@ class Simulation:
     # Simulation.handle_creature_collision(creature, food_index)
     # 
     # @param creature  the creature that collided
-    # @param food_index  index of the food that was eaten
+    # @param food_index  spawn-order index of the food that was eaten
     # @return None
     # 
     def handle_creature_collision(self, creature, food_index: int) -> None:
@@ -71,121 +151,195 @@ class Simulation:
     # @return None
     #
     def move_creature(self, creature) -> None:
-        creature.move()
+        creature.move(self.rng)
 
-    # Simulation.simulate_day(screen, clock)
-    # 
-    # @param screen  the pygame screen surface for drawing
-    # @param clock  the pygame clock for frame timing
-    # @return (start_creatures, food_spawned, survivors, died)
-    # 
-    def simulate_day(self, screen: pygame.Surface, clock: pygame.time.Clock) -> Tuple[int, int, int, int]:
+    # Simulation.move_creature_profiled(creature, profiler)
+    #
+    # move_creature() for profiled ticks. Subclasses whose movement has
+    # separate stages (e.g. steering) override it to time each stage.
+    #
+    # @param creature  the creature to move for one step
+    # @param profiler  the attached PhaseProfiler
+    # @return None
+    #
+    def move_creature_profiled(self, creature, profiler: PhaseProfiler) -> None:
+        start = time.perf_counter_ns()
+        self.move_creature(creature)
+        profiler.add('move', time.perf_counter_ns() - start)
+
+    # Simulation.enable_profiling(trace)
+    #
+    # Attaches a PhaseProfiler; from the next tick on every phase of the day
+    # loop is timed into it.
+    #
+    # @param trace  also record Chrome trace events
+    # @return the profiler
+    #
+    def enable_profiling(self, trace: bool = False) -> PhaseProfiler:
+        self.profiler = PhaseProfiler(trace=trace)
+        return self.profiler
+
+    # Simulation.disable_profiling()
+    #
+    # @return the detached profiler, or None if none was attached
+    #
+    def disable_profiling(self) -> Optional[PhaseProfiler]:
+        profiler, self.profiler = self.profiler, None
+        return profiler
+
+    # Simulation.begin_day()
+    #
+    # Resets per-day creature state and spawns the day's food. Together with
+    # step_tick() and end_day() this forms the display-free day engine.
+    #
+    # @return number of creatures alive at day start
+    #
+    def begin_day(self) -> int:
         # reset daily flags
         for c in self.creatures:
             c.energy = self.get_creature_max_energy()
             c.has_eaten = 0
             c.is_survivor = False
 
-        start_creatures = len(self.creatures)
-        if start_creatures == 0:
-            return 0, 0, 0, 0
+        self.manual_stop = False
+        # the screen showed menus or graphs since the last frame
+        self.sprite_layer.reset()
+        self._day_start_creatures = len(self.creatures)
+        # creatures still moving today, in list order, and how many of them have not eaten
+        self._active = [c for c in self.creatures if c.energy > 0]
+        self._active_uneaten = len(self._active)
+        if self._day_start_creatures > 0:
+            self.spawn_food_for_day(self._day_start_creatures)
+            # index the day's food for collision queries; iteration keeps spawn order
+            self.foods = FoodGrid(self.foods, cell_size=self.get_food_grid_cell_size())
+        return self._day_start_creatures
 
-        self.spawn_food_for_day(start_creatures)
+    # Simulation.step_tick(fast_forward)
+    #
+    # Advances every unfinished creature by one tick: movement, edge handling
+    # and food collision, followed by the no-food death sweep. Only the
+    # active list is visited, and creatures leave it for good once they reach
+    # an edge or die, so late-day ticks cost as much as the creatures still
+    # moving and the end-of-day test is a length check.
+    #
+    # The profiler is checked once per tick: with one attached the tick runs
+    # _step_tick_timed() instead, so the loop below carries no timing code.
+    #
+    # @param fast_forward  once no food is left, finish the day for every
+    #        creature in one go instead of ticking (headless runs only)
+    # @return True once every living creature has reached an edge or died
+    #
+    def step_tick(self, fast_forward: bool = False) -> bool:
+        if self.profiler is not None:
+            return self._step_tick_timed(fast_forward, self.profiler)
+        self.ticked_creatures = len(self._active)
+        still_active = []
+        for creature in self._active:
+            was_uneaten = creature.has_eaten == 0
+            self.move_creature(creature)
+            creature.handle_edges(self.width, self.height, self.rng)
+            # allow creatures to eat multiple foods per day: do not gate
+            # collisions on has_eaten. Only require the creature to be alive.
+            if creature.energy > 0:
+                reach = float(self.get_creature_radius_for(creature)) + self.get_food_radius()
+                collided = self.foods.first_within(creature.position, reach, self.distance)
+                if collided is not None:
+                    food_index, food = collided
+                    self.foods.remove(food)
+                    self.handle_creature_collision(creature, food_index)
+            finished = creature.is_survivor or creature.energy <= 0
+            if was_uneaten and (finished or creature.has_eaten > 0):
+                self._active_uneaten -= 1
+            if not finished:
+                still_active.append(creature)
+        self._active = still_active
+        self._sweep_tick(fast_forward)
+        return not self._active
 
-        running_day = True
-        self.manual_stop = False
-        while running_day:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    raise SystemExit(0)
-                if event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_PLUS, pygame.K_EQUALS):
-                        # allow doubling up to 128x
-                        self.speed_steps = min(128, self.speed_steps * 2)
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
-                    elif event.key in (pygame.K_MINUS, pygame.K_UNDERSCORE):
-                        self.speed_steps = max(1, max(1, self.speed_steps // 2))
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
-                    elif event.key == pygame.K_BACKSLASH:
-                        # manual stop: end the day immediately and proceed to charts
-                        self.manual_stop = True
-                        running_day = False
-                        break
-                    elif event.key == pygame.K_1:
-                        self.speed_steps = 1
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
-                    elif event.key == pygame.K_2:
-                        self.speed_steps = 2
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
-                    elif event.key == pygame.K_3:
-                        self.speed_steps = 4
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
-                    elif event.key == pygame.K_4:
-                        self.speed_steps = 8
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
-                    elif event.key == pygame.K_5:
-                        self.speed_steps = 16
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
-                    elif event.key == pygame.K_6:
-                        self.speed_steps = 32
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
-                    elif event.key == pygame.K_7:
-                        self.speed_steps = 64
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
-                    elif event.key == pygame.K_8:
-                        self.speed_steps = 128
-                        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} (x{self.speed_steps})')
+    # Simulation._step_tick_timed(fast_forward, profiler)
+    #
+    # step_tick()'s creature loop with the edge and collision phases timed,
+    # followed by the same sweep, timed as a whole.
+    #
+    # @return True once every living creature has reached an edge or died
+    #
+    def _step_tick_timed(self, fast_forward: bool, profiler: PhaseProfiler) -> bool:
+        clock = time.perf_counter_ns
+        tick_start = clock()
+        edges_ns = collide_ns = 0
+        self.ticked_creatures = moved = len(self._active)
+        still_active = []
+        for creature in self._active:
+            was_uneaten = creature.has_eaten == 0
+            self.move_creature_profiled(creature, profiler)
+            t0 = clock()
+            creature.handle_edges(self.width, self.height, self.rng)
+            t1 = clock()
+            if creature.energy > 0:
+                reach = float(self.get_creature_radius_for(creature)) + self.get_food_radius()
+                collided = self.foods.first_within(creature.position, reach, self.distance)
+                if collided is not None:
+                    food_index, food = collided
+                    self.foods.remove(food)
+                    self.handle_creature_collision(creature, food_index)
+            edges_ns += t1 - t0
+            collide_ns += clock() - t1
+            finished = creature.is_survivor or creature.energy <= 0
+            if was_uneaten and (finished or creature.has_eaten > 0):
+                self._active_uneaten -= 1
+            if not finished:
+                still_active.append(creature)
+        self._active = still_active
+        profiler.add('edges', edges_ns, moved)
+        profiler.add('collide', collide_ns, moved)
 
-            for _ in range(self.speed_steps):
-                # Cceate a copy to iterate over to avoid issues with list modification
-                creatures_to_process = self.creatures.copy()
-                for creature in creatures_to_process:
-                    if creature.is_survivor:
-                        continue
-                    if creature.energy <= 0:
-                        continue
-                    self.move_creature(creature)
-                    creature.handle_edges(self.width, self.height)
-                    # allow creatures to eat multiple foods per day: do not gate
-                    # collisions on has_eaten. Only require the creature to be alive.
-                    if creature.energy > 0:
-                        collided_index: Optional[int] = None
-                        creature_radius = float(self.get_creature_radius_for(creature))
-                        for idx, food in enumerate(self.foods):
-                            if self.distance(creature.position, food.position) <= (creature_radius + self.get_food_radius()):
-                                collided_index = idx
-                                break
-                        if collided_index is not None:
-                            del self.foods[collided_index]
-                            self.handle_creature_collision(creature, collided_index)
-
-                # if no food remains, all uneaten creatures instantly die
-                if len(self.foods) == 0:
-                    for c in self.creatures:
-                        if c.has_eaten == 0 and not c.is_survivor and c.energy > 0:
-                            c.energy = 0
-
-                # check if day finished and only count living creatures (not dead bodies)
-                all_done = True
-                for c in self.creatures:
-                    if c.is_survivor:
-                        continue
-                    if c.energy > 0:  # Still alive
-                        all_done = False
-                        break
-                if all_done:
-                    running_day = False
-                    break
+        sweep_start = clock()
+        fast_forward_ns = self._sweep_tick(fast_forward, profiler)
+        tick_stop = clock()
+        profiler.add('sweep', tick_stop - sweep_start - fast_forward_ns)
+        if profiler.trace:
+            profiler.event('tick', tick_start, tick_stop, {'creatures': moved, 'edges_us': edges_ns / 1000.0, 'collide_us': collide_ns / 1000.0})
+        return not self._active
+
+    # Simulation._sweep_tick(fast_forward, profiler)
+    #
+    # End of a tick: once no food remains, every uneaten creature dies, and
+    # with fast_forward the rest finish their day at once.
+    #
+    # @param profiler  times the fast-forward phase when given
+    # @return ns spent fast-forwarding (0 when untimed)
+    #
+    def _sweep_tick(self, fast_forward: bool, profiler: Optional[PhaseProfiler] = None) -> int:
+        if len(self.foods) != 0:
+            return 0
+        if self._active_uneaten > 0:
+            for c in self._active:
+                if c.has_eaten == 0:
+                    c.energy = 0
+            self._active = [c for c in self._active if c.energy > 0]
+            self._active_uneaten = 0
+        fast_forward_ns = 0
+        if fast_forward and self.can_fast_forward():
+            if profiler is not None:
+                start = time.perf_counter_ns()
+            for c in self._active:
+                self.fast_forward_creature(c)
+            if profiler is not None:
+                fast_forward_ns = time.perf_counter_ns() - start
+                profiler.add('fast_forward', fast_forward_ns, len(self._active))
+            self._active = []
+        return fast_forward_ns
 
-            screen.fill(BACKGROUND_COLOR)
-            pygame.draw.rect(screen, EDGE_COLOR, pygame.Rect(0, 0, self.width, self.height), width=2)
-            for food in self.foods:
-                food.draw(screen)
-            for creature in self.creatures:
-                creature.draw(screen)
-            pygame.display.flip()
-            clock.tick(TICKS_PER_SECOND)
+    # Simulation.end_day()
+    #
+    # Counts the day's outcome and removes dead creatures before reproduction.
+    #
+    # @return (start_creatures, food_spawned, survivors, died)
+    #
+    def end_day(self) -> Tuple[int, int, int, int]:
+        start_creatures = self._day_start_creatures
+        if start_creatures == 0:
+            return 0, 0, 0, 0
 
         # count survivors and deaths (dead creatures still in list as bodies)
         survivors = sum(1 for c in self.creatures if c.is_survivor)
@@ -196,6 +350,230 @@ class Simulation:
 
         return start_creatures, self.food_spawned, survivors, died
 
+    # Simulation.run_day()
+    #
+    # Runs a whole day without a screen, clock or event pump.
+    #
+    # @return (start_creatures, food_spawned, survivors, died)
+    #
+    def run_day(self) -> Tuple[int, int, int, int]:
+        if self._timed_begin_day() > 0:
+            while not self.step_tick(self.fast_forward):
+                pass
+        return self._timed_end_day()
+
+    # Simulation._timed_begin_day() / Simulation._timed_end_day()
+    #
+    # begin_day() / end_day(), timed (subclass work included) when profiling.
+    #
+    def _timed_begin_day(self) -> int:
+        if self.profiler is None:
+            return self.begin_day()
+        self.profiler.start_day(self.day)
+        start = time.perf_counter_ns()
+        population = self.begin_day()
+        self.profiler.span('begin_day', start)
+        return population
+
+    def _timed_end_day(self) -> Tuple[int, int, int, int]:
+        if self.profiler is None:
+            return self.end_day()
+        start = time.perf_counter_ns()
+        result = self.end_day()
+        self.profiler.span('end_day', start)
+        return result
+
+    # Simulation.handle_event(event)
+    #
+    # Applies speed and manual-stop key bindings for the interactive renderer.
+    #
+    # @param event  a pygame event
+    # @return None
+    #
+    def handle_event(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            raise SystemExit(0)
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key in (pygame.K_PLUS, pygame.K_EQUALS):
+            # allow doubling up to 128x
+            self.speed_steps = min(128, self.speed_steps * 2)
+            self.uncapped = False
+        elif event.key in (pygame.K_MINUS, pygame.K_UNDERSCORE):
+            self.speed_steps = max(1, self.speed_steps // 2)
+            self.uncapped = False
+        elif event.key == pygame.K_BACKSLASH:
+            # manual stop: end the day immediately and proceed to charts
+            self.manual_stop = True
+            return
+        elif event.key in SPEED_KEYS:
+            self.speed_steps = SPEED_KEYS[event.key]
+            self.uncapped = False
+        elif event.key == UNCAPPED_KEY:
+            self.uncapped = True
+        elif event.key == RENDER_INTERVAL_KEY:
+            following = [n for n in RENDER_DAY_INTERVALS if n > self.render_day_interval]
+            self.render_day_interval = following[0] if following else RENDER_DAY_INTERVALS[0]
+        elif event.key == HUD_KEY:
+            self.hud.toggle()
+            # repaint the world where the panel was, or make room for it
+            self.sprite_layer.reset()
+            return
+        else:
+            return
+        self.update_caption()
+
+    # Simulation.update_caption()
+    #
+    # Shows the speed setting and, once measured, the achieved ticks per second.
+    #
+    # @return None
+    #
+    def update_caption(self) -> None:
+        speed = self.speed_label()
+        if self.ticks_per_second > 0:
+            speed += f', {self.ticks_per_second:,.0f} ticks/s'
+        pygame.display.set_caption(f'Ecosystem Simulator – {self.get_simulation_name()} ({speed})')
+
+    def speed_label(self) -> str:
+        label = 'uncapped' if self.uncapped else f'x{self.speed_steps}'
+        if self.render_day_interval > 1:
+            label += f', drawing every {self.render_day_interval}th day'
+        return label
+
+    # Simulation.renders_day()
+    #
+    # @return whether the current day is drawn under render_day_interval
+    #
+    def renders_day(self) -> bool:
+        interval = max(1, int(self.render_day_interval))
+        return interval == 1 or self.day % interval == 0
+
+    # Simulation.run_frame_ticks(uncapped)
+    #
+    # Runs one display frame's worth of ticks: speed_steps of them, or when
+    # uncapped as many as fit into 1 / UNCAPPED_FRAMES_PER_SECOND seconds.
+    #
+    # @param uncapped  fill the frame's time budget instead of running speed_steps ticks
+    # @return True once the day is over
+    #
+    def run_frame_ticks(self, uncapped: bool) -> bool:
+        if not uncapped:
+            for _ in range(self.speed_steps):
+                self._meter_ticks += 1
+                if self.step_tick():
+                    return True
+            return False
+        deadline = time.perf_counter() + 1.0 / UNCAPPED_FRAMES_PER_SECOND
+        while True:
+            self._meter_ticks += 1
+            if self.step_tick():
+                return True
+            if time.perf_counter() >= deadline:
+                return False
+
+    def _update_throughput(self) -> None:
+        now = time.perf_counter()
+        elapsed = now - self._meter_start
+        if elapsed < THROUGHPUT_WINDOW:
+            return
+        if self._meter_start > 0:
+            self.ticks_per_second = self._meter_ticks / elapsed
+            self.update_caption()
+            if self.hud.visible:
+                live = sum(1 for c in self.creatures if c.energy > 0)
+                self.hud.sample(elapsed, self.ticks_per_second, self.speed_label(), live, len(self._active), len(self.foods))
+        self._meter_start = now
+        self._meter_ticks = 0
+
+    # Simulation.draw(screen)
+    #
+    # Draws food and creatures with one blits() call. After the first frame
+    # of a day only the rectangles sprites left or entered are cleared.
+    #
+    # @param screen  the pygame surface to draw the world on
+    # @return changed rectangles for pygame.display.update(), or None if the whole screen should be flipped
+    #
+    def draw(self, screen: pygame.Surface) -> Optional[List[pygame.Rect]]:
+        blits = [food.sprite_blit() for food in self.foods]
+        blits.extend(creature.sprite_blit() for creature in self.creatures)
+        return self.sprite_layer.draw(screen, blits, BACKGROUND_COLOR, self.draw_edge)
+
+    def draw_edge(self, screen: pygame.Surface) -> None:
+        pygame.draw.rect(screen, EDGE_COLOR, pygame.Rect(0, 0, self.width, self.height), width=2)
+
+    # Simulation.simulate_day(screen, clock)
+    # 
+    # Interactive renderer on top of the headless day engine. Simulation and
+    # drawing run on separate cadences: each frame runs run_frame_ticks() and
+    # then draws, capped at TICKS_PER_SECOND frames (UNCAPPED_FRAMES_PER_SECOND
+    # when uncapped). Days skipped by render_day_interval are not drawn and
+    # run uncapped, still handling key presses between time slices; changing
+    # the interval takes effect within the day.
+    # 
+    # @param screen  the pygame screen surface for drawing
+    # @param clock  the pygame clock for frame timing
+    # @return (start_creatures, food_spawned, survivors, died)
+    # 
+    def simulate_day(self, screen: pygame.Surface, clock: pygame.time.Clock) -> Tuple[int, int, int, int]:
+        if self._timed_begin_day() == 0:
+            return self._timed_end_day()
+
+        render = self.renders_day()
+        running_day = True
+        while running_day:
+            # frame-level phases are timed only while a profiler is attached
+            profiler = self.profiler
+            if profiler is not None:
+                mark = time.perf_counter_ns()
+            for event in pygame.event.get():
+                self.handle_event(event)
+                if self.manual_stop:
+                    running_day = False
+                    break
+            if profiler is not None:
+                profiler.span('events', mark)
+            if render != self.renders_day():
+                render = not render
+                # the screen is stale after undrawn frames
+                self.sprite_layer.reset()
+
+            # the overlay's sim/render split is measured only while it is shown
+            hud = self.hud if self.hud.visible else None
+            if running_day:
+                if hud is not None:
+                    sim_start = time.perf_counter_ns()
+                running_day = not self.run_frame_ticks(uncapped=self.uncapped or not render)
+                if hud is not None:
+                    hud.sim_ns += time.perf_counter_ns() - sim_start
+            self._update_throughput()
+
+            if render:
+                if profiler is not None or hud is not None:
+                    mark = render_start = time.perf_counter_ns()
+                dirty = self.draw(screen)
+                if hud is not None:
+                    panel = hud.draw(screen)
+                    if dirty is not None and panel is not None:
+                        dirty.append(panel)
+                if profiler is not None:
+                    mark = profiler.span('draw', mark)
+                if dirty is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty)
+                if hud is not None:
+                    hud.render_ns += time.perf_counter_ns() - render_start
+                    hud.frames += 1
+                if profiler is not None:
+                    mark = profiler.span('display', mark)
+                clock.tick(UNCAPPED_FRAMES_PER_SECOND if self.uncapped else TICKS_PER_SECOND)
+                if profiler is not None:
+                    profiler.span('clock', mark)
+
+        return self._timed_end_day()
+
     # Simulation.log_day(sim_id, day, start_creatures, food_spawned, survivors, died)
     # 
     # @param sim_id  the simulation identifier (1-based)
@@ -208,24 +586,53 @@ class Simulation:
     # 
     def log_day(self, sim_id: int, day: int, start_creatures: int, food_spawned: int, survivors: int, died: int) -> None:
         end_creatures = survivors
-        with open(self.csv_path, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([day, start_creatures, food_spawned, survivors, died, end_creatures])
+        self.catalog.record_day(self.ensure_run(), day, start_creatures, food_spawned, survivors, died, end_creatures)
         # per-day summary only when verbose is enabled
         if getattr(self, 'verbose', False):
-            creature_summaries = []
-            for idx, c in enumerate(self.creatures, start=1):
-                creature_summaries.append(f"#{idx}: eaten={c.has_eaten} energy={c.energy} survivor={c.is_survivor}")
-            summary_lines = [f"Simulation {sim_id} | Day {day:03d} | start={start_creatures} food={food_spawned} survived={survivors} died={died} end={end_creatures}"]
-            if creature_summaries:
+            summary_lines = [f"Simulation {sim_id} (run {self.run_id}, seed {self.seed}) | Day {day:03d} | start={start_creatures} food={food_spawned} survived={survivors} died={died} end={end_creatures}"]
+            if self.creatures:
                 summary_lines.append("Creatures:")
-                # show up to first 10 creature summaries to avoid spamming
-                for line in creature_summaries[:10]:
-                    summary_lines.append(f"  {line}")
-                if len(creature_summaries) > 10:
-                    summary_lines.append(f"  ...(+{len(creature_summaries)-10} more)")
+                # format only the creatures that are printed
+                for idx, c in enumerate(self.creatures[:VERBOSE_CREATURE_LIMIT], start=1):
+                    summary_lines.append(f"  #{idx}: eaten={c.has_eaten} energy={c.energy} survivor={c.is_survivor}")
+                if len(self.creatures) > VERBOSE_CREATURE_LIMIT:
+                    summary_lines.append(f"  ...(+{len(self.creatures) - VERBOSE_CREATURE_LIMIT} more)")
             print("\n".join(summary_lines))
 
+    # Simulation.ensure_run()
+    #
+    # @return this run's catalog id, registering the run on first use
+    #
+    def ensure_run(self) -> int:
+        if self.run_id is None:
+            self.run_id = self.catalog.start_run(self.get_simulation_name(), self.seed, self.get_run_parameters())
+        return self.run_id
+
+    # Simulation.finish_log()
+    #
+    # Run boundary: writes the run's buffered days to the catalog and marks it finished.
+    #
+    # @return None
+    #
+    def finish_log(self) -> None:
+        if self.run_id is not None:
+            self._catalog.finish_run(self.run_id)
+
+    # Simulation.get_run_parameters()
+    #
+    # @return the parameters recorded with this run in the catalog
+    #
+    def get_run_parameters(self) -> Dict:
+        return {
+            'food_scaling': bool(self.food_scaling),
+            'fixed_food': self.fixed_food_count,
+            'max_energy': self.get_creature_max_energy(),
+            'width': self.width,
+            'height': self.height,
+            'params': self.params.as_dict(),
+            'params_digest': self.params.digest(),
+        }
+
     # abstract methods that subclasses must implement
     def get_simulation_name(self) -> str:
         raise NotImplementedError
@@ -236,6 +643,9 @@ class Simulation:
     def get_creature_radius(self) -> int:
         raise NotImplementedError
 
+    def get_offspring_count(self, has_eaten: int) -> int:
+        raise NotImplementedError
+
     def get_creature_radius_for(self, creature) -> float:
         # Default: constant radius from get_creature_radius(); subclasses can override for per-creature scaling
         try:
@@ -243,8 +653,23 @@ class Simulation:
         except Exception:
             return float(0)
 
+    # Simulation.can_fast_forward()
+    #
+    # @return True if fast_forward_creature() can finish a fed creature's day
+    #
+    def can_fast_forward(self) -> bool:
+        return self.supports_fast_forward
+
     def get_food_radius(self) -> int:
         raise NotImplementedError
 
+    # Simulation.get_food_grid_cell_size()
+    #
+    # @return the largest creature-food collision reach among today's creatures
+    #
+    def get_food_grid_cell_size(self) -> float:
+        max_radius = max((float(self.get_creature_radius_for(c)) for c in self.creatures), default=0.0)
+        return max_radius + self.get_food_radius()
+
     def distance(self, a: Tuple[float, float], b: Tuple[float, float]) -> float:
         raise NotImplementedError
\ No newline at end of file
@@ -0,0 +1,204 @@
+import math
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+# FoodGrid
+#
+# Uniform-grid spatial hash over the day's food. It iterates in spawn order
+# like the plain list it replaces, removes a food in O(1) and answers
+# collision queries by looking only at the cells a query circle overlaps.
+class FoodGrid:
+    # FoodGrid.__init__(foods, cell_size)
+    #
+    # @param foods  the food items to index, in spawn order
+    # @param cell_size  grid cell edge length; use the largest collision reach
+    # @return None
+    #
+    def __init__(self, foods: Iterable = (), cell_size: float = 1.0):
+        self.cell_size = max(1.0, float(cell_size))
+        self._next_seq = 0
+        # spawn order -> food (dicts keep insertion order)
+        self._ordered: Dict[int, object] = {}
+        # id(food) -> (spawn order, cell)
+        self._slots: Dict[int, Tuple[int, Tuple[int, int]]] = {}
+        # cell -> {spawn order: food}
+        self._cells: Dict[Tuple[int, int], Dict[int, object]] = {}
+        # bounding box of every cell that has held food, used to end ring searches
+        self._min_cell = [0, 0]
+        self._max_cell = [-1, -1]
+        for food in foods:
+            self.append(food)
+
+    def __len__(self) -> int:
+        return len(self._ordered)
+
+    def __bool__(self) -> bool:
+        return bool(self._ordered)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._ordered.values())
+
+    # FoodGrid.cell_of(x, y)
+    #
+    # @param x  world x coordinate
+    # @param y  world y coordinate
+    # @return the (column, row) cell containing the point
+    #
+    def cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    # FoodGrid.append(food)
+    #
+    # @param food  the food item to index; it sorts after every food already present
+    # @return None
+    #
+    def append(self, food) -> None:
+        seq = self._next_seq
+        self._next_seq += 1
+        cell = self.cell_of(food.position[0], food.position[1])
+        self._ordered[seq] = food
+        self._slots[id(food)] = (seq, cell)
+        self._cells.setdefault(cell, {})[seq] = food
+        if self._max_cell[0] < self._min_cell[0]:
+            self._min_cell = [cell[0], cell[1]]
+            self._max_cell = [cell[0], cell[1]]
+        else:
+            self._min_cell = [min(self._min_cell[0], cell[0]), min(self._min_cell[1], cell[1])]
+            self._max_cell = [max(self._max_cell[0], cell[0]), max(self._max_cell[1], cell[1])]
+
+    # FoodGrid.remove(food)
+    #
+    # @param food  the food item to drop from the index
+    # @return None
+    #
+    def remove(self, food) -> None:
+        seq, cell = self._slots.pop(id(food))
+        del self._ordered[seq]
+        bucket = self._cells[cell]
+        del bucket[seq]
+        if not bucket:
+            del self._cells[cell]
+
+    # FoodGrid.candidates(position, reach)
+    #
+    # @param position  query centre (x, y)
+    # @param reach  query radius
+    # @return iterator of (spawn order, food) for every food in the overlapped cells
+    #
+    def candidates(self, position: Tuple[float, float], reach: float) -> Iterator[Tuple[int, object]]:
+        # pad the box slightly so rounding never drops a food sitting exactly at the reach
+        pad = reach + 1e-9 * max(1.0, reach)
+        min_cx, min_cy = self.cell_of(position[0] - pad, position[1] - pad)
+        max_cx, max_cy = self.cell_of(position[0] + pad, position[1] + pad)
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket.items()
+
+    # FoodGrid.first_within(position, reach, distance)
+    #
+    # Matches a front-to-back scan of the spawn-ordered list: of all foods
+    # within reach, the one spawned earliest wins.
+    #
+    # @param position  query centre (x, y)
+    # @param reach  maximum distance (inclusive)
+    # @param distance  the distance function used by the simulation
+    # @return (spawn order, food) or None when nothing is within reach
+    #
+    def first_within(
+        self,
+        position: Tuple[float, float],
+        reach: float,
+        distance: Callable[[Tuple[float, float], Tuple[float, float]], float],
+    ) -> Optional[Tuple[int, object]]:
+        best: Optional[Tuple[int, object]] = None
+        for seq, food in self.candidates(position, reach):
+            if best is not None and seq > best[0]:
+                continue
+            if distance(position, food.position) <= reach:
+                best = (seq, food)
+        return best
+
+    # FoodGrid.nearest_within(position, max_distance, distance)
+    #
+    # Ring search outward from the query cell. Each ring is only visited while
+    # it could still hold something closer than the best match so far; once
+    # the search has touched more cells than there are foods left, the
+    # remaining foods are scanned directly instead. Ties go to the earliest
+    # spawned food, like a front-to-back scan with a strict comparison.
+    #
+    # @param position  query centre (x, y)
+    # @param max_distance  sensing range (inclusive)
+    # @param distance  the distance function used by the simulation
+    # @return (distance, food) for the nearest food in range, or None
+    #
+    def nearest_within(
+        self,
+        position: Tuple[float, float],
+        max_distance: float,
+        distance: Callable[[Tuple[float, float], Tuple[float, float]], float],
+    ) -> Optional[Tuple[float, object]]:
+        if not self._ordered:
+            return None
+        x, y = position
+        cs = self.cell_size
+        cx, cy = self.cell_of(x, y)
+        max_ring = max(
+            cx - self._min_cell[0], self._max_cell[0] - cx,
+            cy - self._min_cell[1], self._max_cell[1] - cy,
+            0,
+        )
+        best_dist = 0.0
+        best_seq = -1
+        best_food = None
+        visited = 0
+        cells = self._cells
+        for ring in range(max_ring + 1):
+            if ring > 0:
+                # nothing outside the rings visited so far can be closer than this
+                lower_bound = min(
+                    x - (cx - ring + 1) * cs, (cx + ring) * cs - x,
+                    y - (cy - ring + 1) * cs, (cy + ring) * cs - y,
+                )
+                if lower_bound > max_distance:
+                    break
+                if best_food is not None and best_dist < lower_bound:
+                    break
+            if visited > len(self._ordered):
+                return self._scan_nearest(position, max_distance, distance)
+            for cell in self._ring_cells(cx, cy, ring):
+                visited += 1
+                bucket = cells.get(cell)
+                if not bucket:
+                    continue
+                for seq, food in bucket.items():
+                    dist = distance(position, food.position)
+                    if dist > max_distance:
+                        continue
+                    if best_food is None or dist < best_dist or (dist == best_dist and seq < best_seq):
+                        best_dist, best_seq, best_food = dist, seq, food
+        if best_food is None:
+            return None
+        return best_dist, best_food
+
+    def _scan_nearest(self, position, max_distance, distance) -> Optional[Tuple[float, object]]:
+        best = None
+        for food in self._ordered.values():
+            dist = distance(position, food.position)
+            if dist <= max_distance and (best is None or dist < best[0]):
+                best = (dist, food)
+        return best
+
+    @staticmethod
+    def _ring_cells(cx: int, cy: int, ring: int) -> Iterator[Tuple[int, int]]:
+        if ring == 0:
+            yield cx, cy
+            return
+        for gx in range(cx - ring, cx + ring + 1):
+            yield gx, cy - ring
+            yield gx, cy + ring
+        for gy in range(cy - ring + 1, cy + ring):
+            yield cx - ring, gy
+            yield cx + ring, gy
@@ -0,0 +1,93 @@
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import pygame
+
+# redraw only the changed rectangles while they cover less than this share of the world
+DIRTY_AREA_LIMIT = 0.5
+
+
+# circle_sprite(radius, color)
+#
+# Pre-rendered filled circle, drawn once per (radius, colour) and reused by
+# every object of that look.
+#
+# @param radius  circle radius in whole pixels
+# @param color  RGB fill colour
+# @return a per-pixel-alpha surface of size 2 * radius + 1 with the circle centred
+#
+@lru_cache(maxsize=None)
+def circle_sprite(radius: int, color: Tuple[int, int, int]) -> pygame.Surface:
+    radius = max(0, int(radius))
+    size = 2 * radius + 1
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, color, (radius, radius), radius)
+    if pygame.display.get_surface() is not None:
+        # match the display's pixel format so blits skip the per-frame conversion
+        sprite = sprite.convert_alpha()
+    return sprite
+
+
+# circle_blit(position, radius, color)
+#
+# @param position  circle centre (x, y)
+# @param radius  circle radius in whole pixels
+# @param color  RGB fill colour
+# @return a (sprite, top-left) pair for Surface.blits()
+#
+def circle_blit(position: Tuple[float, float], radius: int, color: Tuple[int, int, int]) -> Tuple[pygame.Surface, Tuple[int, int]]:
+    return circle_sprite(radius, color), (int(position[0]) - radius, int(position[1]) - radius)
+
+
+# SpriteLayer
+#
+# Draws a world's sprites in one Surface.blits() call per frame and works out
+# which part of the window changed. When the old and new sprite rectangles
+# together cover less than DIRTY_AREA_LIMIT of the world, only those
+# rectangles are cleared and pushed to the display; otherwise the whole
+# world is redrawn and flipped.
+class SpriteLayer:
+    # SpriteLayer.__init__(width, height)
+    #
+    # @param width  the world width in pixels
+    # @param height  the world height in pixels
+    # @return None
+    #
+    def __init__(self, width: int, height: int):
+        self.world = pygame.Rect(0, 0, width, height)
+        self._previous: Optional[List[pygame.Rect]] = None
+
+    # SpriteLayer.reset()
+    #
+    # Forces a full redraw on the next frame, e.g. after something else drew on the screen.
+    #
+    # @return None
+    #
+    def reset(self) -> None:
+        self._previous = None
+
+    # SpriteLayer.draw(screen, blits, background, draw_backdrop)
+    #
+    # @param screen  the pygame surface to draw to
+    # @param blits  (sprite, top-left) pairs in draw order
+    # @param background  fill colour behind the sprites
+    # @param draw_backdrop  redraws static decoration over a cleared area, called after clearing
+    # @return changed rectangles to pass to pygame.display.update(), or None when the whole world changed
+    #
+    def draw(self, screen: pygame.Surface, blits: Sequence, background: Tuple[int, int, int], draw_backdrop) -> Optional[List[pygame.Rect]]:
+        previous = self._previous
+        if previous is None:
+            screen.fill(background)
+        else:
+            for rect in previous:
+                screen.fill(background, rect)
+        draw_backdrop(screen)
+        current = screen.blits(blits)
+        self._previous = current
+        if previous is None:
+            return None
+        dirty = previous + current
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area >= DIRTY_AREA_LIMIT * self.world.width * self.world.height:
+            return None
+        return dirty
@@ -0,0 +1,335 @@
+import csv
+import math
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from constants import WORLD_WIDTH, WORLD_HEIGHT, DATA_SIM_REPLICATES, DATA_SIM_MIN_REPLICATES, DATA_SIM_CI_WIDTH
+from seeding import make_seed, derive_seed
+from params import SimParams, DEFAULT_PARAMS
+from basic_simulation import BasicSimulation
+from greedy_simulation import GreedySimulation
+from array_engine import BatchArrayEngine
+
+# simulation classes available to research sweeps, keyed by short name
+SWEEP_SIMULATIONS = {'basic': BasicSimulation, 'greedy': GreedySimulation}
+# every sweep point is a fixed-length run
+SWEEP_DAYS = 50
+# columns after the swept parameter in the average-population CSVs
+SWEEP_COLUMNS = ['average_population', 'std', 'ci95_low', 'ci95_high', 'replicates']
+# worlds per batched task in the first wave of a batched sweep
+SWEEP_BATCH_WORLDS = 64
+
+
+# build_sweep_simulation(sim_type, parameter, value, fixed_food, verbose, seed, params)
+#
+# @return the simulation for one sweep run, with the swept value applied
+#
+def build_sweep_simulation(
+    sim_type: str,
+    parameter: str,
+    value: int,
+    fixed_food: int,
+    verbose: bool = False,
+    seed: Optional[int] = None,
+    params: Optional[SimParams] = None,
+):
+    params = DEFAULT_PARAMS if params is None else params
+    if parameter == 'energy':
+        params = params.replace(creature_max_energy=int(value))
+    sim = SWEEP_SIMULATIONS[sim_type](WORLD_WIDTH, WORLD_HEIGHT, seed=seed, params=params)
+    sim.food_scaling = False
+    sim.verbose = verbose
+    sim.fixed_food_count = int(value) if parameter == 'food' else int(fixed_food)
+    return sim
+
+
+# run_sweep_point(sim_type, parameter, value, fixed_food, sim_id, days, verbose, seed, params)
+#
+# Runs one headless research run. Module-level so worker processes can
+# unpickle it.
+#
+# @param sim_type  key into SWEEP_SIMULATIONS
+# @param parameter  'food' or 'energy', the quantity being swept
+# @param value  the food count or creature max energy for this point
+# @param fixed_food  food per day for energy sweeps
+# @param sim_id  simulation identifier used in the day log
+# @param days  number of days to run
+# @param verbose  print per-day summaries from the worker
+# @param seed  seed for the run's random stream
+# @param params  parameters of the run before the swept value is applied; None uses the defaults
+# @return (value, average population, day rows, sim_id)
+#
+def run_sweep_point(
+    sim_type: str,
+    parameter: str,
+    value: int,
+    fixed_food: int,
+    sim_id: int,
+    days: int = SWEEP_DAYS,
+    verbose: bool = False,
+    seed: Optional[int] = None,
+    params: Optional[SimParams] = None,
+) -> Tuple[int, float, List[Tuple[int, int, int, int, int, int]], int]:
+    sim = build_sweep_simulation(sim_type, parameter, value, fixed_food, verbose, seed, params)
+
+    day_rows = []
+    for day in range(1, days + 1):
+        sim.day = day
+        start_creatures, food_spawned, survivors, died = sim.run_day()
+        sim.log_day(sim_id, day, start_creatures, food_spawned, survivors, died)
+        day_rows.append((day, start_creatures, food_spawned, survivors, died, survivors))
+        sim.reproduce_survivors()
+    sim.finish_log()
+
+    avg_pop = sum(r[1] for r in day_rows) / len(day_rows) if day_rows else 0.0
+    return value, float(avg_pop), day_rows, sim_id
+
+
+# run_sweep_batch(sim_type, parameter, runs, fixed_food, days, verbose, params)
+#
+# Runs several sweep runs as the worlds of one BatchArrayEngine, so a task
+# of many small runs costs a few array operations per tick instead of a
+# Python loop per run. Module-level so worker processes can unpickle it.
+#
+# @param runs  (value, sim_id, seed) of each run; each world draws from its own seed
+# @return one (value, average population, day rows, sim_id) per run, as run_sweep_point
+#
+def run_sweep_batch(
+    sim_type: str,
+    parameter: str,
+    runs: Sequence[Tuple[int, int, int]],
+    fixed_food: int,
+    days: int = SWEEP_DAYS,
+    verbose: bool = False,
+    params: Optional[SimParams] = None,
+) -> List[Tuple[int, float, List[Tuple[int, int, int, int, int, int]], int]]:
+    sims = [build_sweep_simulation(sim_type, parameter, value, fixed_food, verbose, seed, params) for value, _sim_id, seed in runs]
+    engine = BatchArrayEngine(sims)
+    day_rows: List[list] = [[] for _ in runs]
+    for day in range(1, days + 1):
+        engine.day = day
+        for sim, (_value, sim_id, _seed), rows, result in zip(sims, runs, day_rows, engine.run_day()):
+            sim.day = day
+            start_creatures, food_spawned, survivors, died = result
+            sim.log_day(sim_id, day, start_creatures, food_spawned, survivors, died)
+            rows.append((day, start_creatures, food_spawned, survivors, died, survivors))
+        engine.reproduce_survivors()
+    for sim in sims:
+        sim.finish_log()
+    return [
+        (value, float(sum(r[1] for r in rows) / len(rows)) if rows else 0.0, rows, sim_id)
+        for (value, sim_id, _seed), rows in zip(runs, day_rows)
+    ]
+
+
+# 97.5th percentile of Student's t for 1..30 degrees of freedom
+T_975 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+# SweepPoint
+#
+# Aggregated replicate results for one food or energy level.
+class SweepPoint(NamedTuple):
+    value: int
+    mean: float
+    std: float
+    ci_low: float
+    ci_high: float
+    replicates: int
+
+
+# summarize_replicates(value, samples)
+#
+# @param value  the food count or energy of the point
+# @param samples  average population of each replicate run
+# @return SweepPoint with sample standard deviation and a 95% t confidence interval
+#
+def summarize_replicates(value: int, samples: Sequence[float]) -> SweepPoint:
+    n = len(samples)
+    mean = sum(samples) / n
+    if n < 2:
+        return SweepPoint(value, mean, 0.0, mean, mean, n)
+    std = math.sqrt(sum((x - mean) ** 2 for x in samples) / (n - 1))
+    t = T_975[n - 2] if n - 1 <= len(T_975) else 1.96
+    half = t * std / math.sqrt(n)
+    return SweepPoint(value, mean, std, mean - half, mean + half, n)
+
+
+# ensure_sweep_csv(csv_path, parameter)
+#
+# Creates the average-population CSV, or upgrades an older two-column file
+# in place so earlier single-run rows sit under the replicate header.
+#
+# @param csv_path  average-population CSV path
+# @param parameter  'food' or 'energy', the first column's name
+# @return None
+#
+def ensure_sweep_csv(csv_path: str, parameter: str) -> None:
+    header = [parameter] + SWEEP_COLUMNS
+    os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
+    if not os.path.exists(csv_path):
+        with open(csv_path, 'w', newline='') as f:
+            csv.writer(f).writerow(header)
+        return
+    with open(csv_path, 'r', newline='') as f:
+        rows = list(csv.reader(f))
+    if rows and rows[0][1:] == SWEEP_COLUMNS:
+        return
+    with open(csv_path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        for r in rows[1:]:
+            if len(r) >= 2:
+                # single-run rows: no spread information, one replicate
+                w.writerow([r[0], r[1], '', '', '', 1])
+
+
+# run_sweep(sim_type, parameter, values, fixed_food, csv_path, ...)
+#
+# Spreads replicate runs of every sweep point across a process pool and
+# appends one aggregated row per point to csv_path. Each point starts with
+# min_replicates runs; whenever one finishes and the point's 95% CI is still
+# wider than ci_width, another replicate is queued, up to replicates in total.
+# Compute therefore flows to the noisy points. With batch_worlds an
+# unsettled point instead gets a wave of as many replicates as it has so
+# far, and the waves of points whose runs finished together are packed into
+# batches of up to batch_worlds worlds. Rows are written in ascending value
+# order as soon as every smaller point is settled, so the CSV is always a
+# sorted prefix of the sweep.
+#
+# @param sim_type  key into SWEEP_SIMULATIONS
+# @param parameter  'food' or 'energy'
+# @param values  the food counts or energies to run
+# @param fixed_food  food per day for energy sweeps
+# @param csv_path  average-population CSV to append to
+# @param replicates  maximum replicate runs per point
+# @param min_replicates  replicate runs per point before early stopping is considered
+# @param ci_width  stop a point once its full 95% CI is at most this wide; None runs every replicate
+# @param first_sim_id  simulation id of the first submitted run; later runs count up
+# @param workers  process count, defaults to every core
+# @param verbose  print per-day summaries from the workers
+# @param on_run  called with (sim_id, value, day_rows) as each replicate finishes
+# @param on_point  called with the SweepPoint as each row is written
+# @param poll  called with (settled points, total points) roughly ten times a second
+# @param seed  root seed of the sweep; replicate k of value v always runs with derive_seed(seed, v, k)
+# @param params  parameters shared by every run; the swept quantity overrides its own field
+# @param batch_worlds  run replicates as worlds of a BatchArrayEngine, up to this many per
+#                      task; None runs each replicate on its own
+# @return list of SweepPoint in ascending value order
+#
+def run_sweep(
+    sim_type: str,
+    parameter: str,
+    values: Sequence[int],
+    fixed_food: int,
+    csv_path: str,
+    replicates: int = DATA_SIM_REPLICATES,
+    min_replicates: int = DATA_SIM_MIN_REPLICATES,
+    ci_width: Optional[float] = DATA_SIM_CI_WIDTH,
+    first_sim_id: int = 1,
+    workers: Optional[int] = None,
+    verbose: bool = False,
+    on_run: Optional[Callable[[int, int, list], None]] = None,
+    on_point: Optional[Callable[[SweepPoint], None]] = None,
+    poll: Optional[Callable[[int, int], None]] = None,
+    seed: Optional[int] = None,
+    params: Optional[SimParams] = None,
+    batch_worlds: Optional[int] = None,
+) -> List[SweepPoint]:
+    ordered = sorted(values)
+    root_seed = make_seed() if seed is None else int(seed)
+    replicates = max(1, replicates)
+    min_replicates = replicates if ci_width is None else max(1, min(min_replicates, replicates))
+    ensure_sweep_csv(csv_path, parameter)
+
+    samples: List[List[float]] = [[] for _ in ordered]
+    in_flight = [0] * len(ordered)
+    submitted = [0] * len(ordered)
+    written: List[SweepPoint] = []
+    next_sim_id = first_sim_id
+
+    def settled(i: int) -> bool:
+        if in_flight[i]:
+            return False
+        if len(samples[i]) >= replicates:
+            return True
+        if len(samples[i]) < min_replicates or len(samples[i]) < 2:
+            return False
+        point = summarize_replicates(ordered[i], samples[i])
+        return (point.ci_high - point.ci_low) <= ci_width
+
+    workers = workers or os.cpu_count() or 1
+    # spawn keeps workers clear of any pygame display state in the parent
+    context = multiprocessing.get_context('spawn')
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        owner: Dict[object, List[int]] = {}
+
+        def submit(points: List[int]) -> None:
+            nonlocal next_sim_id
+            runs = []
+            for i in points:
+                # seeds follow (value, replicate) rather than scheduling order, so reruns match
+                runs.append((ordered[i], next_sim_id, derive_seed(root_seed, ordered[i], submitted[i])))
+                in_flight[i] += 1
+                submitted[i] += 1
+                next_sim_id += 1
+            if batch_worlds:
+                future = pool.submit(run_sweep_batch, sim_type, parameter, runs, fixed_food, SWEEP_DAYS, verbose, params)
+            else:
+                value, sim_id, run_seed = runs[0]
+                future = pool.submit(run_sweep_point, sim_type, parameter, value, fixed_food, sim_id, SWEEP_DAYS, verbose, run_seed, params)
+            owner[future] = points
+
+        chunk = max(1, int(batch_worlds or 1))
+
+        def submit_batches(wave: List[int]) -> None:
+            for start in range(0, len(wave), chunk):
+                submit(wave[start:start + chunk])
+
+        def submit_follow_ups(points: List[int]) -> None:
+            if not batch_worlds:
+                for i in points:
+                    submit([i])
+                return
+            # a batched wave doubles each point's replicates so far: the CI is
+            # still checked between waves, and each wave needs few batches
+            submit_batches([i for i in points for _ in range(min(replicates - len(samples[i]), len(samples[i])))])
+
+        submit_batches([i for _ in range(min_replicates) for i in range(len(ordered))])
+        while owner or len(written) < len(ordered):
+            done, _ = wait(set(owner), timeout=0.1, return_when=FIRST_COMPLETED)
+            follow_ups: List[int] = []
+            for future in done:
+                points = owner.pop(future)
+                results = future.result() if batch_worlds else [future.result()]
+                for i, (value, avg_pop, day_rows, sim_id) in zip(points, results):
+                    in_flight[i] -= 1
+                    samples[i].append(avg_pop)
+                    if on_run is not None:
+                        on_run(sim_id, value, day_rows)
+                for i in points:
+                    if not settled(i) and in_flight[i] == 0 and len(samples[i]) < replicates and i not in follow_ups:
+                        follow_ups.append(i)
+            submit_follow_ups(follow_ups)
+            # stream the sorted prefix that is now settled
+            while len(written) < len(ordered) and settled(len(written)):
+                point = summarize_replicates(ordered[len(written)], samples[len(written)])
+                with open(csv_path, 'a', newline='') as f:
+                    csv.writer(f).writerow([int(point.value), point.mean, point.std, point.ci_low, point.ci_high, point.replicates])
+                written.append(point)
+                if on_point is not None:
+                    on_point(point)
+            if poll is not None:
+                poll(len(written), len(ordered))
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return written
@@ -0,0 +1,124 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# prefix_sums(values)
+#
+# @param values  the series
+# @return array of length n + 1 whose entry i is the sum of the first i values,
+#         so the sum of values[a:b] is sums[b] - sums[a]
+#
+def prefix_sums(values: Sequence[float]) -> np.ndarray:
+    return np.concatenate(([0.0], np.cumsum(np.asarray(values, dtype=np.float64))))
+
+
+# range_mean(sums, start, stop)
+#
+# @param sums  result of prefix_sums
+# @param start  first index (inclusive)
+# @param stop  last index (exclusive)
+# @return mean of values[start:stop] in O(1), or 0.0 for an empty range
+#
+def range_mean(sums: np.ndarray, start: int, stop: int) -> float:
+    start = max(0, start)
+    stop = min(len(sums) - 1, stop)
+    if stop <= start:
+        return 0.0
+    return float((sums[stop] - sums[start]) / (stop - start))
+
+
+# _window_bounds(n, window)
+#
+# @return per-index (start, stop) of a centred window of the given width,
+#         truncated at both ends of the series
+#
+def _window_bounds(n: int, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    half = max(1, window) // 2
+    index = np.arange(n)
+    return np.maximum(0, index - half), np.minimum(n, index + half + 1)
+
+
+# centered_mean(values, window)
+#
+# Centred moving average in O(n) from prefix sums. Near the ends the window
+# is truncated rather than padded, so each value is the plain mean of the
+# points that exist.
+#
+# @param values  the series
+# @param window  window width in points
+# @return smoothed series, same length
+#
+def centered_mean(values: Sequence[float], window: int) -> np.ndarray:
+    sums = prefix_sums(values)
+    start, stop = _window_bounds(len(sums) - 1, window)
+    return (sums[stop] - sums[start]) / (stop - start)
+
+
+# trailing_mean(values, window)
+#
+# @param values  the series
+# @param window  window width in points
+# @return mean of each point and the window - 1 points before it (fewer at the start)
+#
+def trailing_mean(values: Sequence[float], window: int) -> np.ndarray:
+    sums = prefix_sums(values)
+    stop = np.arange(1, len(sums))
+    start = np.maximum(0, stop - max(1, window))
+    return (sums[stop] - sums[start]) / (stop - start)
+
+
+# centered_min(values, window) / centered_max(values, window)
+#
+# Running extremes over the same truncated centred windows as centered_mean,
+# vectorised over a padded sliding view.
+#
+# @param values  the series
+# @param window  window width in points
+# @return running minimum / maximum, same length
+#
+def centered_min(values: Sequence[float], window: int) -> np.ndarray:
+    return _centered_extreme(values, window, np.inf, np.min)
+
+
+def centered_max(values: Sequence[float], window: int) -> np.ndarray:
+    return _centered_extreme(values, window, -np.inf, np.max)
+
+
+def _centered_extreme(values: Sequence[float], window: int, fill: float, reduce) -> np.ndarray:
+    y = np.asarray(values, dtype=np.float64)
+    if y.size == 0:
+        return y
+    half = max(1, window) // 2
+    padded = np.concatenate((np.full(half, fill), y, np.full(half, fill)))
+    return reduce(sliding_window_view(padded, 2 * half + 1), axis=1)
+
+
+# chunk_means(values, chunk_size)
+#
+# @param values  the series
+# @param chunk_size  points per chunk; the last chunk may be shorter
+# @return mean of each consecutive chunk
+#
+def chunk_means(values: Sequence[float], chunk_size: int) -> np.ndarray:
+    y = np.asarray(values, dtype=np.float64)
+    if y.size == 0:
+        return y
+    chunk_size = max(1, int(chunk_size))
+    starts = np.arange(0, y.size, chunk_size)
+    counts = np.diff(np.r_[starts, y.size])
+    return np.add.reduceat(y, starts) / counts
+
+
+# peak(values)
+#
+# @param values  the series
+# @return (index, value) of the first maximum, or (-1, 0.0) for an empty series
+#
+def peak(values: Sequence[float]) -> Tuple[int, float]:
+    y = np.asarray(values, dtype=np.float64)
+    if y.size == 0:
+        return -1, 0.0
+    index = int(np.argmax(y))
+    return index, float(y[index])
@@ -0,0 +1,222 @@
+import csv
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# archived per-creature columns, in file order
+TRAIT_COLUMNS = ('speed', 'size', 'intelligence', 'has_eaten', 'energy')
+# on-disk layout: little-endian float32 columns and an int64 row-offset index
+COLUMN_DTYPE = np.dtype('<f4')
+OFFSET_DTYPE = np.dtype('<i8')
+OFFSETS_FILE = 'day_offsets.i64'
+META_FILE = 'meta.json'
+# rows read into memory at once when summarising a column; a longer day is read on its own
+SUMMARY_CHUNK_ROWS = 1 << 20
+
+
+# trait_archive_dir(run_id, log_dir)
+#
+# @param run_id  catalog id of the run
+# @param log_dir  log directory, defaults to ./log
+# @return the archive directory for that run
+#
+def trait_archive_dir(run_id: int, log_dir: Optional[str] = None) -> str:
+    return os.path.join(log_dir or os.path.join(os.getcwd(), 'log'), 'traits', f'run_{int(run_id)}')
+
+
+# TraitArchiveWriter
+#
+# Appends one day of per-creature values at a time. Each column is its own
+# flat float32 file and day_offsets.i64 holds the cumulative row count after
+# every day, so day d occupies rows offsets[d-1]:offsets[d] of every column.
+# The offset is written after the columns, so a reader never sees a
+# half-written day.
+class TraitArchiveWriter:
+    # TraitArchiveWriter.__init__(path)
+    #
+    # @param path  archive directory; created if missing, appended to if present
+    # @return None
+    #
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, META_FILE)
+        if not os.path.exists(meta_path):
+            with open(meta_path, 'w') as f:
+                json.dump({'columns': list(TRAIT_COLUMNS), 'dtype': COLUMN_DTYPE.str, 'offset_dtype': OFFSET_DTYPE.str}, f)
+        offsets_path = os.path.join(path, OFFSETS_FILE)
+        self.rows = 0
+        if os.path.exists(offsets_path) and os.path.getsize(offsets_path) >= OFFSET_DTYPE.itemsize:
+            self.rows = int(np.fromfile(offsets_path, dtype=OFFSET_DTYPE)[-1])
+        self._columns = {name: open(os.path.join(path, f'{name}.f32'), 'ab') for name in TRAIT_COLUMNS}
+        self._offsets = open(offsets_path, 'ab')
+
+    # TraitArchiveWriter.append_day(speed, size, intelligence, has_eaten, energy)
+    #
+    # @param speed  speed trait of every creature alive at the start of the day
+    # @param size  size trait, same creature order
+    # @param intelligence  intelligence trait, same creature order
+    # @param has_eaten  foods eaten by the end of the day
+    # @param energy  energy left at the end of the day
+    # @return None
+    #
+    def append_day(
+        self,
+        speed: Sequence[float],
+        size: Sequence[float],
+        intelligence: Sequence[float],
+        has_eaten: Sequence[float],
+        energy: Sequence[float],
+    ) -> None:
+        values = (speed, size, intelligence, has_eaten, energy)
+        count = len(speed)
+        for name, column in zip(TRAIT_COLUMNS, values):
+            if len(column) != count:
+                raise ValueError(f'column {name} has {len(column)} values, expected {count}')
+            self._columns[name].write(np.asarray(column, dtype=COLUMN_DTYPE).tobytes())
+            self._columns[name].flush()
+        self.rows += count
+        self._offsets.write(np.asarray([self.rows], dtype=OFFSET_DTYPE).tobytes())
+        self._offsets.flush()
+
+    # TraitArchiveWriter.close()
+    #
+    # @return None
+    #
+    def close(self) -> None:
+        for f in self._columns.values():
+            f.close()
+        self._offsets.close()
+
+
+# TraitArchive
+#
+# Read side of an archive. Columns are memory-mapped, so opening costs the
+# same for ten days or ten thousand, and slicing a day range touches only
+# the pages of that range.
+class TraitArchive:
+    # TraitArchive.__init__(path)
+    #
+    # @param path  archive directory written by TraitArchiveWriter
+    # @return None
+    #
+    def __init__(self, path: str):
+        self.path = path
+        offsets_path = os.path.join(path, OFFSETS_FILE)
+        ends = np.fromfile(offsets_path, dtype=OFFSET_DTYPE) if os.path.exists(offsets_path) else np.empty(0, dtype=OFFSET_DTYPE)
+        # offsets[d] is the first row of day d + 1
+        self.offsets = np.concatenate(([0], ends)).astype(np.int64)
+        rows = int(self.offsets[-1])
+        self.columns: Dict[str, np.ndarray] = {}
+        for name in TRAIT_COLUMNS:
+            column_path = os.path.join(path, f'{name}.f32')
+            if rows == 0:
+                self.columns[name] = np.empty(0, dtype=COLUMN_DTYPE)
+            else:
+                # rows past the last offset belong to a day that was never completed
+                self.columns[name] = np.memmap(column_path, dtype=COLUMN_DTYPE, mode='r', shape=(rows,))
+
+    # TraitArchive.day_count
+    #
+    # @return number of complete days in the archive
+    #
+    @property
+    def day_count(self) -> int:
+        return len(self.offsets) - 1
+
+    # TraitArchive.day(day)
+    #
+    # @param day  1-based day number
+    # @return column name -> values of every creature that day (views, no copy)
+    #
+    def day(self, day: int) -> Dict[str, np.ndarray]:
+        return self.day_range(day, day + 1)
+
+    # TraitArchive.day_range(start_day, stop_day)
+    #
+    # @param start_day  first day (1-based, inclusive)
+    # @param stop_day  last day (exclusive)
+    # @return column name -> values of those days concatenated (views, no copy)
+    #
+    def day_range(self, start_day: int, stop_day: int) -> Dict[str, np.ndarray]:
+        start_day = max(1, start_day)
+        stop_day = min(self.day_count + 1, stop_day)
+        if stop_day <= start_day:
+            return {name: col[:0] for name, col in self.columns.items()}
+        lo = int(self.offsets[start_day - 1])
+        hi = int(self.offsets[stop_day - 1])
+        return {name: col[lo:hi] for name, col in self.columns.items()}
+
+    # TraitArchive.day_counts()
+    #
+    # @return number of creatures archived on each day
+    #
+    def day_counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    # TraitArchive.summary(column)
+    #
+    # Reduces the memory-mapped column a run of whole days at a time, so at
+    # most SUMMARY_CHUNK_ROWS rows (or one longer day) are held in memory.
+    #
+    # @param column  one of TRAIT_COLUMNS
+    # @return dict of per-day 'mean', 'std', 'min' and 'max' arrays; days without creatures are 0
+    #
+    def summary(self, column: str) -> Dict[str, np.ndarray]:
+        values = self.columns[column]
+        counts = self.day_counts()
+        result = {key: np.zeros(self.day_count) for key in ('mean', 'std', 'min', 'max')}
+        first = 0
+        while first < self.day_count:
+            lo = int(self.offsets[first])
+            # days [first, last) end within the chunk; always at least one
+            last = int(np.searchsorted(self.offsets, lo + SUMMARY_CHUNK_ROWS, side='right')) - 1
+            last = min(self.day_count, max(first + 1, last))
+            self._summarise_days(values, counts, first, last, result)
+            first = last
+        return result
+
+    def _summarise_days(self, values, counts, first: int, last: int, result: Dict[str, np.ndarray]) -> None:
+        filled = np.flatnonzero(counts[first:last] > 0) + first
+        if len(filled) == 0:
+            return
+        lo = int(self.offsets[first])
+        chunk = np.asarray(values[lo:int(self.offsets[last])], dtype=np.float64)
+        starts = self.offsets[filled] - lo
+        n = counts[filled]
+        mean = np.add.reduceat(chunk, starts) / n
+        squares = np.add.reduceat(chunk * chunk, starts)
+        result['mean'][filled] = mean
+        result['std'][filled] = np.sqrt(np.maximum(squares / n - mean * mean, 0.0))
+        result['min'][filled] = np.minimum.reduceat(chunk, starts)
+        result['max'][filled] = np.maximum.reduceat(chunk, starts)
+
+    # TraitArchive.summary_rows(column)
+    #
+    # @param column  one of TRAIT_COLUMNS
+    # @return [(day, mean)] for every archived day, the shape the trait graphs take
+    #
+    def summary_rows(self, column: str) -> List[tuple]:
+        means = self.summary(column)['mean']
+        return [(day, float(mean)) for day, mean in enumerate(means, start=1)]
+
+
+# write_trait_means_csv(archive, path, traits)
+#
+# Writes the per-day trait averages in the layout the graph viewer reads:
+# day, then average_<trait> for each listed trait.
+#
+# @param archive  the run's TraitArchive
+# @param path  CSV file to (over)write
+# @param traits  trait columns to include, in order
+# @return None
+#
+def write_trait_means_csv(archive: TraitArchive, path: str, traits: Sequence[str]) -> None:
+    means = [archive.summary(trait)['mean'] for trait in traits]
+    with open(path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(['day'] + [f'average_{trait}' for trait in traits])
+        for day in range(archive.day_count):
+            w.writerow([day + 1] + [float(column[day]) for column in means])
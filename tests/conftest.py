@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# the simulator's modules sit flat in src/ and import each other by name
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC_DIR)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+
+# keep any run catalog a test opens out of the working tree
+@pytest.fixture(autouse=True)
+def run_catalog_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'runs.sqlite')
+    monkeypatch.setenv('ECOSIM_RUN_CATALOG', path)
+    return path
@@ -0,0 +1,118 @@
+import random
+
+import numpy as np
+import pytest
+
+import array_engine
+from array_engine import ArrayEngine, MutationArrayEngine, BatchArrayEngine, BatchMutationArrayEngine
+from basic_simulation import BasicSimulation
+from mutation_simulation import MutationSimulation
+from params import SimParams
+
+
+# random source that never turns a creature: every draw is above any chance used
+class NeverTurn(random.Random):
+    def random(self) -> float:
+        return 0.99
+
+
+def build_world(cls, seed: int, food: int, creatures: int = 25, **params):
+    sim = cls(400, 300, seed=seed, params=SimParams(start_creatures=creatures, **params))
+    sim.food_scaling = False
+    sim.fixed_food_count = food
+    if isinstance(sim, MutationSimulation):
+        sim.record_traits = False
+    return sim
+
+
+# The two engines draw from different generators, so they are compared with
+# the randomness taken out: straight-line movement, no re-aim after a bounce
+# and the object world's food copied into the arrays.
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_array_engine_matches_object_day(seed, monkeypatch):
+    monkeypatch.setattr(array_engine, 'BOUNCE_TURN_PROBABILITY', 0.0)
+    sim = build_world(BasicSimulation, seed, food=40, turn_chance=0.0)
+    engine = ArrayEngine(sim)
+    sim.begin_day()
+    engine.begin_day()
+    engine.food_position = np.array([food.position for food in sim.foods], dtype=np.float64)
+    engine._build_food_grid()
+    sim.rng = NeverTurn()
+
+    done = False
+    while not done:
+        done = sim.step_tick()
+        assert engine.step_tick() == done
+        assert np.allclose(engine.position, [c.position for c in sim.creatures])
+        assert engine.energy.tolist() == [c.energy for c in sim.creatures]
+        assert engine.has_eaten.tolist() == [c.has_eaten for c in sim.creatures]
+    assert engine.end_day() == sim.end_day()
+
+
+def test_array_engine_is_repeatable():
+    def run():
+        engine = ArrayEngine(build_world(BasicSimulation, 7, food=20))
+        days = []
+        for _ in range(10):
+            days.append(engine.run_day())
+            engine.reproduce_survivors()
+        return days, engine.position.copy()
+
+    days, position = run()
+    again, again_position = run()
+    assert days == again
+    assert np.array_equal(position, again_position)
+
+
+def place_food_on_creature(engine, creature: int, food: int) -> None:
+    engine.food_position[food] = engine.position[creature]
+    engine._build_food_grid()
+
+
+# food sitting exactly on a creature gives a zero steering vector, which
+# becomes a random heading drawn for that creature
+def test_mutation_engine_steers_from_food_underfoot():
+    engine = MutationArrayEngine(build_world(MutationSimulation, 4, food=10))
+    engine.begin_day()
+    place_food_on_creature(engine, 0, 3)
+    engine.step_tick()
+    assert np.allclose(np.hypot(engine.direction[:, 0], engine.direction[:, 1]), 1.0)
+
+
+# each batched world must run exactly as a single-world engine with its seed,
+# whatever it is batched with
+@pytest.mark.parametrize('cls, single, batch', [
+    (BasicSimulation, ArrayEngine, BatchArrayEngine),
+    (MutationSimulation, MutationArrayEngine, BatchMutationArrayEngine),
+])
+def test_batched_worlds_match_single_worlds(cls, single, batch):
+    worlds = [(40, 3000), (0, 3000), (60, 2000), (25, 4000)]
+    engine = batch([build_world(cls, 100 + k, food, creature_max_energy=energy) for k, (food, energy) in enumerate(worlds)])
+    singles = [single(build_world(cls, 100 + k, food, creature_max_energy=energy)) for k, (food, energy) in enumerate(worlds)]
+    for _ in range(5):
+        results = engine.run_day()
+        for k, world in enumerate(singles):
+            if world.creature_count:
+                assert tuple(world.run_day()) == tuple(results[k])
+            else:
+                assert tuple(results[k]) == (0, 0, 0, 0)
+        engine.reproduce_survivors()
+        for k, world in enumerate(singles):
+            world.reproduce_survivors()
+            assert np.array_equal(engine.position[engine.world == k], world.position)
+
+
+def test_batch_rejects_differing_params():
+    with pytest.raises(ValueError):
+        BatchArrayEngine([
+            build_world(BasicSimulation, 0, food=10),
+            build_world(BasicSimulation, 1, food=10, food_energy=1),
+        ])
+
+
+def test_batched_mutation_engine_steers_from_food_underfoot():
+    engine = BatchMutationArrayEngine([build_world(MutationSimulation, seed, food=10) for seed in (4, 5)])
+    engine.begin_day()
+    place_food_on_creature(engine, int(np.flatnonzero(engine.world == 1)[0]), int(np.flatnonzero(engine.food_world == 1)[0]))
+    engine.step_tick()
+    assert np.allclose(np.hypot(engine.direction[:, 0], engine.direction[:, 1]), 1.0)
@@ -0,0 +1,41 @@
+import csv
+import os
+
+import pytest
+
+from cli import main
+
+
+def cli_error(capsys, argv) -> str:
+    with pytest.raises(SystemExit) as exit_info:
+        main(argv)
+    assert exit_info.value.code == 2
+    return capsys.readouterr().err
+
+
+@pytest.mark.parametrize('argv, message', [
+    (['run', 'basic', '--days', '0', '--headless'], '--days must be at least 1'),
+    (['run', 'basic', '--engine', 'arrays'], 'add --headless'),
+    (['run', 'basic', '--headless', '--engine', 'arrays', '--profile'], 'drop --engine arrays'),
+    (['run', 'basic', '--food', 'fixed:lots'], "expected 'scale' or 'fixed:N'"),
+    (['run', 'mutation', '--mutate', 'speed,wings'], 'unknown trait(s) wings'),
+    (['run', 'basic', '--param', 'gravity=3'], "unknown parameter 'gravity'"),
+    (['run', 'basic', '--param', 'food_energy'], 'expected NAME=VALUE'),
+    (['bench', '--sizes', '10,0'], 'expected comma-separated positive counts'),
+    (['sweep', 'mutation', 'food'], 'invalid choice'),
+])
+def test_argument_errors(capsys, argv, message):
+    assert message in cli_error(capsys, argv)
+
+
+def test_headless_run_writes_days(tmp_path, capsys):
+    out = str(tmp_path / 'out')
+    assert main(['run', 'basic', '--days', '3', '--food', 'fixed:30', '--seed', '5', '--headless', '--engine', 'arrays', '--out', out]) == 0
+    assert 'seed=5' in capsys.readouterr().out
+    days_csv = [name for name in os.listdir(out) if name.endswith('_days.csv')]
+    assert len(days_csv) == 1
+    with open(os.path.join(out, days_csv[0]), newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['day', 'start_creatures', 'food_spawned', 'survivors', 'died', 'end_creatures']
+    assert 1 <= len(rows) - 1 <= 3
+    assert all(row[2] == '30' for row in rows[1:])
@@ -0,0 +1,68 @@
+import numpy as np
+
+from downsample import lttb_indices, minmax_indices
+
+
+# straightforward LTTB written from the algorithm's description
+def reference_lttb(x, y, threshold):
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    keep = [0]
+    previous = 0
+    for b in range(threshold - 2):
+        lo = int(np.floor(b * every)) + 1
+        hi = int(np.floor((b + 1) * every)) + 1
+        next_lo = hi
+        next_hi = min(int(np.floor((b + 2) * every)) + 1, n)
+        if b == threshold - 3:
+            mean_x, mean_y = x[-1], y[-1]
+        else:
+            mean_x, mean_y = np.mean(x[next_lo:next_hi]), np.mean(y[next_lo:next_hi])
+        best, best_area = lo, -1.0
+        for i in range(lo, hi):
+            area = abs((x[previous] - mean_x) * (y[i] - y[previous]) - (x[previous] - x[i]) * (mean_y - y[previous]))
+            if area > best_area:
+                best, best_area = i, area
+        keep.append(best)
+        previous = best
+    keep.append(n - 1)
+    return np.array(keep)
+
+
+def test_lttb_matches_reference():
+    rng = np.random.default_rng(3)
+    x = np.arange(1000, dtype=np.float64)
+    y = np.cumsum(rng.normal(size=1000))
+    for threshold in (3, 10, 97, 500):
+        assert np.array_equal(lttb_indices(x, y, threshold), reference_lttb(x, y, threshold))
+
+
+def test_lttb_keeps_ends_and_spike():
+    x = np.arange(2000, dtype=np.float64)
+    y = np.zeros(2000)
+    y[1234] = 50.0
+    keep = lttb_indices(x, y, 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 1999
+    assert np.all(np.diff(keep) > 0)
+    assert 1234 in keep
+
+
+def test_lttb_short_series_kept_whole():
+    assert np.array_equal(lttb_indices([0, 1, 2], [5, 6, 7], 10), np.arange(3))
+    assert np.array_equal(lttb_indices(range(10), range(10), 2), np.arange(10))
+
+
+def test_minmax_keeps_each_column_extremes():
+    rng = np.random.default_rng(8)
+    x = np.sort(rng.uniform(0, 100, 5000))
+    y = rng.normal(size=5000)
+    columns = 50
+    keep = minmax_indices(x, y, columns)
+    assert len(keep) <= 2 * columns
+    assert np.all(np.diff(keep) > 0)
+    column = np.minimum(((x - x[0]) / (x[-1] - x[0]) * columns).astype(np.int64), columns - 1)
+    for c in np.unique(column):
+        members = np.flatnonzero(column == c)
+        assert y[members].min() in y[keep]
+        assert y[members].max() in y[keep]
@@ -0,0 +1,60 @@
+import math
+import random
+
+import pytest
+
+from basic_simulation import Creature, random_unit_vector
+from params import SimParams
+
+WIDTH = 240
+HEIGHT = 200
+# near the left edge, so some creatures survive even when turning every tick
+START = (45.0, 90.0)
+
+
+def fed_creature(rng: random.Random, params: SimParams, energy: int) -> Creature:
+    return Creature(START, random_unit_vector(rng), energy=energy, has_eaten=1, params=params)
+
+
+# what step_tick does to a fed creature once no food is left
+def step_out(creature: Creature, rng: random.Random) -> None:
+    while creature.energy > 0 and not creature.is_survivor:
+        creature.move(rng)
+        creature.handle_edges(WIDTH, HEIGHT, rng)
+
+
+def outcomes(params: SimParams, finish, seed: int, count: int = 4000):
+    rng = random.Random(seed)
+    survived, spent, spread = 0, 0, 0.0
+    for _ in range(count):
+        creature = fed_creature(rng, params, 70)
+        finish(creature, rng)
+        survived += creature.is_survivor
+        spent += 70 - creature.energy
+        spread += math.hypot(creature.position[0] - START[0], creature.position[1] - START[1])
+    return survived / count, spent / count, spread / count
+
+
+@pytest.mark.parametrize('turn_chance', [0.05, 0.3, 1.0])
+def test_fast_forward_matches_stepping_in_distribution(turn_chance):
+    params = SimParams(turn_chance=turn_chance)
+    stepped = outcomes(params, step_out, seed=1)
+    forwarded = outcomes(params, lambda c, rng: c.fast_forward(WIDTH, HEIGHT, rng), seed=2)
+    # survivor share, energy spent and distance travelled from the start
+    assert forwarded[0] == pytest.approx(stepped[0], abs=0.04)
+    assert forwarded[1] == pytest.approx(stepped[1], rel=0.05)
+    assert forwarded[2] == pytest.approx(stepped[2], rel=0.05)
+
+
+@pytest.mark.parametrize('energy', [10, 40, 200])
+def test_fast_forward_without_turns_is_exact(energy):
+    params = SimParams(turn_chance=0.0)
+    rng = random.Random(9)
+    for _ in range(200):
+        stepped = fed_creature(rng, params, energy)
+        forwarded = Creature(stepped.position, stepped.direction, energy=energy, has_eaten=1, params=params)
+        step_out(stepped, rng)
+        forwarded.fast_forward(WIDTH, HEIGHT, rng)
+        assert forwarded.is_survivor == stepped.is_survivor
+        assert forwarded.energy == stepped.energy
+        assert forwarded.position == pytest.approx(stepped.position)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from lineage import LineageTracker, NO_PARENT
+
+
+def build_family():
+    # founders 0, 1, 2; 3 and 4 are children of 0; 5 of 3; 6 of 1
+    tracker = LineageTracker()
+    tracker.add_founders(3)
+    assert tracker.add_births(np.array([0, 0])).tolist() == [3, 4]
+    assert tracker.add_birth(3) == 5
+    assert tracker.add_birth(1) == 6
+    return tracker
+
+
+def test_founders_and_ancestors():
+    tracker = build_family()
+    assert tracker.births == 7
+    assert list(tracker.parent) == [NO_PARENT, NO_PARENT, NO_PARENT, 0, 0, 3, 1]
+    assert tracker.founders_of(np.arange(7)).tolist() == [0, 1, 2, 0, 0, 0, 1]
+    assert tracker.ancestors(5) == [3, 0]
+    assert tracker.ancestors(2) == []
+
+
+def test_common_ancestor():
+    tracker = build_family()
+    assert tracker.common_ancestor([5, 4]) == 0
+    assert tracker.common_ancestor([5, 3]) == 3
+    assert tracker.common_ancestor([5]) == 5
+    assert tracker.common_ancestor([5, 6]) is None
+    assert tracker.common_ancestor([]) is None
+
+
+def test_fixation():
+    tracker = build_family()
+    tracker.record_day([0, 1, 2])
+    tracker.record_day([3, 4, 6])
+    assert tracker.fixation_day() is None
+    tracker.record_day([5, 4])
+    assert tracker.lineage_sizes() == [(1, {0: 1, 1: 1, 2: 1}), (2, {0: 2, 1: 1}), (3, {0: 2})]
+    assert tracker.fixation_day() == 3
+    assert tracker.time_to_fixation() == 2
+
+
+def test_births_default_to_next_day():
+    tracker = LineageTracker()
+    tracker.add_founders(2)
+    tracker.record_day([0, 1])
+    child = tracker.add_birth(1)
+    assert tracker.birth_day[child] == 2
+    assert tracker.add_births(np.array([], dtype=np.int64)).size == 0
@@ -0,0 +1,60 @@
+import pytest
+
+from params import PARAM_RANGES, SimParams, describe_range
+
+
+@pytest.mark.parametrize('changes', [
+    {'turn_chance': 1.5},
+    {'turn_chance': -0.1},
+    {'turn_chance': float('nan')},
+    {'creature_max_energy': 0},
+    {'creature_step_size': 0.0},
+    {'creature_radius': 0},
+    {'start_creatures': -1},
+    {'intelligence_base_error_degrees': 181.0},
+    {'mutation_speed_delta': -0.5},
+])
+def test_out_of_range_values_rejected(changes):
+    with pytest.raises(ValueError):
+        SimParams(**changes)
+
+
+@pytest.mark.parametrize('changes', [
+    {'turn_chance': 0.0},
+    {'turn_chance': 1.0},
+    {'food_energy': 0},
+    {'start_creatures': 0},
+    {'start_creatures': None},
+    {'creature_max_energy': 1},
+])
+def test_range_ends_accepted(changes):
+    SimParams(**changes)
+
+
+def test_replace_validates():
+    with pytest.raises(ValueError, match='creature_max_energy must be greater than 0'):
+        SimParams().replace(creature_max_energy=-5)
+
+
+def test_every_range_names_a_field():
+    assert set(PARAM_RANGES) <= set(SimParams().as_dict())
+    assert describe_range('turn_chance') == 'between 0.0 and 1.0'
+    assert describe_range('food_energy') == 'at least 0'
+
+
+def test_from_overrides_converts_and_reports():
+    params = SimParams.from_overrides({'food_energy': '300', 'turn_chance': '0.25'})
+    assert (params.food_energy, params.turn_chance) == (300, 0.25)
+    with pytest.raises(ValueError, match="food_energy must be a whole number, got '3.5'"):
+        SimParams.from_overrides({'food_energy': '3.5'})
+    with pytest.raises(ValueError, match='unknown parameter'):
+        SimParams.from_overrides({'gravity': '1'})
+    with pytest.raises(ValueError, match='turn_chance must be between 0.0 and 1.0'):
+        SimParams.from_overrides({'turn_chance': '2'})
+
+
+def test_cli_reports_range_errors(capsys):
+    from cli import main
+    with pytest.raises(SystemExit):
+        main(['run', 'basic', '--param', 'turn_chance=2'])
+    assert 'turn_chance must be between 0.0 and 1.0' in capsys.readouterr().err
@@ -0,0 +1,96 @@
+import csv
+import json
+
+import pytest
+
+import profiling
+from basic_simulation import BasicSimulation
+from mutation_simulation import MutationSimulation
+from profiling import PHASE_COLUMNS, PhaseProfiler, sorted_phases
+
+
+def test_totals_per_day_and_run():
+    profiler = PhaseProfiler()
+    profiler.start_day(1)
+    profiler.add('move', 100, 4)
+    profiler.add('move', 50)
+    profiler.add('sweep', 7)
+    profiler.start_day(2)
+    profiler.add('move', 10, 2)
+    assert profiler.days == [1, 2]
+    assert profiler.day_totals(1)['move'] == (150, 5)
+    assert profiler.day_totals(1)['move'].mean_ns == 30.0
+    assert profiler.day_totals(2) == {'move': (10, 2)}
+    assert profiler.day_totals() == {'move': (160, 7), 'sweep': (7, 1)}
+    assert profiler.day_totals(3) == {}
+
+
+def test_phases_sorted_in_loop_order():
+    totals = {'zzz': (1, 1), 'clock': (1, 1), 'move': (1, 1), 'begin_day': (1, 1)}
+    assert [phase for phase, _ in sorted_phases(totals)] == ['begin_day', 'move', 'clock', 'zzz']
+
+
+def test_trace_output_and_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'TRACE_EVENT_LIMIT', 3)
+    profiler = PhaseProfiler(trace=True)
+    profiler.start_day(4)
+    start = profiler._origin
+    for i in range(5):
+        profiler.event('tick', start + 1000 * i, start + 1000 * i + 500, {'creatures': i})
+    path = str(tmp_path / 'trace.json')
+    profiler.write_trace(path)
+    with open(path) as f:
+        document = json.load(f)
+    events = document['traceEvents']
+    assert [e['args'] for e in events] == [{'day': 4, 'creatures': i} for i in range(3)]
+    assert [(e['ts'], e['dur'], e['ph']) for e in events] == [(0.0, 0.5, 'X'), (1.0, 0.5, 'X'), (2.0, 0.5, 'X')]
+    assert document['otherData'] == {'dropped_events': 2}
+
+
+@pytest.mark.parametrize('cls', [BasicSimulation, MutationSimulation])
+def test_profiled_run_matches_and_counts_every_tick(cls, tmp_path):
+    def build():
+        sim = cls(500, 400, seed=3)
+        sim.food_scaling = False
+        sim.fixed_food_count = 15
+        if isinstance(sim, MutationSimulation):
+            sim.record_traits = False
+        return sim
+
+    plain, profiled = build(), build()
+    profiler = profiled.enable_profiling(trace=True)
+    ticks = creature_ticks = 0
+    for day in (1, 2, 3):
+        plain.day = profiled.day = day
+        assert profiled._timed_begin_day() == plain.begin_day()
+        while True:
+            done = profiled.step_tick()
+            assert plain.step_tick() == done
+            ticks += 1
+            creature_ticks += profiled.ticked_creatures
+            if done:
+                break
+        assert profiled._timed_end_day() == plain.end_day()
+        plain.reproduce_survivors()
+        profiled.reproduce_survivors()
+
+    totals = profiler.day_totals()
+    assert profiler.days == [1, 2, 3]
+    assert totals['sweep'].calls == ticks
+    assert totals['edges'].calls == totals['collide'].calls == totals['move'].calls == creature_ticks
+    assert totals['begin_day'].calls == totals['end_day'].calls == 3
+
+    trace_path = str(tmp_path / 'trace.json')
+    profiler.write_trace(trace_path)
+    with open(trace_path) as f:
+        tick_events = [e for e in json.load(f)['traceEvents'] if e['name'] == 'tick']
+    assert len(tick_events) == ticks
+    assert sum(e['args']['creatures'] for e in tick_events) == creature_ticks
+
+    csv_path = str(tmp_path / 'phases.csv')
+    profiler.write_csv(csv_path)
+    with open(csv_path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == PHASE_COLUMNS
+    assert {int(row[0]) for row in rows[1:]} == {1, 2, 3}
+    assert sum(int(row[2]) for row in rows[1:] if row[1] == 'sweep') == ticks
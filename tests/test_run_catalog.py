@@ -0,0 +1,64 @@
+import pytest
+
+from run_catalog import CATALOG_BATCH_DAYS, RunCatalog
+
+
+def day_row(day: int):
+    return (day, 10 + day, 20, 5, 5 + day, 10)
+
+
+def test_close_writes_queued_days(tmp_path):
+    path = str(tmp_path / 'runs.sqlite')
+    catalog = RunCatalog(path)
+    run_id = catalog.start_run('BasicSimulation', 3, {})
+    # more than one writer transaction's worth
+    for day in range(1, 2 * CATALOG_BATCH_DAYS + 10):
+        catalog.record_day(run_id, *day_row(day))
+    catalog.close()
+
+    reopened = RunCatalog(path)
+    rows = reopened.day_rows(run_id)
+    assert rows == [day_row(day) for day in range(1, 2 * CATALOG_BATCH_DAYS + 10)]
+    assert reopened.last_runs(1)[0].days == 2 * CATALOG_BATCH_DAYS + 9
+    reopened.close()
+
+
+def test_flush_makes_days_readable(tmp_path):
+    catalog = RunCatalog(str(tmp_path / 'runs.sqlite'))
+    run_id = catalog.start_run('BasicSimulation', 3, {})
+    catalog.record_day(run_id, *day_row(1))
+    catalog.flush()
+    assert catalog._query('SELECT COUNT(*) FROM days WHERE run_id = ?', (run_id,)) == [(1,)]
+    catalog.close()
+
+
+def test_run_queries(tmp_path):
+    catalog = RunCatalog(str(tmp_path / 'runs.sqlite'))
+    first = catalog.start_run('BasicSimulation', 1, {'food_scaling': False, 'fixed_food': 25, 'max_energy': 500})
+    second = catalog.start_run('GreedySimulation', 2, {'food_scaling': False, 'fixed_food': 25})
+    third = catalog.start_run('BasicSimulation', 3, {'food_scaling': True, 'fixed_food': 25})
+    fourth = catalog.start_run('BasicSimulation', 4, {'food_scaling': False, 'fixed_food': 40})
+
+    assert [r.run_id for r in catalog.last_runs(3)] == [fourth, third, second]
+    assert [r.run_id for r in catalog.last_runs(10, 'GreedySimulation')] == [second]
+    # a scaling run has no fixed food, whatever its parameters say
+    assert [r.run_id for r in catalog.runs_with_food(25)] == [first, second]
+    assert [r.run_id for r in catalog.runs_with_food(25, 'BasicSimulation')] == [first]
+    record = catalog.runs_with_food(40)[0]
+    assert (record.sim_type, record.seed, record.food_scaling, record.fixed_food) == ('BasicSimulation', 4, False, 40)
+    assert catalog.last_runs(4)[-1].max_energy == 500
+    catalog.finish_run(first)
+    assert catalog.runs_with_food(25)[0].finished_at is not None
+    catalog.close()
+
+
+def test_duplicate_day_fails_loudly(tmp_path):
+    catalog = RunCatalog(str(tmp_path / 'runs.sqlite'))
+    run_id = catalog.start_run('BasicSimulation', 3, {})
+    catalog.record_day(run_id, *day_row(1))
+    catalog.flush()
+    catalog.record_day(run_id, *day_row(1))
+    with pytest.raises(RuntimeError):
+        catalog.flush()
+    assert catalog.day_rows(run_id) == [day_row(1)]
+    catalog.close()
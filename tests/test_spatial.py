@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from basic_simulation import Food, distance
+from spatial import FoodGrid
+
+
+def scattered_food(rng: random.Random, count: int):
+    # a coarse lattice as well, so equal distances and ties come up
+    return [Food((rng.choice([rng.uniform(0, 200), float(rng.randrange(0, 200, 10))]), rng.uniform(0, 150))) for _ in range(count)]
+
+
+def brute_nearest(foods, position, max_distance):
+    best = None
+    for food in foods:
+        dist = distance(position, food.position)
+        if dist <= max_distance and (best is None or dist < best[0]):
+            best = (dist, food)
+    return best
+
+
+def brute_first(foods, position, reach):
+    for seq, food in enumerate(foods):
+        if distance(position, food.position) <= reach:
+            return seq, food
+    return None
+
+
+@pytest.mark.parametrize('cell_size', [3.0, 12.0, 40.0])
+def test_nearest_within_matches_brute_force(cell_size):
+    rng = random.Random(5)
+    foods = scattered_food(rng, 120)
+    grid = FoodGrid(foods, cell_size=cell_size)
+    # remove some food so empty cells and a shrunken set are exercised
+    for food in foods[::3]:
+        grid.remove(food)
+    kept = {id(food) for food in grid}
+    alive = [food for food in foods if id(food) in kept]
+    for _ in range(300):
+        position = (rng.uniform(-20, 220), rng.uniform(-20, 170))
+        max_distance = rng.choice([5.0, 25.0, 80.0, 1000.0])
+        found = grid.nearest_within(position, max_distance, distance)
+        expected = brute_nearest(alive, position, max_distance)
+        if expected is None:
+            assert found is None
+        else:
+            assert found is not None
+            assert found[0] == expected[0]
+            assert found[1] is expected[1]
+
+
+def test_first_within_matches_list_scan():
+    rng = random.Random(11)
+    foods = scattered_food(rng, 80)
+    grid = FoodGrid(foods, cell_size=15.0)
+    for _ in range(300):
+        position = (rng.uniform(0, 200), rng.uniform(0, 150))
+        reach = rng.uniform(1.0, 30.0)
+        found = grid.first_within(position, reach, distance)
+        expected = brute_first(foods, position, reach)
+        if expected is None:
+            assert found is None
+        else:
+            assert found[0] == expected[0]
+            assert found[1] is expected[1]
+
+
+def test_grid_keeps_spawn_order():
+    foods = [Food((float(i * 7 % 50), float(i * 13 % 40))) for i in range(20)]
+    grid = FoodGrid(foods, cell_size=10.0)
+    grid.remove(foods[4])
+    grid.append(foods[4])
+    assert list(grid) == foods[:4] + foods[5:] + [foods[4]]
+    assert len(grid) == 20
+
+
+def test_nearest_within_empty_grid():
+    assert FoodGrid().nearest_within((0.0, 0.0), 10.0, distance) is None
@@ -0,0 +1,63 @@
+import csv
+import math
+
+import pytest
+
+from sweep import SWEEP_COLUMNS, T_975, ensure_sweep_csv, run_sweep_batch, summarize_replicates
+
+
+def test_summarize_replicates_confidence_interval():
+    point = summarize_replicates(40, [10.0, 12.0, 14.0, 16.0])
+    std = math.sqrt(20.0 / 3.0)
+    half = T_975[2] * std / 2.0
+    assert point.value == 40
+    assert point.replicates == 4
+    assert point.mean == pytest.approx(13.0)
+    assert point.std == pytest.approx(std)
+    assert point.ci_low == pytest.approx(13.0 - half)
+    assert point.ci_high == pytest.approx(13.0 + half)
+
+
+def test_summarize_single_replicate_has_no_spread():
+    point = summarize_replicates(5, [7.5])
+    assert (point.mean, point.std, point.ci_low, point.ci_high, point.replicates) == (7.5, 0.0, 7.5, 7.5, 1)
+
+
+def test_summarize_many_replicates_uses_normal_quantile():
+    samples = [float(i % 5) for i in range(40)]
+    point = summarize_replicates(1, samples)
+    half = point.ci_high - point.mean
+    assert half == pytest.approx(1.96 * point.std / math.sqrt(40))
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_ensure_sweep_csv_creates_header(tmp_path):
+    path = str(tmp_path / 'sweeps' / 'food.csv')
+    ensure_sweep_csv(path, 'food')
+    assert read_rows(path) == [['food'] + SWEEP_COLUMNS]
+
+
+def test_ensure_sweep_csv_upgrades_two_column_file(tmp_path):
+    path = tmp_path / 'energy.csv'
+    path.write_text('energy,average_population\n100,4.5\n200,9.25\n')
+    ensure_sweep_csv(str(path), 'energy')
+    assert read_rows(str(path)) == [
+        ['energy'] + SWEEP_COLUMNS,
+        ['100', '4.5', '', '', '', '1'],
+        ['200', '9.25', '', '', '', '1'],
+    ]
+    # an upgraded file is left alone
+    ensure_sweep_csv(str(path), 'energy')
+    assert len(read_rows(str(path))) == 3
+
+
+# a replicate's result must not depend on the batch it ran in
+def test_sweep_batch_results_do_not_depend_on_grouping():
+    runs = [(20, 1, 101), (20, 2, 102), (40, 3, 103), (40, 4, 104), (60, 5, 105)]
+    together = run_sweep_batch('basic', 'food', runs, 0, days=6)
+    alone = [result for run in runs for result in run_sweep_batch('basic', 'food', [run], 0, days=6)]
+    assert together == alone
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from timeseries import (
+    prefix_sums,
+    range_mean,
+    centered_mean,
+    trailing_mean,
+    centered_min,
+    centered_max,
+    chunk_means,
+    peak,
+)
+
+SERIES = np.random.default_rng(1).normal(10.0, 3.0, 101)
+
+
+def centered_windows(n, window):
+    half = max(1, window) // 2
+    return [(max(0, i - half), min(n, i + half + 1)) for i in range(n)]
+
+
+def test_range_mean_matches_slices():
+    sums = prefix_sums(SERIES)
+    assert sums[0] == 0.0 and len(sums) == len(SERIES) + 1
+    for start, stop in ((0, 101), (5, 6), (17, 60), (90, 200), (-3, 4)):
+        expected = SERIES[max(0, start):stop].mean()
+        assert range_mean(sums, start, stop) == pytest.approx(expected)
+    assert range_mean(sums, 40, 40) == 0.0
+
+
+@pytest.mark.parametrize('window', [1, 2, 5, 30, 500])
+def test_centered_windows_match_direct(window):
+    windows = centered_windows(len(SERIES), window)
+    assert np.allclose(centered_mean(SERIES, window), [SERIES[a:b].mean() for a, b in windows])
+    assert np.array_equal(centered_min(SERIES, window), [SERIES[a:b].min() for a, b in windows])
+    assert np.array_equal(centered_max(SERIES, window), [SERIES[a:b].max() for a, b in windows])
+
+
+@pytest.mark.parametrize('window', [1, 4, 30])
+def test_trailing_mean_matches_direct(window):
+    expected = [SERIES[max(0, i - window + 1):i + 1].mean() for i in range(len(SERIES))]
+    assert np.allclose(trailing_mean(SERIES, window), expected)
+
+
+def test_chunk_means_and_peak():
+    assert np.allclose(chunk_means(SERIES, 10), [SERIES[i:i + 10].mean() for i in range(0, len(SERIES), 10)])
+    assert chunk_means([], 10).size == 0
+    assert peak([1.0, 4.0, 2.0, 4.0]) == (1, 4.0)
+    assert peak([]) == (-1, 0.0)
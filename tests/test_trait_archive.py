@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import trait_archive
+from trait_archive import TRAIT_COLUMNS, TraitArchive, TraitArchiveWriter
+
+
+def write_days(path, day_sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    days = []
+    writer = TraitArchiveWriter(str(path))
+    for n in day_sizes:
+        columns = [rng.random(n).astype(np.float32) for _ in TRAIT_COLUMNS]
+        writer.append_day(*columns)
+        days.append(columns)
+    writer.close()
+    return days
+
+
+# small chunk sizes force the summary across many chunks, and a chunk
+# smaller than one day
+@pytest.mark.parametrize('chunk_rows', [1 << 20, 64, 1])
+def test_summary_matches_per_day_stats(tmp_path, monkeypatch, chunk_rows):
+    monkeypatch.setattr(trait_archive, 'SUMMARY_CHUNK_ROWS', chunk_rows)
+    sizes = [0 if day % 7 == 0 else (day * 13) % 50 for day in range(120)]
+    days = write_days(tmp_path, sizes)
+    summary = TraitArchive(str(tmp_path)).summary('speed')
+    speed = [day[0].astype(np.float64) for day in days]
+    assert np.allclose(summary['mean'], [d.mean() if d.size else 0.0 for d in speed])
+    assert np.allclose(summary['std'], [d.std() if d.size else 0.0 for d in speed])
+    assert np.allclose(summary['min'], [d.min() if d.size else 0.0 for d in speed])
+    assert np.allclose(summary['max'], [d.max() if d.size else 0.0 for d in speed])
+
+
+def test_days_and_append(tmp_path):
+    days = write_days(tmp_path, [3, 0, 5])
+    # a second writer appends after the days already written
+    more = write_days(tmp_path, [2], seed=1)
+    archive = TraitArchive(str(tmp_path))
+    assert archive.day_count == 4
+    assert archive.day_counts().tolist() == [3, 0, 5, 2]
+    assert np.array_equal(archive.day(3)['size'], days[2][1])
+    assert np.array_equal(archive.day(4)['energy'], more[0][4])
+    assert np.array_equal(archive.day_range(1, 3)['speed'], np.concatenate((days[0][0], days[1][0])))
+    assert archive.day(9)['speed'].size == 0
+
+
+def test_mismatched_columns_rejected(tmp_path):
+    writer = TraitArchiveWriter(str(tmp_path))
+    with pytest.raises(ValueError):
+        writer.append_day([1.0, 2.0], [1.0], [1.0, 2.0], [0, 1], [5, 6])
+    writer.close()
+
+
+def test_empty_archive(tmp_path):
+    archive = TraitArchive(str(tmp_path))
+    assert archive.day_count == 0
+    assert archive.summary('speed')['mean'].size == 0